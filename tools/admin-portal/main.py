@@ -13,6 +13,10 @@ Usage:
 Author: Ro-Tech Development
 """
 
+import time
+
+STARTED = time.perf_counter()  # begin van de startup timing
+
 import sys
 import argparse
 from pathlib import Path
@@ -62,7 +66,12 @@ def main():
     print("🏢 Ro-Tech Admin Portal wordt gestart...")
     
     try:
+        from src.utils.startup import get_startup_timer
+        timer = get_startup_timer()
+        timer.start(STARTED)
+        
         from src.gui import AdminPortalApp
+        timer.mark("imports")
         
         app = AdminPortalApp()
         app.run()
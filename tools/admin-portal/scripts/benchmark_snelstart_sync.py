@@ -0,0 +1,256 @@
+"""
+Benchmark - Doorvoer van de Snelstart sync tegen de lokale simulator.
+
+Draait `SnelstartSyncService` tegen `snelstart_simulator.py` met een
+tijdelijke database en meet per fase:
+- records per seconde
+- API calls per record (zoals de simulator ze telt)
+- database tijd en aantal statements per record
+
+Fasen: eerste klant sync, eerste factuur sync en een routine run zonder
+wijzigingen (die hoort vrijwel niets te doen).
+
+Gebruik (vanuit tools/admin-portal):
+    python scripts/benchmark_snelstart_sync.py --clients 50 --invoices 200 --latency 80
+    python scripts/benchmark_snelstart_sync.py --json > baseline.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from snelstart_simulator import SnelstartSimulator  # noqa: E402
+
+
+@dataclass
+class PhaseResult:
+    """Meetresultaat van één fase."""
+    name: str
+    records: int
+    synced: int
+    errors: int
+    seconds: float
+    api_calls: int
+    db_statements: int
+    db_ms: float
+
+    @property
+    def records_per_second(self) -> float:
+        return self.synced / self.seconds if self.seconds else 0.0
+
+    @property
+    def calls_per_record(self) -> float:
+        return self.api_calls / self.records if self.records else float(self.api_calls)
+
+    @property
+    def db_ms_per_record(self) -> float:
+        return self.db_ms / self.records if self.records else self.db_ms
+
+    def as_dict(self) -> Dict:
+        return {
+            **asdict(self),
+            "records_per_second": round(self.records_per_second, 2),
+            "calls_per_record": round(self.calls_per_record, 2),
+            "db_ms_per_record": round(self.db_ms_per_record, 2),
+        }
+
+
+class QueryTimer:
+    """Telt statements en cursor tijd via SQLAlchemy engine events."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = 0
+        self.seconds = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - getattr(self._local, "start", time.perf_counter())
+        with self._lock:
+            self.statements += 1
+            self.seconds += duration
+
+    def snapshot(self):
+        with self._lock:
+            return self.statements, self.seconds
+
+
+def configure_environment(simulator: SnelstartSimulator, data_dir: Path):
+    """Wijs de app naar de simulator en een tijdelijke database (vóór de eerste import van src)."""
+    os.environ.update({
+        "SNELSTART_API_URL": simulator.api_url,
+        "SNELSTART_AUTH_URL": simulator.auth_url,
+        "SNELSTART_CLIENT_ID": "benchmark",
+        "SNELSTART_CLIENT_SECRET": "benchmark",
+        "SNELSTART_SUBSCRIPTION_KEY": "benchmark",
+        "SNELSTART_AUTO_SYNC": "false",
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+
+    from src.utils.config import Config
+
+    Config.DATA_DIR = data_dir
+    Config.DATABASE_PATH = data_dir / "benchmark.db"
+
+
+def seed_portal(clients: int, invoices: int, existing: int):
+    """Maak klanten en verzonden facturen aan; de eerste `existing` klanten bestaan al in Snelstart."""
+    from src.database import get_db
+    from src.database.models import Client, Invoice, InvoiceType, InvoiceStatus
+
+    db = get_db()
+    with db.session() as session:
+        rows = []
+        for i in range(clients):
+            if i < existing:
+                # Zelfde email als de relatie in de simulator: moet gematcht worden
+                rows.append(Client(name=f"Bestaand Bedrijf {i}", email=f"info{i}@bestaand.example"))
+            else:
+                rows.append(Client(name=f"Klant {i}", company=f"Nieuw Bedrijf {i}", email=f"klant{i}@portal.example"))
+        session.add_all(rows)
+        session.flush()
+
+        for i in range(invoices):
+            invoice = Invoice(
+                invoice_type=InvoiceType.OUTGOING.value,
+                status=InvoiceStatus.SENT.value,
+                invoice_number=f"BENCH-{i:05d}",
+                client_id=rows[i % len(rows)].id if rows else None,
+                description=f"Benchmark factuur {i}",
+                amount_excl_vat=100.0 + i,
+                vat_percentage=21.0,
+                invoice_date=datetime.now(),
+            )
+            invoice.calculate_vat()
+            session.add(invoice)
+        session.commit()
+
+
+def measure(name: str, records: int, func: Callable, simulator: SnelstartSimulator, timer: QueryTimer) -> PhaseResult:
+    simulator.reset_stats()
+    statements_before, db_before = timer.snapshot()
+    start = time.perf_counter()
+
+    # sync_all() geeft (client_result, invoice_result)
+    results = func()
+    if not isinstance(results, tuple):
+        results = (results,)
+
+    seconds = time.perf_counter() - start
+    statements_after, db_after = timer.snapshot()
+
+    return PhaseResult(
+        name=name,
+        records=records,
+        synced=sum(r.synced for r in results),
+        errors=sum(r.errors for r in results),
+        seconds=round(seconds, 3),
+        api_calls=sum(count for key, count in simulator.requests.items() if key != "POST /token"),
+        db_statements=statements_after - statements_before,
+        db_ms=round((db_after - db_before) * 1000, 1),
+    )
+
+
+def run(args) -> List[PhaseResult]:
+    simulator = SnelstartSimulator(
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    ).start()
+    simulator.seed_relaties(args.existing)
+
+    with tempfile.TemporaryDirectory(prefix="snelstart-bench-") as tmp:
+        configure_environment(simulator, Path(tmp))
+
+        from src.database import init_db, get_db
+        from src.services.http_client import RateLimiter
+        from src.services.orchestrator import get_orchestrator
+        from src.services.snelstart_sync_service import get_snelstart_sync_service
+
+        init_db()
+        seed_portal(args.clients, args.invoices, min(args.existing, args.clients))
+
+        service = get_snelstart_sync_service()
+        if args.client_rate:
+            service.api._rate_limiter = RateLimiter(rate=args.client_rate, burst=max(1, int(args.client_rate)))
+        if args.in_flight:
+            service.max_in_flight = args.in_flight
+
+        timer = QueryTimer(get_db().engine)
+
+        try:
+            results = [
+                measure("clients (initial)", args.clients, service.sync_all_clients, simulator, timer),
+                measure("invoices (initial)", args.invoices, service.sync_all_invoices, simulator, timer),
+                measure("routine (no changes)", 0, service.sync_all, simulator, timer),
+            ]
+        finally:
+            get_orchestrator().shutdown()
+            get_db().engine.dispose()
+            simulator.stop()
+
+    return results
+
+
+def print_table(results: List[PhaseResult], args):
+    print(
+        f"Snelstart sync benchmark — {args.clients} klanten ({args.existing} bestaand), "
+        f"{args.invoices} facturen, latency {args.latency:.0f}+{args.jitter:.0f}ms, "
+        f"errors {args.error_rate:.0%}, server limit {args.rate_limit or '-'} req/s"
+    )
+    print()
+    header = f"{'fase':<22}{'records':>8}{'synced':>8}{'errors':>8}{'sec':>8}{'rec/s':>8}{'calls/rec':>11}{'db ms/rec':>11}{'stmts':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:<22}{r.records:>8}{r.synced:>8}{r.errors:>8}{r.seconds:>8.2f}"
+            f"{r.records_per_second:>8.1f}{r.calls_per_record:>11.2f}{r.db_ms_per_record:>11.2f}{r.db_statements:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Doorvoer benchmark voor de Snelstart sync")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--invoices", type=int, default=100)
+    parser.add_argument("--existing", type=int, default=5, help="klanten die al als relatie bestaan")
+    parser.add_argument("--latency", type=float, default=50.0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="server-side limit (429), req/s")
+    parser.add_argument("--client-rate", type=float, default=0.0, help="overschrijf de client rate limit, req/s")
+    parser.add_argument("--in-flight", type=int, default=0, help="overschrijf het aantal parallelle requests")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="resultaten als JSON")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    if args.json:
+        print(json.dumps({"args": vars(args), "phases": [r.as_dict() for r in results]}, indent=2))
+    else:
+        print_table(results, args)
+
+
+if __name__ == "__main__":
+    main()
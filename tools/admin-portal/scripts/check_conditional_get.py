@@ -0,0 +1,283 @@
+"""
+Conditional GET check - 200 → 304 round trips tegen een lokale website stub.
+
+Start een kleine stand-in voor de website API die de polling endpoints
+(`/admin/forms`, `/admin/work-orders`, `/admin/payments`,
+`/v1/sync/tickets`) met een ETag en Last-Modified serveert en een 304
+teruggeeft als de validators nog kloppen. Daarna pollt `WebsiteAPI.call`
+met `conditional=True` een aantal rondes en wordt gecontroleerd dat:
+- de eerste poll per endpoint een volledige 200 is
+- volgende polls een 304 zijn en NOT_MODIFIED teruggeven
+- na een wijziging op de server weer de nieuwe data binnenkomt
+- de bespaarde bytes van `ConditionalCache` kloppen met wat de stub niet
+  hoefde te versturen
+
+Exit code 1 als een van de controles faalt.
+
+Gebruik (vanuit tools/admin-portal):
+    python scripts/check_conditional_get.py --rounds 10 --items 200
+    python scripts/check_conditional_get.py --change-every 3 --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# Endpoint: (naam van de lijst in de response, params zoals de sync service ze stuurt)
+ENDPOINTS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "/admin/forms": ("submissions", {"unsynced": "true"}),
+    "/admin/work-orders": ("orders", {"unsynced": "true"}),
+    "/admin/payments": ("payments", {"unsynced": "true"}),
+    "/v1/sync/tickets": ("tickets", {"limit": "100"}),
+}
+
+
+class WebsiteStub:
+    """Website API stand-in met ETag/Last-Modified validators per endpoint."""
+
+    def __init__(self, items: int, api_key: str, host: str = "127.0.0.1", port: int = 0):
+        self.api_key = api_key
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._bodies: Dict[str, bytes] = {}
+        self._items = items
+
+        # Tellers per status en de body bytes die wel/niet verstuurd zijn
+        self.statuses: Counter = Counter()
+        self.bytes_sent = 0
+        self.bytes_not_sent = 0
+
+        for path in ENDPOINTS:
+            self.change(path)
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> "WebsiteStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def change(self, path: str):
+        """Nieuwe versie van een endpoint (nieuwe body, ETag en Last-Modified)."""
+        key, _ = ENDPOINTS[path]
+        with self._lock:
+            version = self._versions.get(path, 0) + 1
+            self._versions[path] = version
+            records = [
+                {
+                    "id": f"{key}-{version}-{i}",
+                    "name": f"Record {i}",
+                    "email": f"record{i}@stub.example",
+                    "message": "Lorem ipsum dolor sit amet " * 4,
+                    "version": version,
+                }
+                for i in range(self._items)
+            ]
+            self._bodies[path] = json.dumps({"success": True, key: records}).encode()
+
+    def version(self, path: str) -> int:
+        with self._lock:
+            return self._versions[path]
+
+    def handle(self, path: str, headers) -> Tuple[int, bytes, Dict[str, str]]:
+        if headers.get("Authorization") != f"Bearer {self.api_key}":
+            return 401, b'{"success": false}', {}
+
+        with self._lock:
+            body = self._bodies.get(path)
+            version = self._versions.get(path)
+        if body is None:
+            return 404, b'{"success": false}', {}
+
+        validators = {
+            "ETag": f'"{hashlib.sha1(body).hexdigest()}"',
+            # Elke versie een eigen seconde, zodat Last-Modified ook alleen al klopt
+            "Last-Modified": formatdate(1_700_000_000 + version, usegmt=True),
+        }
+
+        etag = headers.get("If-None-Match")
+        since = headers.get("If-Modified-Since")
+        if (etag and etag == validators["ETag"]) or (not etag and since == validators["Last-Modified"]):
+            with self._lock:
+                self.bytes_not_sent += len(body)
+            return 304, b"", validators
+
+        with self._lock:
+            self.bytes_sent += len(body)
+        return 200, body, {"Content-Type": "application/json", **validators}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if path.startswith("/api"):
+                    path = path[len("/api"):]
+
+                status, body, extra_headers = stub.handle(path, self.headers)
+                with stub._lock:
+                    stub.statuses[status] += 1
+
+                self.send_response(status)
+                for key, value in extra_headers.items():
+                    self.send_header(key, value)
+                if status != 304:
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def configure_environment(stub: WebsiteStub, data_dir: Path):
+    """Wijs de app naar de stub en een tijdelijke data map (vóór de eerste import van src)."""
+    os.environ.update({
+        "WEBSITE_API_URL": stub.url,
+        "WEBSITE_ADMIN_API_KEY": stub.api_key,
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+
+    from src.utils.config import Config
+
+    Config.DATA_DIR = data_dir
+    Config.DATABASE_PATH = data_dir / "check.db"
+
+
+def run(args) -> Tuple[Dict, List[str]]:
+    """Poll alle endpoints `rounds` keer; geeft (rapport, gefaalde controles)."""
+    stub = WebsiteStub(items=args.items, api_key="conditional-check").start()
+    failures: List[str] = []
+    polls: Counter = Counter()
+
+    with tempfile.TemporaryDirectory(prefix="conditional-check-") as tmp:
+        configure_environment(stub, Path(tmp))
+
+        from src.services.website_api import get_website_api
+
+        api = get_website_api()
+        api.configure(base_url=stub.url, api_key=stub.api_key)
+
+        try:
+            for round_no in range(args.rounds):
+                changed = set()
+                if round_no and args.change_every and round_no % args.change_every == 0:
+                    # Eén endpoint per wijzigingsronde, op volgorde
+                    path = list(ENDPOINTS)[(round_no // args.change_every - 1) % len(ENDPOINTS)]
+                    stub.change(path)
+                    changed.add(path)
+
+                for path, (key, params) in ENDPOINTS.items():
+                    result = api.call("GET", path, params=dict(params), conditional=True)
+                    expect_full = round_no == 0 or path in changed
+
+                    if result is None:
+                        failures.append(f"ronde {round_no} {path}: geen response")
+                    elif result.get("notModified"):
+                        polls["not_modified"] += 1
+                        if expect_full:
+                            failures.append(f"ronde {round_no} {path}: 304 terwijl de data nieuw is")
+                    else:
+                        polls["full"] += 1
+                        if not expect_full:
+                            failures.append(f"ronde {round_no} {path}: volledige download zonder wijziging")
+                        records = result.get(key) or []
+                        if len(records) != args.items or any(r["version"] != stub.version(path) for r in records):
+                            failures.append(f"ronde {round_no} {path}: verkeerde of oude data")
+        finally:
+            stub.stop()
+
+        cache_stats = api.get_cache_stats()
+
+    if cache_stats["bytes_saved"] != stub.bytes_not_sent:
+        failures.append(
+            f"bytes_saved van de cache ({cache_stats['bytes_saved']}) wijkt af van "
+            f"wat de stub niet verstuurd heeft ({stub.bytes_not_sent})"
+        )
+    if cache_stats["hits"] != stub.statuses[304]:
+        failures.append(f"cache hits ({cache_stats['hits']}) != 304 responses ({stub.statuses[304]})")
+
+    total = stub.bytes_sent + stub.bytes_not_sent
+    report = {
+        "requests": sum(stub.statuses.values()),
+        "statuses": {str(status): count for status, count in sorted(stub.statuses.items())},
+        "full_downloads": polls["full"],
+        "not_modified": polls["not_modified"],
+        "bytes_sent": stub.bytes_sent,
+        "bytes_saved": stub.bytes_not_sent,
+        "bytes_unconditional": total,
+        "saved_ratio": round(stub.bytes_not_sent / total, 3) if total else 0.0,
+        "cache": cache_stats,
+    }
+    return report, failures
+
+
+def print_report(report: Dict, failures: List[str], args):
+    print(
+        f"Conditional GET check — {len(ENDPOINTS)} endpoints, {args.rounds} rondes, "
+        f"{args.items} records per response, wijziging elke {args.change_every or '-'} rondes"
+    )
+    print()
+    print(f"  requests:            {report['requests']} ({', '.join(f'{k}: {v}' for k, v in report['statuses'].items())})")
+    print(f"  volledige downloads: {report['full_downloads']}")
+    print(f"  304 not modified:    {report['not_modified']}")
+    print(f"  bytes verstuurd:     {report['bytes_sent']:,}")
+    print(f"  bytes bespaard:      {report['bytes_saved']:,} van {report['bytes_unconditional']:,} ({report['saved_ratio']:.0%})")
+    print()
+    if failures:
+        print("FOUT:")
+        for failure in failures:
+            print(f"  - {failure}")
+    else:
+        print("OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controleer conditional GETs (ETag/Last-Modified) van WebsiteAPI")
+    parser.add_argument("--rounds", type=int, default=5, help="aantal poll rondes")
+    parser.add_argument("--items", type=int, default=100, help="records per response")
+    parser.add_argument("--change-every", type=int, default=0, help="wijzig elke N rondes één endpoint (0 = nooit)")
+    parser.add_argument("--json", action="store_true", help="rapport als JSON")
+    args = parser.parse_args()
+
+    report, failures = run(args)
+
+    if args.json:
+        print(json.dumps({"args": vars(args), **report, "failures": failures}, indent=2))
+    else:
+        print_report(report, failures, args)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
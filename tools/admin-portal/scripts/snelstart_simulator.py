@@ -0,0 +1,349 @@
+"""
+Snelstart Simulator - Lokale stand-in voor de Snelstart B2B API.
+
+Implementeert het deel van de API dat `SnelstartAPI` gebruikt: het token
+endpoint, relaties, verkoop- en inkoopboekingen en de referentie data.
+Latency, foutpercentage en een rate limit (429 met Retry-After) zijn
+instelbaar, zodat de sync zonder echte administratie belast kan worden.
+
+Gebruik:
+    python scripts/snelstart_simulator.py --port 8790 --latency 80 --rate-limit 10
+
+Zet daarna in .env:
+    SNELSTART_API_URL=http://127.0.0.1:8790/v2
+    SNELSTART_AUTH_URL=http://127.0.0.1:8790/token
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Tuple, Any
+from urllib.parse import urlsplit, parse_qs
+
+
+REFERENCE_DATA = {
+    "grootboekrekeningen": [
+        {"id": str(uuid.UUID(int=1)), "nummer": 1300, "omschrijving": "Debiteuren"},
+        {"id": str(uuid.UUID(int=2)), "nummer": 8000, "omschrijving": "Omzet hoog"},
+        {"id": str(uuid.UUID(int=3)), "nummer": 8010, "omschrijving": "Omzet laag"},
+    ],
+    "btwtarieven": [
+        {"btwSoort": "Hoog", "btwPercentage": 21.0},
+        {"btwSoort": "Laag", "btwPercentage": 9.0},
+        {"btwSoort": "Geen", "btwPercentage": 0.0},
+    ],
+    "landen": [
+        {"id": str(uuid.UUID(int=10)), "naam": "Nederland", "landcodeISO": "NL"},
+        {"id": str(uuid.UUID(int=11)), "naam": "België", "landcodeISO": "BE"},
+    ],
+    "kostenplaatsen": [
+        {"id": str(uuid.UUID(int=20)), "nummer": 1, "omschrijving": "Algemeen"},
+    ],
+}
+
+COLLECTIONS = ("relaties", "verkoopboekingen", "inkoopboekingen")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class SnelstartSimulator:
+    """In-memory Snelstart administratie met een HTTP server ervoor."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        token_ttl: int = 3600,
+        seed: int = None
+    ):
+        """
+        Args:
+            port: 0 = vrije poort kiezen
+            latency_ms: Vaste vertraging per request
+            jitter_ms: Willekeurige extra vertraging (0..jitter_ms)
+            error_rate: Kans op een 500 per API request (0..1)
+            rate_limit: Maximaal aantal requests per seconde (0 = onbeperkt)
+            token_ttl: expires_in van uitgegeven tokens
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.token_ttl = token_ttl
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}  # token: expires (epoch)
+        self._data: Dict[str, Dict[str, Dict]] = {name: {} for name in COLLECTIONS}
+        self._window: deque = deque()  # timestamps voor de rate limit
+        self.requests: Counter = Counter()  # "GET /relaties": aantal
+        self.statuses: Counter = Counter()
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # === LIFECYCLE ===
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.url}/v2"
+
+    @property
+    def auth_url(self) -> str:
+        return f"{self.url}/token"
+
+    def start(self) -> "SnelstartSimulator":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve(self):
+        """Draai in de huidige thread tot Ctrl+C."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # === DATA ===
+
+    def seed_relaties(self, count: int, prefix: str = "SIM") -> List[Dict]:
+        """Vul de administratie met bestaande relaties."""
+        created = []
+        for i in range(count):
+            created.append(self._insert("relaties", {
+                "relatiecode": f"{prefix}{i:05d}",
+                "naam": f"Bestaand Bedrijf {i} B.V.",
+                "email": f"info{i}@bestaand.example",
+                "relatiesoort": ["Klant"],
+            }))
+        return created
+
+    def _insert(self, collection: str, record: Dict) -> Dict:
+        record = {**record, "id": str(uuid.uuid4()), "modifiedOn": _now()}
+        with self._lock:
+            self._data[collection][record["id"]] = record
+        return record
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return len(self._data[collection])
+
+    def reset_stats(self):
+        with self._lock:
+            self.requests.clear()
+            self.statuses.clear()
+
+    # === REQUEST HANDLING ===
+
+    def _throttled(self) -> Optional[float]:
+        """Seconden tot er weer plek is, of None als de request door mag."""
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] >= 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.rate_limit:
+                return max(0.0, 1.0 - (now - self._window[0]))
+            self._window.append(now)
+        return None
+
+    def handle(self, method: str, path: str, query: Dict[str, str], headers, body: Any) -> Tuple[int, Any, Dict]:
+        """Verwerk één request; geeft (status, body, extra headers)."""
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000)
+
+        if path == "/token" and method == "POST":
+            return self._issue_token()
+
+        if not path.startswith("/v2/"):
+            return 404, {"message": "Not found"}, {}
+
+        retry_after = self._throttled()
+        if retry_after is not None:
+            return 429, {"message": "Rate limit is exceeded"}, {"Retry-After": str(max(1, round(retry_after)))}
+
+        if not self._authorized(headers.get("Authorization", "")):
+            return 401, {"message": "Unauthorized"}, {}
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, {"message": "Simulated server error"}, {}
+
+        parts = path[len("/v2/"):].strip("/").split("/")
+        resource = parts[0]
+
+        if resource in REFERENCE_DATA and method == "GET":
+            return 200, REFERENCE_DATA[resource], {}
+
+        if resource not in COLLECTIONS:
+            return 404, {"message": f"Unknown resource {resource}"}, {}
+
+        if len(parts) == 1 and method == "GET":
+            return 200, self._list(resource, query), {}
+        if len(parts) == 1 and method == "POST":
+            return self._create(resource, body)
+        if len(parts) == 2 and method == "GET":
+            record = self._data[resource].get(parts[1])
+            return (200, record, {}) if record else (404, {"message": "Not found"}, {})
+        if len(parts) == 2 and method == "PUT":
+            return self._update(resource, parts[1], body)
+
+        return 405, {"message": "Method not allowed"}, {}
+
+    def _issue_token(self) -> Tuple[int, Any, Dict]:
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return 200, {"access_token": token, "token_type": "bearer", "expires_in": self.token_ttl}, {}
+
+    def _authorized(self, header: str) -> bool:
+        token = header[len("Bearer "):] if header.startswith("Bearer ") else ""
+        with self._lock:
+            return self._tokens.get(token, 0) > time.time()
+
+    def _list(self, resource: str, query: Dict[str, str]) -> List[Dict]:
+        with self._lock:
+            records = list(self._data[resource].values())
+
+        # Alleen de filter die SnelstartAPI gebruikt: "modifiedOn gt <ts>"
+        odata_filter = query.get("$filter", "")
+        if odata_filter.startswith("modifiedOn gt "):
+            since = odata_filter[len("modifiedOn gt "):].strip("'")
+            records = [r for r in records if r["modifiedOn"] > since]
+        if query.get("$orderby", "").startswith("modifiedOn"):
+            records.sort(key=lambda r: r["modifiedOn"])
+
+        skip = int(query.get("$skip", 0))
+        top = int(query.get("$top", 500))
+        return records[skip:skip + top]
+
+    def _create(self, resource: str, body: Any) -> Tuple[int, Any, Dict]:
+        if not isinstance(body, dict):
+            return 400, {"message": "Body required"}, {}
+
+        if resource == "relaties":
+            if not body.get("naam"):
+                return 400, {"message": "naam is verplicht"}, {}
+            code = body.get("relatiecode")
+            with self._lock:
+                duplicate = code and any(r.get("relatiecode") == code for r in self._data["relaties"].values())
+            if duplicate:
+                return 400, {"message": f"Relatiecode {code} bestaat al"}, {}
+        elif resource == "verkoopboekingen":
+            relatie_id = (body.get("relatie") or {}).get("id")
+            if relatie_id not in self._data["relaties"]:
+                return 400, {"message": "Onbekende relatie"}, {}
+
+        return 201, self._insert(resource, body), {}
+
+    def _update(self, resource: str, record_id: str, body: Any) -> Tuple[int, Any, Dict]:
+        with self._lock:
+            record = self._data[resource].get(record_id)
+            if record is None:
+                return 404, {"message": "Not found"}, {}
+            record.update({k: v for k, v in (body or {}).items() if k != "id"})
+            record["modifiedOn"] = _now()
+            return 200, dict(record), {}
+
+    def _handler_class(self):
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method: str):
+                parsed = urlsplit(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw and "json" in (self.headers.get("Content-Type") or "") else None
+                except ValueError:
+                    body = None
+
+                status, payload, extra_headers = simulator.handle(method, parsed.path, query, self.headers, body)
+
+                resource = parsed.path.split("/")[2] if parsed.path.startswith("/v2/") else parsed.path.strip("/")
+                with simulator._lock:
+                    simulator.requests[f"{method} /{resource}"] += 1
+                    simulator.statuses[status] += 1
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in extra_headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokale Snelstart B2B API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency", type=float, default=50.0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=20.0, help="extra willekeurige ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="kans op een 500 (0..1)")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per seconde (0 = geen)")
+    parser.add_argument("--relaties", type=int, default=0, help="aantal bestaande relaties")
+    args = parser.parse_args()
+
+    simulator = SnelstartSimulator(
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+    )
+    simulator.seed_relaties(args.relaties)
+
+    print(f"Snelstart simulator op {simulator.url}")
+    print(f"  SNELSTART_API_URL={simulator.api_url}")
+    print(f"  SNELSTART_AUTH_URL={simulator.auth_url}")
+
+    simulator.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Database module."""
 
 from .database import Database, get_db, init_db
+from .change_events import ChangeEvent, get_change_bus
 from .models import (
     Base,
     Email,
@@ -14,5 +15,9 @@ from .models import (
     InvoiceStatus,
     InvoiceType,
     Note,
-    Setting
+    Setting,
+    SyncCursor,
+    InvoiceSequence,
+    SnelstartRelatieRecord,
+    OutboxEntry
 )
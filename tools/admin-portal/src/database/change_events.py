@@ -0,0 +1,145 @@
+"""
+Change events - In-process bus voor wijzigingen aan records die in lijsten staan.
+
+ORM hooks leggen bij elke flush (entity, id, operation) vast voor emails,
+formulieren, leads, klanten en facturen; na de commit gaan ze als één batch
+naar de subscribers. Een rollback gooit de batch weg. Services die buiten
+de flush om schrijven (bulk `update()`) publiceren zelf via `publish()`.
+
+Subscribers worden aangeroepen in de thread die commit (vaak een sync of
+loader thread); GUI code moet zelf terug naar de Tk main thread.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from .models import Client, Email, FormSubmission, Invoice, Lead
+from ..utils.config import logger
+
+
+# Modellen waarvan wijzigingen gepubliceerd worden
+ENTITIES: Dict[type, str] = {
+    Email: "email",
+    FormSubmission: "form",
+    Lead: "lead",
+    Client: "client",
+    Invoice: "invoice",
+}
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+_SESSION_KEY = "change_events"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """Eén gewijzigd record."""
+    entity: str
+    entity_id: int
+    operation: str  # insert / update / delete
+
+
+class ChangeBus:
+    """Verdeelt change events over subscribers, per entity gefilterd."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Callable, Optional[Set[str]]] = {}
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None], entities: Optional[Iterable[str]] = None):
+        """
+        Registreer callback(events) voor alle of alleen de opgegeven entities.
+
+        De callback krijgt per commit één lijst met de events die hij wil zien.
+        """
+        with self._lock:
+            self._subscribers[callback] = set(entities) if entities is not None else None
+
+    def unsubscribe(self, callback: Callable):
+        with self._lock:
+            self._subscribers.pop(callback, None)
+
+    def publish(self, events: Iterable[ChangeEvent]):
+        """Stuur een batch events naar de subscribers."""
+        events = list(events)
+        if not events:
+            return
+
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for callback, entities in subscribers:
+            selected = events if entities is None else [e for e in events if e.entity in entities]
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                logger.error(f"Change event subscriber error: {e}")
+
+    def emit(self, entity: str, ids: Iterable[int], operation: str = UPDATE):
+        """Publiceer dezelfde operatie voor een reeks ids."""
+        self.publish(ChangeEvent(entity, entity_id, operation) for entity_id in ids)
+
+
+# Global instance
+_change_bus: Optional[ChangeBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_change_bus() -> ChangeBus:
+    """Get the global change bus instance."""
+    global _change_bus
+    with _bus_lock:
+        if _change_bus is None:
+            _change_bus = ChangeBus()
+        return _change_bus
+
+
+# === ORM HOOKS ===
+
+def _after_flush(session, flush_context):
+    """Verzamel events (ids van nieuwe objecten zijn nu bekend)."""
+    events = session.info.setdefault(_SESSION_KEY, {})
+
+    for obj in session.new:
+        entity = ENTITIES.get(type(obj))
+        if entity:
+            events[(entity, obj.id)] = INSERT
+
+    for obj in session.dirty:
+        entity = ENTITIES.get(type(obj))
+        if entity and session.is_modified(obj, include_collections=False):
+            # Een insert + update in dezelfde transactie blijft een insert
+            events.setdefault((entity, obj.id), UPDATE)
+
+    for obj in session.deleted:
+        entity = ENTITIES.get(type(obj))
+        if entity:
+            events[(entity, obj.id)] = DELETE
+
+
+def _after_commit(session):
+    events = session.info.pop(_SESSION_KEY, None)
+    if events:
+        get_change_bus().publish(
+            ChangeEvent(entity, entity_id, operation)
+            for (entity, entity_id), operation in events.items()
+        )
+
+
+def _after_rollback(session):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def register_change_hooks(session_factory: sessionmaker):
+    """Publiceer wijzigingen van alle sessies uit deze factory."""
+    event.listen(session_factory, "after_flush", _after_flush)
+    event.listen(session_factory, "after_commit", _after_commit)
+    event.listen(session_factory, "after_rollback", _after_rollback)
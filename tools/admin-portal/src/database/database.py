@@ -2,12 +2,14 @@
 Database connection en session management.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from typing import Generator
 
 from .models import Base
+from .outbox import register_outbox_hooks
+from .change_events import register_change_hooks
 from ..utils.config import Config, logger
 
 
@@ -43,13 +45,45 @@ class Database:
             autocommit=False,
             autoflush=False
         )
+        register_outbox_hooks(self._session_factory)
+        register_change_hooks(self._session_factory)
     
     def create_tables(self):
         """Create all tables in database."""
         logger.info("Creating database tables...")
         Base.metadata.create_all(self._engine)
+        self._add_missing_columns()
         logger.info("Database tables created successfully")
     
+    def _add_missing_columns(self):
+        """
+        Voeg nieuwe kolommen en indexes toe aan bestaande tabellen.
+        
+        create_all() maakt alleen ontbrekende tabellen aan; kolommen die later
+        aan een model zijn toegevoegd worden hier met ALTER TABLE aangevuld.
+        """
+        inspector = inspect(self._engine)
+        
+        with self._engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    continue
+                
+                existing = {col["name"] for col in inspector.get_columns(table.name)}
+                
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    
+                    col_type = column.type.compile(dialect=self._engine.dialect)
+                    conn.execute(text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'
+                    ))
+                    logger.info(f"Added column {table.name}.{column.name}")
+                
+                for index in table.indexes:
+                    index.create(conn, checkfirst=True)
+    
     @contextmanager
     def session(self) -> Generator[Session, None, None]:
         """Context manager voor database sessions."""
@@ -107,4 +141,26 @@ def init_db():
         
         session.commit()
     
+    _backfill_form_external_refs(db)
+    
     logger.info("Database initialized with default settings")
+
+
+def _backfill_form_external_refs(db: Database):
+    """Vul external_ref voor website forms die van vóór deze kolom zijn (eenmalig)."""
+    with db.session() as session:
+        # Alleen de oudste per source; eventuele oude duplicaten blijven leeg
+        result = session.execute(text("""
+            UPDATE form_submissions
+            SET external_ref = source
+            WHERE external_ref IS NULL
+              AND (source LIKE 'form:%' OR source LIKE 'order:%' OR source LIKE 'api:%')
+              AND source NOT IN (
+                  SELECT external_ref FROM form_submissions WHERE external_ref IS NOT NULL
+              )
+              AND id IN (SELECT MIN(id) FROM form_submissions GROUP BY source)
+        """))
+        session.commit()
+        
+        if result.rowcount:
+            logger.info(f"Backfilled external_ref for {result.rowcount} form submissions")
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
     Column, Integer, String, Text, Boolean, Float, DateTime, 
-    ForeignKey, Enum, create_engine
+    ForeignKey, Enum, UniqueConstraint, Index, create_engine
 )
 from sqlalchemy.orm import relationship, DeclarativeBase
 import enum
@@ -194,7 +194,9 @@ class FormSubmission(Base):
     
     # Meta
     source = Column(String(50), default="website")
+    external_ref = Column(String(100), unique=True, index=True, nullable=True)  # form:<id>, order:<id>, api:<id>
     ip_address = Column(String(50), nullable=True)
+    payload_hash = Column(String(64), nullable=True, index=True)  # SHA-256 van webhook body (dedup)
     
     # Timestamps
     submitted_at = Column(DateTime, default=datetime.utcnow)
@@ -281,7 +283,7 @@ class Client(Base):
     # Snelstart integration
     snelstart_relatie_id = Column(String(100), nullable=True)  # Snelstart relatie UUID
     snelstart_relatiecode = Column(String(50), nullable=True)  # Snelstart relatiecode
-    snelstart_sync_status = Column(String(20), nullable=True)  # pending, synced, error
+    snelstart_sync_status = Column(String(20), nullable=True)  # pending, synced, error, review
     snelstart_last_sync = Column(DateTime, nullable=True)
     snelstart_error = Column(Text, nullable=True)
     
@@ -609,8 +611,11 @@ class IssueSolution(Base):
     action_description = Column(Text, nullable=True)
     
     # Result
+    status = Column(String(20), nullable=True)  # running, succeeded, failed, timeout, cancelled
     was_successful = Column(Boolean, default=False)
-    error_output = Column(Text, nullable=True)
+    error_output = Column(Text, nullable=True)  # Streamed stdout/stderr of the command
+    return_code = Column(Integer, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
     
     # Learning
     similarity_pattern = Column(Text, nullable=True)  # JSON: patterns to match similar issues
@@ -867,3 +872,66 @@ class Setting(Base):
     
     def __repr__(self):
         return f"<Setting {self.key}>"
+
+
+class SyncCursor(Base):
+    """Laatst geziene positie per website sync categorie (incrementele sync)."""
+    __tablename__ = "sync_cursors"
+    
+    id = Column(Integer, primary_key=True)
+    category = Column(String(50), unique=True, nullable=False)  # forms, work_orders, payments, tickets, ...
+    last_timestamp = Column(String(40), nullable=True)  # ISO timestamp zoals de website die teruggeeft
+    last_id = Column(String(100), nullable=True)  # Tie-breaker bij gelijke timestamps
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<SyncCursor {self.category} {self.last_timestamp}>"
+
+
+class InvoiceSequence(Base):
+    """Laatst uitgegeven factuurnummer per nummerreeks en jaar."""
+    __tablename__ = "invoice_sequences"
+    __table_args__ = (UniqueConstraint("series", "year", name="uq_invoice_sequence"),)
+    
+    id = Column(Integer, primary_key=True)
+    series = Column(String(20), nullable=False)  # FAC, CRED, ...
+    year = Column(Integer, nullable=False)
+    last_number = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<InvoiceSequence {self.series}-{self.year} {self.last_number}>"
+
+
+class SnelstartRelatieRecord(Base):
+    """Lokale kopie van een Snelstart relatie (voor matching zonder API calls)."""
+    __tablename__ = "snelstart_relaties"
+    
+    id = Column(Integer, primary_key=True)
+    relatie_id = Column(String(100), unique=True, nullable=False, index=True)  # Snelstart UUID
+    relatiecode = Column(String(50), nullable=True, index=True)
+    naam = Column(String(255), nullable=True)
+    email = Column(String(255), nullable=True)
+    kvk_nummer = Column(String(50), nullable=True)
+    modified_on = Column(String(40), nullable=True)  # modifiedOn zoals Snelstart die teruggeeft
+    data = Column(Text, nullable=True)  # Volledige relatie als JSON
+    synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<SnelstartRelatieRecord {self.relatiecode} {self.naam}>"
+
+
+class OutboxEntry(Base):
+    """Wijziging aan een klant of factuur die nog naar de boekhouding moet."""
+    __tablename__ = "sync_outbox"
+    __table_args__ = (Index("ix_sync_outbox_entity", "entity", "entity_id"),)
+    
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)  # client, invoice
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(10), nullable=False)  # insert, update, delete
+    changed_fields = Column(Text, nullable=True)  # JSON lijst met gewijzigde velden
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<OutboxEntry {self.operation} {self.entity} {self.entity_id}>"
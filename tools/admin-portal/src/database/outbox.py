@@ -0,0 +1,92 @@
+"""
+Outbox hooks - Leg wijzigingen aan klanten en facturen vast voor de boekhouding sync.
+
+Bij elke flush wordt voor nieuwe, gewijzigde en verwijderde `Client` en
+`Invoice` objecten een regel in `sync_outbox` geschreven, met de velden
+die voor Snelstart relevant zijn en veranderd zijn. Dat gebeurt op de
+connection van de flush, dus de outbox regel commit (of rolt terug) samen
+met de wijziging zelf.
+
+Bulk `update()` statements gaan buiten de flush om en worden niet
+vastgelegd; de sync schrijft zijn eigen status zo terug. Zonder Snelstart
+configuratie is er geen sync die de outbox leegt, dan wordt er niets
+vastgelegd.
+"""
+
+import json
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.orm import sessionmaker
+
+from .models import Client, Invoice, OutboxEntry
+from ..utils.config import Config
+
+
+# Velden die naar Snelstart gaan; wijzigingen aan andere velden (status,
+# snelstart_* administratie, timestamps) komen niet in de outbox
+TRACKED_FIELDS: Dict[type, Tuple[str, Tuple[str, ...]]] = {
+    Client: ("client", ("name", "email", "phone", "company", "address")),
+    Invoice: ("invoice", (
+        "invoice_type", "status", "invoice_number", "client_id", "description",
+        "amount_excl_vat", "vat_percentage", "invoice_date",
+    )),
+}
+
+
+def changed_fields(obj) -> List[str]:
+    """Gewijzigde Snelstart velden van een object (lege lijst als het geen outbox model is)."""
+    tracked = TRACKED_FIELDS.get(type(obj))
+    if not tracked:
+        return []
+    state = inspect(obj)
+    return [name for name in tracked[1] if state.attrs[name].history.has_changes()]
+
+
+def _before_flush(session, flush_context, instances):
+    """Zet een gesynchroniseerde klant terug op pending als Snelstart velden wijzigen."""
+    for obj in session.dirty:
+        if isinstance(obj, Client) and obj.snelstart_sync_status == "synced" and changed_fields(obj):
+            obj.snelstart_sync_status = "pending"
+
+
+def _after_flush(session, flush_context):
+    """Schrijf outbox regels (ids van nieuwe objecten zijn nu bekend)."""
+    if not Config.is_snelstart_configured():
+        return
+
+    rows = []
+
+    for obj in session.new:
+        tracked = TRACKED_FIELDS.get(type(obj))
+        if tracked:
+            fields = [name for name in tracked[1] if getattr(obj, name) is not None]
+            rows.append(_row(tracked[0], obj.id, "insert", fields))
+
+    for obj in session.dirty:
+        fields = changed_fields(obj)
+        if fields:
+            rows.append(_row(TRACKED_FIELDS[type(obj)][0], obj.id, "update", fields))
+
+    for obj in session.deleted:
+        tracked = TRACKED_FIELDS.get(type(obj))
+        if tracked:
+            rows.append(_row(tracked[0], obj.id, "delete", []))
+
+    if rows:
+        session.connection().execute(insert(OutboxEntry.__table__), rows)
+
+
+def _row(entity: str, entity_id: int, operation: str, fields: List[str]) -> Dict:
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "operation": operation,
+        "changed_fields": json.dumps(fields),
+    }
+
+
+def register_outbox_hooks(session_factory: sessionmaker):
+    """Koppel de outbox aan alle sessies uit deze factory."""
+    event.listen(session_factory, "before_flush", _before_flush)
+    event.listen(session_factory, "after_flush", _after_flush)
@@ -0,0 +1,98 @@
+"""
+Keyset pagination - Pagina's ophalen met een stabiele (sort_key, id) cursor.
+
+In plaats van OFFSET onthoudt de cursor de sorteerwaarde en het id van de
+laatste rij; de volgende pagina begint direct daarna. Dat blijft even snel
+diep in de historie en schuift niet als er intussen rijen bovenaan bijkomen.
+
+Het id breekt gelijke sorteerwaarden. Rijen zonder sorteerwaarde (NULL)
+komen achteraan, in beide richtingen.
+
+    page = keyset_page(session.query(Email), Email.sent_at)
+    ...
+    page = keyset_page(session.query(Email), Email.sent_at, after=page.cursor)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import and_, or_
+
+
+PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Positie van de laatste rij van een pagina."""
+    sort_value: Any
+    id: int
+
+
+@dataclass(frozen=True)
+class Page:
+    """Eén pagina rijen; `cursor` is None op de laatste pagina."""
+    rows: List[Any]
+    cursor: Optional[PageCursor] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.cursor is not None
+
+    def map(self, func: Callable[[List[Any]], List[Any]]) -> "Page":
+        """Zelfde pagina met omgezette rijen (bv. `page.map(snapshots)`)."""
+        return Page(func(self.rows), self.cursor)
+
+
+def keyset_page(
+    query,
+    sort_column,
+    after: Optional[PageCursor] = None,
+    limit: int = PAGE_SIZE,
+    descending: bool = True
+) -> Page:
+    """
+    Haal één pagina op, gesorteerd op (sort_column, id).
+
+    Args:
+        query: Gefilterde ORM query op één model (zonder order_by/limit)
+        sort_column: Kolom attribuut om op te sorteren, bv. `Email.sent_at`
+        after: Cursor van de vorige pagina (None = eerste pagina)
+        limit: Aantal rijen per pagina
+        descending: Nieuwste/hoogste eerst
+    """
+    model = sort_column.class_
+    id_column = model.id
+
+    if after is not None:
+        query = query.filter(_after(sort_column, id_column, after, descending))
+
+    if descending:
+        order = (sort_column.is_(None), sort_column.desc(), id_column.desc())
+    else:
+        order = (sort_column.is_(None), sort_column.asc(), id_column.asc())
+
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return Page(rows)
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, PageCursor(getattr(last, sort_column.key), last.id))
+
+
+def _after(sort_column, id_column, cursor: PageCursor, descending: bool):
+    """Filter voor alle rijen ná de cursor in de sorteervolgorde."""
+    beyond_id = id_column < cursor.id if descending else id_column > cursor.id
+
+    if cursor.sort_value is None:
+        # Al in het NULL staartstuk: alleen nog op id
+        return and_(sort_column.is_(None), beyond_id)
+
+    beyond_value = sort_column < cursor.sort_value if descending else sort_column > cursor.sort_value
+    return or_(
+        beyond_value,
+        and_(sort_column == cursor.sort_value, beyond_id),
+        sort_column.is_(None),
+    )
@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import Optional
 
 from ..services.website_api import get_website_api, APIStatus, APIHealth
+from ..services.orchestrator import get_orchestrator
+from ..services.telemetry import get_telemetry
 from ..utils.config import Config, logger
 
 
@@ -387,6 +389,22 @@ class APIView(ctk.CTkFrame):
             font=ctk.CTkFont(size=11, family="Consolas")
         )
         self.history_text.grid(row=len(endpoints)+3, column=0, sticky="ew")
+        
+        # Sync health (telemetry per job en endpoint)
+        health_title = ctk.CTkLabel(
+            endpoints_frame,
+            text="⏱️ Sync Health (p50 / p95)",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            anchor="w"
+        )
+        health_title.grid(row=len(endpoints)+4, column=0, sticky="w", pady=(20, 10))
+        
+        self.health_text = ctk.CTkTextbox(
+            endpoints_frame,
+            height=200,
+            font=ctk.CTkFont(size=11, family="Consolas")
+        )
+        self.health_text.grid(row=len(endpoints)+5, column=0, sticky="ew")
     
     def refresh(self):
         """Refresh API status."""
@@ -515,3 +533,58 @@ class APIView(ctk.CTkFrame):
                 line = f"{timestamp} {method} {endpoint} → {status} ({duration}ms)\n"
             
             self.history_text.insert("end", line)
+        
+        self._update_health()
+    
+    def _update_health(self):
+        """Update sync health panel (traagste p95 bovenaan, daarna de geplande jobs)."""
+        summary = get_telemetry().get_summary()
+        
+        self.health_text.delete("1.0", "end")
+        
+        if not summary:
+            self.health_text.insert("end", "Nog geen runs geregistreerd\n")
+            self._update_jobs()
+            return
+        
+        header = f"{'Job / endpoint':<40} {'runs':>5} {'p50':>7} {'p95':>7} {'fout%':>6} {'items':>6} {'KB':>8}  laatste fout\n"
+        self.health_text.insert("end", header)
+        
+        for row in summary:
+            last_error = row["last_error"] or ""
+            if last_error and row["last_error_at"]:
+                last_error = f"{row['last_error_at'].strftime('%H:%M')} {last_error}"
+            
+            line = (
+                f"{row['name'][:40]:<40} {row['runs']:>5} "
+                f"{row['p50_ms']:>5}ms {row['p95_ms']:>5}ms "
+                f"{row['error_rate'] * 100:>5.0f}% {row['items']:>6} "
+                f"{row['bytes'] / 1024:>8.1f}  {last_error[:60]}\n"
+            )
+            self.health_text.insert("end", line)
+        
+        self._update_jobs()
+    
+    def _update_jobs(self):
+        """Schema en duur per orchestrator job (onder de telemetry)."""
+        jobs = sorted(get_orchestrator().get_job_stats(), key=lambda job: job["name"])
+        if not jobs:
+            return
+        
+        header = f"\n{'Job':<28} {'status':<14} {'runs':>5} {'laatst':>8} {'gem.':>8} {'fouten':>7}  laatste fout\n"
+        self.health_text.insert("end", header)
+        
+        for job in jobs:
+            if job["running"]:
+                status = "loopt"
+            elif job["next_run_in"] is None:
+                status = "wacht op groep"
+            else:
+                status = f"over {job['next_run_in'] // 60}m{job['next_run_in'] % 60:02d}s"
+            
+            line = (
+                f"{job['name'][:28]:<28} {status:<14} {job['run_count']:>5} "
+                f"{job['last_duration_ms']:>6}ms {job['avg_duration_ms']:>6}ms {job['failures']:>7}  "
+                f"{(job['last_error'] or '')[:60]}\n"
+            )
+            self.health_text.insert("end", line)
@@ -4,30 +4,44 @@ Main Application Window voor Ro-Tech Admin Portal.
 
 import customtkinter as ctk
 from tkinter import messagebox
-from typing import Optional, Dict, Type
+from typing import Optional, Dict, Tuple, Type
+import importlib
 import threading
+import time
 
 from ..utils.config import Config, logger
+from ..utils.startup import get_startup_timer
 from ..database import get_db, init_db
 from ..database.models import EmailAccount
 from .sidebar import Sidebar
-from .dashboard import DashboardView
-from .email_view import EmailView
-from .leads_view import LeadsView
-from .inbox_view import InboxView
-from .clients_view import ClientsView
-from .invoices_view import InvoicesView
-from .snelstart_view import SnelstartView
-from .monitor_view import MonitorView
-from .support_view import SupportView
-from .settings_view import SettingsView
-from .api_view import APIView
+
+
+# View name: (module, class). Views (en de services die ze importeren)
+# worden pas geladen en gebouwd bij de eerste navigatie.
+VIEWS: Dict[str, Tuple[str, str]] = {
+    "dashboard": (".dashboard", "DashboardView"),
+    "email": (".email_view", "EmailView"),
+    "inbox": (".inbox_view", "InboxView"),
+    "leads": (".leads_view", "LeadsView"),
+    "clients": (".clients_view", "ClientsView"),
+    "invoices": (".invoices_view", "InvoicesView"),
+    "snelstart": (".snelstart_view", "SnelstartView"),
+    "monitor": (".monitor_view", "MonitorView"),
+    "support": (".support_view", "SupportView"),
+    "api": (".api_view", "APIView"),
+    "settings": (".settings_view", "SettingsView"),
+}
+
+# Pauze tussen het starten van achtergrond services (ms), zodat het
+# venster tussendoor input blijft verwerken
+SERVICE_START_DELAY = 50
 
 
 class AdminPortalApp(ctk.CTk):
     """Main application window."""
     
     def __init__(self):
+        timer = get_startup_timer()
         super().__init__()
         
         # Window setup
@@ -38,9 +52,11 @@ class AdminPortalApp(ctk.CTk):
         # Set theme
         ctk.set_appearance_mode(Config.APP_THEME)
         ctk.set_default_color_theme("blue")
+        timer.mark("window")
         
         # Initialize database
         self._init_database()
+        timer.mark("database")
         
         # Views registry
         self._views: Dict[str, ctk.CTkFrame] = {}
@@ -49,15 +65,17 @@ class AdminPortalApp(ctk.CTk):
         # Sync scheduler references
         self._sync_scheduler = None
         self._payment_scheduler = None
+        self._work_order_scheduler = None
         
         # Build UI
         self._setup_ui()
         
         # Show dashboard by default
         self.show_view("dashboard")
+        timer.mark("dashboard")
         
-        # Start background services
-        self._start_background_services()
+        # Background services start once the window has been drawn
+        self.after_idle(self._on_first_paint)
         
         logger.info("Admin Portal started")
     
@@ -85,20 +103,18 @@ class AdminPortalApp(ctk.CTk):
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(0, weight=1)
         
-        # Initialize views (lazy loading)
-        self._view_classes: Dict[str, Type[ctk.CTkFrame]] = {
-            "dashboard": DashboardView,
-            "email": EmailView,
-            "inbox": InboxView,
-            "leads": LeadsView,
-            "clients": ClientsView,
-            "invoices": InvoicesView,
-            "snelstart": SnelstartView,
-            "monitor": MonitorView,
-            "support": SupportView,
-            "api": APIView,
-            "settings": SettingsView,
-        }
+        # View classes, imported on first navigation
+        self._view_classes: Dict[str, Type[ctk.CTkFrame]] = {}
+    
+    def _get_view_class(self, view_name: str) -> Optional[Type[ctk.CTkFrame]]:
+        """Import a view module on first use."""
+        if view_name not in self._view_classes:
+            if view_name not in VIEWS:
+                return None
+            module_name, class_name = VIEWS[view_name]
+            module = importlib.import_module(module_name, __package__)
+            self._view_classes[view_name] = getattr(module, class_name)
+        return self._view_classes[view_name]
     
     def _on_nav_click(self, view_name: str):
         """Handle navigation click from sidebar."""
@@ -115,11 +131,13 @@ class AdminPortalApp(ctk.CTk):
         
         # Create view if not exists (lazy loading)
         if view_name not in self._views:
-            if view_name in self._view_classes:
-                self._views[view_name] = self._view_classes[view_name](self.content_frame)
-            else:
+            started = time.perf_counter()
+            view_class = self._get_view_class(view_name)
+            if view_class is None:
                 logger.warning(f"Unknown view: {view_name}")
                 return
+            self._views[view_name] = view_class(self.content_frame)
+            logger.debug(f"Built view {view_name} in {(time.perf_counter() - started) * 1000:.0f}ms")
         
         # Show view
         self._views[view_name].grid(row=0, column=0, sticky="nsew")
@@ -134,9 +152,36 @@ class AdminPortalApp(ctk.CTk):
         
         logger.debug(f"Switched to view: {view_name}")
     
+    def _on_first_paint(self):
+        """Window is drawn: start background services and report startup timing."""
+        get_startup_timer().mark_interactive()
+        self.after(SERVICE_START_DELAY, self._start_background_services)
+    
     def _start_background_services(self):
-        """Start background sync services."""
-        # Email sync
+        """Start background sync services, one per event loop turn."""
+        starters = [
+            self._start_email_sync_if_configured,  # Email sync
+            self._start_payment_sync,  # Payment sync from website
+            self._start_work_order_sync,  # Work order sync from website
+        ]
+        
+        def start_next():
+            if not starters:
+                timer = get_startup_timer()
+                timer.mark("services")
+                timer.report()
+                return
+            
+            try:
+                starters.pop(0)()
+            except Exception as e:
+                logger.error(f"Failed to start background service: {e}")
+            self.after(SERVICE_START_DELAY, start_next)
+        
+        start_next()
+    
+    def _start_email_sync_if_configured(self):
+        """Start email sync when there are active accounts."""
         db = get_db()
         with db.session() as session:
             account_count = session.query(EmailAccount).filter_by(is_active=True).count()
@@ -145,12 +190,6 @@ class AdminPortalApp(ctk.CTk):
             self._start_email_sync()
         else:
             logger.info("No email accounts configured, skipping email auto-sync")
-        
-        # Payment sync from website
-        self._start_payment_sync()
-        
-        # Work order sync from website
-        self._start_work_order_sync()
     
     def _start_email_sync(self):
         """Start automatic email sync in background."""
@@ -197,33 +236,19 @@ class AdminPortalApp(ctk.CTk):
         self._work_order_scheduler = start_work_order_sync(on_new_orders=on_new_orders)
         logger.info("Work order auto-sync started")
     
+    # Open views patch their lists from change events (database.change_events);
+    # the sync callbacks only notify.
+    
     def _notify_new_work_orders(self, count: int):
         """Show notification for new work orders."""
-        if self._current_view in ['inbox', 'dashboard']:
-            if self._current_view in self._views:
-                self._views[self._current_view].refresh()
-        
         self._show_toast(f"📋 {count} nieuwe werk opdracht{'en' if count > 1 else ''} ontvangen!")
     
     def _notify_new_payments(self, count: int):
         """Show notification for new payments/invoices."""
-        # Refresh invoices view if it's active
-        if self._current_view in ['invoices', 'dashboard']:
-            if self._current_view in self._views:
-                self._views[self._current_view].refresh()
-        
-        # Show notification
         self._show_toast(f"💰 {count} nieuwe betaling{'en' if count > 1 else ''} geïmporteerd!")
     
     def _notify_new_emails(self, count: int):
         """Show notification for new emails."""
-        # Update sidebar badge (future enhancement)
-        # For now, just refresh the current view if it's email or dashboard
-        if self._current_view in ['email', 'dashboard']:
-            if self._current_view in self._views:
-                self._views[self._current_view].refresh()
-        
-        # Show subtle notification
         self._show_toast(f"📧 {count} nieuwe email{'s' if count > 1 else ''} ontvangen!")
     
     def _show_toast(self, message: str, duration: int = 3000):
@@ -268,6 +293,10 @@ class AdminPortalApp(ctk.CTk):
             from ..services.payment_sync_service import stop_payment_sync
             stop_payment_sync()
         
+        # Stop alle overige achtergrond jobs
+        from ..services.orchestrator import get_orchestrator
+        get_orchestrator().shutdown()
+        
         logger.info("Admin Portal closing")
         self.destroy()
     
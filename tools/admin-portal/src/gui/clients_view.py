@@ -4,31 +4,38 @@ Clients View - CRM voor klanten en projecten.
 
 import customtkinter as ctk
 from tkinter import messagebox
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 from ..database import get_db
 from ..database.models import Client, ClientStatus, Project, ProjectStatus
+from ..database.pagination import keyset_page, Page, PageCursor
 from ..utils.helpers import format_datetime, truncate_text
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot, snapshots
+from .live_list import LiveList
+from .paged_list import PagedList
 
 
-class ClientListItem(ctk.CTkFrame):
+class ClientListItem(VirtualListRow):
     """Client list item widget."""
     
+    HEIGHT = 56
+    
     STATUS_COLORS = {
         ClientStatus.PROSPECT.value: "#fbbc04",
         ClientStatus.ACTIVE.value: "#34a853",
         ClientStatus.INACTIVE.value: "gray50",
     }
     
-    def __init__(self, parent, client: Client, on_click: callable, **kwargs):
-        super().__init__(parent, corner_radius=8, **kwargs)
-        
-        self.client = client
-        self.on_click = on_click
-        
-        self.bind("<Button-1>", lambda e: on_click(client))
-        self.configure(cursor="hand2")
+    STATUS_LABELS = {
+        ClientStatus.PROSPECT.value: "Prospect",
+        ClientStatus.ACTIVE.value: "Actief",
+        ClientStatus.INACTIVE.value: "Inactief",
+    }
+    
+    def __init__(self, parent, on_click: callable, **kwargs):
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
         self._setup_ui()
     
@@ -37,60 +44,63 @@ class ClientListItem(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=1)
         
         # Status indicator
-        status_color = self.STATUS_COLORS.get(self.client.status, "gray50")
-        indicator = ctk.CTkFrame(
+        self.indicator = ctk.CTkFrame(
             self,
             width=4,
-            fg_color=status_color,
             corner_radius=2
         )
-        indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
+        self.indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
         
         # Name
-        name_label = ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             self,
-            text=self.client.name,
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             anchor="w"
         )
-        name_label.grid(row=0, column=1, sticky="w", pady=(8, 0))
-        name_label.bind("<Button-1>", lambda e: self.on_click(self.client))
+        self.name_label.grid(row=0, column=1, sticky="w", pady=(8, 0))
         
         # Company + Email
-        info_parts = []
-        if self.client.company:
-            info_parts.append(self.client.company)
-        if self.client.email:
-            info_parts.append(self.client.email)
-        
-        info_label = ctk.CTkLabel(
+        self.info_label = ctk.CTkLabel(
             self,
-            text=" • ".join(info_parts) if info_parts else "-",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray60",
             anchor="w"
         )
-        info_label.grid(row=1, column=1, sticky="w", pady=(0, 8))
-        info_label.bind("<Button-1>", lambda e: self.on_click(self.client))
+        self.info_label.grid(row=1, column=1, sticky="w", pady=(0, 8))
         
-        # Status badge
-        status_labels = {
-            ClientStatus.PROSPECT.value: "Prospect",
-            ClientStatus.ACTIVE.value: "Actief",
-            ClientStatus.INACTIVE.value: "Inactief",
-        }
+        self.clickable(self.name_label, self.info_label)
         
-        status_label = ctk.CTkLabel(
+        # Status badge
+        self.status_label = ctk.CTkLabel(
             self,
-            text=status_labels.get(self.client.status, self.client.status),
+            text="",
             font=ctk.CTkFont(size=10, weight="bold"),
             text_color="white",
-            fg_color=status_color,
             corner_radius=4,
             width=60,
             height=20
         )
-        status_label.grid(row=0, column=2, rowspan=2, padx=(10, 8))
+        self.status_label.grid(row=0, column=2, rowspan=2, padx=(10, 8))
+    
+    def bind_item(self, client: RowSnapshot):
+        """Show a client in this row."""
+        status_color = self.STATUS_COLORS.get(client.status, "gray50")
+        self.indicator.configure(fg_color=status_color)
+        self.name_label.configure(text=client.name)
+        
+        info_parts = []
+        if client.company:
+            info_parts.append(client.company)
+        if client.email:
+            info_parts.append(client.email)
+        self.info_label.configure(text=" • ".join(info_parts) if info_parts else "-")
+        
+        self.status_label.configure(
+            text=self.STATUS_LABELS.get(client.status, client.status),
+            fg_color=status_color
+        )
 
 
 class AddClientDialog(ctk.CTkToplevel):
@@ -476,8 +486,21 @@ class ClientsView(ctk.CTkFrame):
         
         self._showing_detail = False
         self._current_filter = "all"
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
+        
+        # Further clients load page by page while scrolling
+        self.pages = PagedList(self.list_frame, self.loader)
+        
+        # Patch the list on client changes instead of reloading it
+        self.live = LiveList(
+            self, self.list_frame, self.loader, "client",
+            lambda ids: self._load_changed_clients(self._current_filter, ids),
+            Client.name,
+            descending=False,
+            has_more=lambda: self.pages.has_more
+        )
     
     def _setup_ui(self):
         """Setup clients view UI."""
@@ -535,7 +558,12 @@ class ClientsView(ctk.CTkFrame):
         self.content_frame.grid_rowconfigure(0, weight=1)
         
         # List
-        self.list_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
+        self.list_frame = VirtualList(
+            self.content_frame,
+            row_factory=lambda parent: ClientListItem(parent, on_click=self._on_client_click),
+            row_height=ClientListItem.HEIGHT,
+            empty_text="Nog geen klanten.\n\nKlik op '+ Nieuwe Klant' om te beginnen."
+        )
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         
         # Detail view
@@ -550,35 +578,35 @@ class ClientsView(ctk.CTkFrame):
         if self._showing_detail:
             return
         
-        # Clear list
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+        status_filter = self._current_filter
+        fetch = lambda after=None: self._load_clients(status_filter, after)
+        self.loader.load(fetch, lambda page: self.pages.show(page, fetch))
+    
+    @staticmethod
+    def _client_query(session, status_filter: str):
+        """Clients within the status filter."""
+        query = session.query(Client)
+        
+        if status_filter != "all":
+            query = query.filter_by(status=status_filter)
         
+        return query
+    
+    @staticmethod
+    def _load_clients(status_filter: str, after: Optional[PageCursor] = None) -> Page:
+        """Query one page of clients by name (worker thread)."""
         db = get_db()
         with db.session() as session:
-            query = session.query(Client)
-            
-            if self._current_filter != "all":
-                query = query.filter_by(status=self._current_filter)
-            
-            clients = query.order_by(Client.name).limit(100).all()
-            
-            if not clients:
-                empty_label = ctk.CTkLabel(
-                    self.list_frame,
-                    text="Nog geen klanten.\n\nKlik op '+ Nieuwe Klant' om te beginnen.",
-                    text_color="gray50",
-                    justify="center"
-                )
-                empty_label.pack(pady=50)
-            else:
-                for client in clients:
-                    item = ClientListItem(
-                        self.list_frame,
-                        client=client,
-                        on_click=self._on_client_click
-                    )
-                    item.pack(fill="x", pady=2)
+            query = ClientsView._client_query(session, status_filter)
+            return keyset_page(query, Client.name, after, descending=False).map(snapshots)
+    
+    @staticmethod
+    def _load_changed_clients(status_filter: str, ids: List[int]) -> List[RowSnapshot]:
+        """Query changed clients that match the filter (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = ClientsView._client_query(session, status_filter)
+            return snapshots(query.filter(Client.id.in_(ids)).all())
     
     def _set_filter(self, filter_value: str):
         """Set filter."""
@@ -590,9 +618,10 @@ class ClientsView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
-    def _on_client_click(self, client: Client):
+    def _on_client_click(self, client: RowSnapshot):
         """Handle client click."""
         self._showing_detail = True
         self.list_frame.grid_forget()
@@ -4,11 +4,12 @@ Dashboard View - Overzicht van alle data.
 
 import customtkinter as ctk
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Any
 
-from ..database import get_db
+from ..database import get_db, get_change_bus
 from ..database.models import Email, FormSubmission, Lead, Client, FormStatus, LeadStatus
 from ..utils.helpers import format_relative_time
+from .data_loader import ViewLoader
 
 
 class StatCard(ctk.CTkFrame):
@@ -127,7 +128,12 @@ class DashboardView(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
         
+        self.loader = ViewLoader(self)
+        
         self._setup_ui()
+        
+        # Counts follow changes; a newer load replaces one that is still queued
+        get_change_bus().subscribe(self._on_changes, entities=["email", "form", "lead", "client"])
     
     def _setup_ui(self):
         """Setup dashboard UI."""
@@ -274,29 +280,8 @@ class DashboardView(ctk.CTkFrame):
         self.warning_label.pack(padx=15, pady=10)
     
     def refresh(self):
-        """Refresh dashboard data."""
-        db = get_db()
-        
-        with db.session() as session:
-            # Count emails
-            unread_emails = session.query(Email).filter_by(is_read=False, folder="inbox").count()
-            self.email_card.update_value(str(unread_emails), "ongelezen")
-            
-            # Count form submissions
-            new_forms = session.query(FormSubmission).filter_by(status=FormStatus.NEW.value).count()
-            self.inbox_card.update_value(str(new_forms), "nieuwe aanvragen")
-            
-            # Count leads
-            total_leads = session.query(Lead).count()
-            new_leads = session.query(Lead).filter_by(status=LeadStatus.NEW.value).count()
-            self.leads_card.update_value(str(total_leads), f"{new_leads} nieuw")
-            
-            # Count clients
-            active_clients = session.query(Client).count()
-            self.clients_card.update_value(str(active_clients), "totaal")
-            
-            # Get recent activity
-            self._load_recent_activity(session)
+        """Refresh dashboard data (queries run on the loader pool)."""
+        self.loader.load(self._load, self._show)
         
         # Show/hide email warning
         from ..utils.config import Config
@@ -305,12 +290,43 @@ class DashboardView(ctk.CTkFrame):
         else:
             self.warning_frame.grid(row=2, column=0, sticky="ew", padx=20, pady=(10, 20))
     
-    def _load_recent_activity(self, session):
-        """Load recent activity items."""
-        # Clear existing items
-        for widget in self.activity_list.winfo_children():
-            widget.destroy()
+    def _on_changes(self, events):
+        """Reload counts after a change (called in the committing thread)."""
+        try:
+            self.after(0, lambda: self.loader.load(self._load, self._show))
+        except RuntimeError:
+            pass  # main loop is gestopt (app sluit af)
+    
+    def _load(self) -> Dict[str, Any]:
+        """Count records and collect recent activity (worker thread)."""
+        db = get_db()
         
+        with db.session() as session:
+            return {
+                # Count emails
+                "unread_emails": session.query(Email).filter_by(is_read=False, folder="inbox").count(),
+                # Count form submissions
+                "new_forms": session.query(FormSubmission).filter_by(status=FormStatus.NEW.value).count(),
+                # Count leads
+                "total_leads": session.query(Lead).count(),
+                "new_leads": session.query(Lead).filter_by(status=LeadStatus.NEW.value).count(),
+                # Count clients
+                "active_clients": session.query(Client).count(),
+                # Get recent activity
+                "activities": self._load_recent_activity(session),
+            }
+    
+    def _show(self, data: Dict[str, Any]):
+        """Show loaded dashboard data (main thread)."""
+        self.email_card.update_value(str(data["unread_emails"]), "ongelezen")
+        self.inbox_card.update_value(str(data["new_forms"]), "nieuwe aanvragen")
+        self.leads_card.update_value(str(data["total_leads"]), f"{data['new_leads']} nieuw")
+        self.clients_card.update_value(str(data["active_clients"]), "totaal")
+        self._show_recent_activity(data["activities"])
+    
+    @staticmethod
+    def _load_recent_activity(session) -> List[Tuple[str, str, datetime]]:
+        """Load recent activity items."""
         activities: List[Tuple[str, str, datetime]] = []
         
         # Recent emails
@@ -345,7 +361,13 @@ class DashboardView(ctk.CTkFrame):
         
         # Sort by time and take top 10
         activities.sort(key=lambda x: x[2] if x[2] else datetime.min, reverse=True)
-        activities = activities[:10]
+        return activities[:10]
+    
+    def _show_recent_activity(self, activities: List[Tuple[str, str, datetime]]):
+        """Show recent activity items."""
+        # Clear existing items
+        for widget in self.activity_list.winfo_children():
+            widget.destroy()
         
         if not activities:
             empty_label = ctk.CTkLabel(
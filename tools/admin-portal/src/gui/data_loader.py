@@ -0,0 +1,177 @@
+"""
+Data Loader - Database queries voor de GUI buiten de Tk main thread.
+
+Views geven een query functie aan een `ViewLoader`; die draait op een
+gedeelde worker pool en het resultaat komt via `after()` terug op de main
+thread. Query functies geven `RowSnapshot`s (of andere platte waarden)
+terug in plaats van ORM objecten, zodat er na het sluiten van de session
+niets meer lazy geladen wordt.
+
+Per key telt alleen de laatste load: wisselt de gebruiker snel van filter,
+dan worden oudere loads die nog niet begonnen zijn geannuleerd en worden
+resultaten van oudere loads die al liepen weggegooid.
+"""
+
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, Callable, Iterable, List, Iterator
+
+from sqlalchemy import inspect
+
+from ..utils.config import logger
+
+
+MAX_WORKERS = 4
+
+
+class RowSnapshot(Mapping):
+    """Onveranderlijke kopie van een database rij, met attribuut toegang."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping[str, Any]):
+        object.__setattr__(self, "_data", dict(data))
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_data":
+            raise AttributeError(name)
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"RowSnapshot is read-only ({name})")
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def replace(self, **changes) -> "RowSnapshot":
+        """Nieuwe snapshot met gewijzigde velden."""
+        return RowSnapshot({**self._data, **changes})
+
+    def __repr__(self) -> str:
+        return f"RowSnapshot(id={self._data.get('id')})"
+
+
+def snapshot(obj, **extra: Callable[[Any], Any]) -> RowSnapshot:
+    """
+    Kopieer alle kolommen van een ORM object.
+
+    Args:
+        obj: Geladen ORM object (binnen een open session)
+        **extra: Berekende velden, bv. `client_name=lambda i: i.client.name`
+    """
+    data = {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+    for name, func in extra.items():
+        data[name] = func(obj)
+    return RowSnapshot(data)
+
+
+def snapshots(objs: Iterable[Any], **extra: Callable[[Any], Any]) -> List[RowSnapshot]:
+    """Snapshot van elk object in een query resultaat."""
+    return [snapshot(obj, **extra) for obj in objs]
+
+
+# Shared worker pool
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_loader_pool() -> ThreadPoolExecutor:
+    """Get the shared worker pool for view loads."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="view-loader")
+        return _pool
+
+
+class ViewLoader:
+    """Laadt data voor één view op de worker pool."""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._futures: Dict[str, Future] = {}
+
+    def load(
+        self,
+        query: Callable[[], Any],
+        on_done: Callable[[Any], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        key: str = "default"
+    ):
+        """
+        Draai `query` op de worker pool en geef het resultaat aan `on_done`.
+
+        `on_done` en `on_error` worden op de Tk main thread aangeroepen, en
+        alleen als er intussen geen nieuwere load met dezelfde key is gestart.
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.pop(key, None)
+
+        if previous is not None:
+            previous.cancel()  # no-op als hij al loopt; het resultaat vervalt dan
+
+        future = get_loader_pool().submit(self._run, key, generation, query, on_done, on_error)
+        with self._lock:
+            if self._generations[key] == generation:
+                self._futures[key] = future
+
+    def cancel(self, key: Optional[str] = None):
+        """Vergeet lopende loads (één key of alle)."""
+        with self._lock:
+            keys = [key] if key else list(self._generations)
+            for k in keys:
+                self._generations[k] = self._generations.get(k, 0) + 1
+                future = self._futures.pop(k, None)
+                if future is not None:
+                    future.cancel()
+
+    def is_loading(self, key: str = "default") -> bool:
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None and not future.done()
+
+    def _is_current(self, key: str, generation: int) -> bool:
+        with self._lock:
+            return self._generations.get(key) == generation
+
+    def _run(self, key: str, generation: int, query, on_done, on_error):
+        if not self._is_current(key, generation):
+            return
+
+        try:
+            result = query()
+        except Exception as e:
+            logger.error(f"Loading {type(self.widget).__name__} data failed: {e}")
+            if on_error is not None:
+                self._deliver(key, generation, lambda error=e: on_error(error))
+            return
+
+        self._deliver(key, generation, lambda: on_done(result))
+
+    def _deliver(self, key: str, generation: int, callback: Callable[[], None]):
+        def deliver():
+            with self._lock:
+                if self._generations.get(key) != generation:
+                    return
+                self._futures.pop(key, None)
+            if self.widget.winfo_exists():
+                callback()
+
+        try:
+            self.widget.after(0, deliver)
+        except RuntimeError:
+            pass  # main loop is gestopt (app sluit af)
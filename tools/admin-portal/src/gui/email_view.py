@@ -5,7 +5,7 @@ Supports multiple email accounts.
 
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-from typing import Optional, List
+from typing import Optional, List, Callable
 from datetime import datetime
 import threading
 
@@ -13,158 +13,124 @@ from sqlalchemy.orm import joinedload
 
 from ..database import get_db
 from ..database.models import Email, EmailAccount
+from ..database.pagination import keyset_page, Page, PageCursor
 from ..utils.config import Config, logger
 from ..utils.helpers import format_datetime, truncate_text, extract_email_name
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot, snapshots
+from .live_list import LiveList
+from .paged_list import PagedList
 
 
-class EmailListItem(ctk.CTkFrame):
+class EmailListItem(VirtualListRow):
     """Email list item widget - improved layout with more info."""
     
+    HEIGHT = 100
+    
     def __init__(
         self, 
         parent, 
-        email: Email,
         on_click: callable,
-        show_account: bool = True,
+        show_account: Callable[[], bool] = lambda: True,
         **kwargs
     ):
-        # Darker background for unread
-        bg_color = ("gray85", "gray20") if not email.is_read else ("gray90", "gray17")
-        super().__init__(parent, corner_radius=8, fg_color=bg_color, **kwargs)
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
-        self.email = email
-        self.on_click = on_click
         self.show_account = show_account
         
-        # Make clickable
-        self.bind("<Button-1>", self._handle_click)
-        self.configure(cursor="hand2")
-        
         self._setup_ui()
     
     def _setup_ui(self):
         """Setup email item UI with improved layout."""
         self.grid_columnconfigure(1, weight=1)
         
+        self.font_bold = ctk.CTkFont(size=14, weight="bold")
+        self.font_normal = ctk.CTkFont(size=14)
+        self.subject_bold = ctk.CTkFont(size=13, weight="bold")
+        self.subject_normal = ctk.CTkFont(size=13)
+        
         # Read indicator (left border)
-        indicator_color = "#1a73e8" if not self.email.is_read else "gray40"
-        indicator = ctk.CTkFrame(
+        self.indicator = ctk.CTkFrame(
             self,
             width=4,
-            fg_color=indicator_color,
             corner_radius=2
         )
-        indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(0, 12), pady=8)
+        self.indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(0, 12), pady=8)
         
         # Content container
         content = ctk.CTkFrame(self, fg_color="transparent")
         content.grid(row=0, column=1, rowspan=3, sticky="nsew", pady=8)
         content.grid_columnconfigure(0, weight=1)
-        content.bind("<Button-1>", self._handle_click)
         
         # === ROW 1: From + Account badge + Time ===
         row1 = ctk.CTkFrame(content, fg_color="transparent")
         row1.grid(row=0, column=0, sticky="ew")
         row1.grid_columnconfigure(1, weight=1)
-        row1.bind("<Button-1>", self._handle_click)
         
         # From name (bold for unread)
-        from_name = extract_email_name(self.email.from_name or self.email.from_address)
-        font_weight = "bold" if not self.email.is_read else "normal"
+        self.from_label = ctk.CTkLabel(row1, text="", anchor="w")
+        self.from_label.grid(row=0, column=0, sticky="w")
         
-        from_label = ctk.CTkLabel(
+        # Account badge (which inbox received this)
+        self.badge = ctk.CTkLabel(
             row1,
-            text=from_name,
-            font=ctk.CTkFont(size=14, weight=font_weight),
-            anchor="w"
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray50",
+            fg_color=("gray80", "gray25"),
+            corner_radius=4,
+            padx=6,
+            pady=2
         )
-        from_label.grid(row=0, column=0, sticky="w")
-        from_label.bind("<Button-1>", self._handle_click)
-        
-        # Account badge (which inbox received this)
-        if self.show_account and self.email.account:
-            account_name = self.email.account.name or self.email.account.email.split('@')[0]
-            badge = ctk.CTkLabel(
-                row1,
-                text=f"📥 {account_name}",
-                font=ctk.CTkFont(size=10),
-                text_color="gray50",
-                fg_color=("gray80", "gray25"),
-                corner_radius=4,
-                padx=6,
-                pady=2
-            )
-            badge.grid(row=0, column=1, sticky="w", padx=(10, 0))
-            badge.bind("<Button-1>", self._handle_click)
+        self.badge.grid(row=0, column=1, sticky="w", padx=(10, 0))
         
         # Date/Time (right side)
-        time_text = format_datetime(self.email.sent_at)
-        time_label = ctk.CTkLabel(
+        self.time_label = ctk.CTkLabel(
             row1,
-            text=time_text,
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray50"
         )
-        time_label.grid(row=0, column=2, sticky="e", padx=(10, 0))
-        time_label.bind("<Button-1>", self._handle_click)
+        self.time_label.grid(row=0, column=2, sticky="e", padx=(10, 0))
         
         # === ROW 2: Subject ===
-        subject_text = self.email.subject or "(geen onderwerp)"
-        subject_label = ctk.CTkLabel(
-            content,
-            text=truncate_text(subject_text, 80),
-            font=ctk.CTkFont(size=13, weight="bold" if not self.email.is_read else "normal"),
-            anchor="w"
-        )
-        subject_label.grid(row=1, column=0, sticky="w", pady=(4, 2))
-        subject_label.bind("<Button-1>", self._handle_click)
+        self.subject_label = ctk.CTkLabel(content, text="", anchor="w")
+        self.subject_label.grid(row=1, column=0, sticky="w", pady=(4, 2))
         
         # === ROW 3: Preview + From email ===
         row3 = ctk.CTkFrame(content, fg_color="transparent")
         row3.grid(row=2, column=0, sticky="ew")
         row3.grid_columnconfigure(0, weight=1)
-        row3.bind("<Button-1>", self._handle_click)
         
         # Body preview (first line of content)
-        preview_text = ""
-        if self.email.body_text:
-            # Clean up and get first meaningful line
-            lines = self.email.body_text.strip().split('\n')
-            for line in lines:
-                clean = line.strip()
-                if clean and not clean.startswith('---') and not clean.startswith('>'):
-                    preview_text = clean
-                    break
-        
-        if preview_text:
-            preview_label = ctk.CTkLabel(
-                row3,
-                text=truncate_text(preview_text, 100),
-                font=ctk.CTkFont(size=11),
-                text_color="gray50",
-                anchor="w"
-            )
-            preview_label.grid(row=0, column=0, sticky="w")
-            preview_label.bind("<Button-1>", self._handle_click)
+        self.preview_label = ctk.CTkLabel(
+            row3,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="gray50",
+            anchor="w"
+        )
+        self.preview_label.grid(row=0, column=0, sticky="w")
         
         # From email address (smaller, below preview)
-        from_email = self.email.from_address or ""
-        if from_email and from_email != from_name:
-            email_label = ctk.CTkLabel(
-                row3,
-                text=f"✉️ {from_email}",
-                font=ctk.CTkFont(size=10),
-                text_color="gray45",
-                anchor="w"
-            )
-            email_label.grid(row=1, column=0, sticky="w", pady=(2, 0))
-            email_label.bind("<Button-1>", self._handle_click)
+        self.email_label = ctk.CTkLabel(
+            row3,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray45",
+            anchor="w"
+        )
+        self.email_label.grid(row=1, column=0, sticky="w", pady=(2, 0))
+        
+        self.clickable(
+            content, row1, row3, self.from_label, self.badge, self.time_label,
+            self.subject_label, self.preview_label, self.email_label
+        )
         
         # === Right side: Star button ===
-        star_text = "⭐" if self.email.is_starred else "☆"
-        star_btn = ctk.CTkButton(
+        self.star_btn = ctk.CTkButton(
             self,
-            text=star_text,
+            text="☆",
             width=32,
             height=32,
             fg_color="transparent",
@@ -172,20 +138,75 @@ class EmailListItem(ctk.CTkFrame):
             font=ctk.CTkFont(size=16),
             command=self._toggle_star
         )
-        star_btn.grid(row=0, column=2, rowspan=3, padx=(10, 8), sticky="e")
+        self.star_btn.grid(row=0, column=2, rowspan=3, padx=(10, 8), sticky="e")
+    
+    def bind_item(self, email: RowSnapshot):
+        """Show an email in this row."""
+        unread = not email.is_read
+        
+        # Darker background for unread
+        self.configure(fg_color=("gray85", "gray20") if unread else ("gray90", "gray17"))
+        self.indicator.configure(fg_color="#1a73e8" if unread else "gray40")
+        
+        from_name = extract_email_name(email.from_name or email.from_address)
+        self.from_label.configure(
+            text=from_name,
+            font=self.font_bold if unread else self.font_normal
+        )
+        
+        if self.show_account() and email.account_name:
+            self.badge.configure(text=f"📥 {email.account_name}")
+            self.badge.grid()
+        else:
+            self.badge.grid_remove()
+        
+        self.time_label.configure(text=format_datetime(email.sent_at))
+        
+        self.subject_label.configure(
+            text=truncate_text(email.subject or "(geen onderwerp)", 80),
+            font=self.subject_bold if unread else self.subject_normal
+        )
+        
+        preview_text = self._preview(email.body_text)
+        if preview_text:
+            self.preview_label.configure(text=truncate_text(preview_text, 100))
+            self.preview_label.grid()
+        else:
+            self.preview_label.grid_remove()
+        
+        from_email = email.from_address or ""
+        if from_email and from_email != from_name:
+            self.email_label.configure(text=f"✉️ {from_email}")
+            self.email_label.grid()
+        else:
+            self.email_label.grid_remove()
+        
+        self.star_btn.configure(text="⭐" if email.is_starred else "☆")
     
-    def _handle_click(self, event=None):
-        """Handle item click."""
-        self.on_click(self.email)
+    @staticmethod
+    def _preview(body_text: Optional[str]) -> str:
+        """First meaningful line of the body."""
+        if not body_text:
+            return ""
+        for line in body_text.strip().split('\n'):
+            clean = line.strip()
+            if clean and not clean.startswith('---') and not clean.startswith('>'):
+                return clean
+        return ""
     
     def _toggle_star(self):
         """Toggle starred status."""
+        if self.item is None:
+            return
+        
         db = get_db()
         with db.session() as session:
-            email = session.query(Email).get(self.email.id)
+            email = session.query(Email).get(self.item.id)
             email.is_starred = not email.is_starred
             session.commit()
-            self.email.is_starred = email.is_starred
+            starred = email.is_starred
+        
+        self.replace_item(self.item.replace(is_starred=starred))
 
 
 class EmailDetailView(ctk.CTkFrame):
@@ -492,8 +513,22 @@ class EmailView(ctk.CTkFrame):
         self._account_filter = None  # None = all accounts
         self._showing_detail = False
         self._syncing = False
+        self._show_account_badge = True
+        self._account_map = {"Alle accounts": None}
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
+        
+        # Older emails load page by page while scrolling
+        self.pages = PagedList(self.list_frame, self.loader)
+        
+        # Patch the list on email changes instead of reloading it
+        self.live = LiveList(
+            self, self.list_frame, self.loader, "email",
+            lambda ids: self._load_changed_emails(self._current_folder, self._account_filter, ids),
+            Email.sent_at,
+            has_more=lambda: self.pages.has_more
+        )
     
     def _setup_ui(self):
         """Setup email view UI."""
@@ -582,70 +617,104 @@ class EmailView(ctk.CTkFrame):
         self.content_frame.grid_rowconfigure(0, weight=1)
         
         # Email list
-        self.list_frame = ctk.CTkScrollableFrame(
+        self.list_frame = VirtualList(
             self.content_frame,
-            fg_color="transparent"
+            row_factory=lambda parent: EmailListItem(
+                parent,
+                on_click=self._on_email_click,
+                show_account=lambda: self._show_account_badge
+            ),
+            row_height=EmailListItem.HEIGHT,
+            row_spacing=8
         )
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         
         # Detail view (hidden initially)
         self.detail_view = EmailDetailView(self.content_frame, self._on_back_to_list)
-        
-        # Load account options
-        self._load_account_options()
     
     def refresh(self):
-        """Refresh email list."""
+        """Refresh email list (queries run on the loader pool)."""
         if self._showing_detail:
             return
         
-        # Reload account options
-        self._load_account_options()
-        
-        # Clear list
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-        
+        folder, account_filter = self._current_folder, self._account_filter
+        fetch = lambda after: self._load_email_page(folder, account_filter, after)
+        self.loader.load(
+            lambda: self._load_emails(folder, account_filter),
+            lambda data: self._show_emails(data, fetch)
+        )
+    
+    @staticmethod
+    def _load_emails(folder: str, account_filter) -> dict:
+        """Query the first page of emails and the account options (worker thread)."""
         db = get_db()
         with db.session() as session:
-            # Query with account relationship loaded
-            query = session.query(Email).options(
-                joinedload(Email.account)
-            ).filter_by(folder=self._current_folder)
-            
-            # Filter by account if selected
-            show_account_badge = True
-            if self._account_filter:
-                query = query.filter_by(account_id=self._account_filter)
-                show_account_badge = False  # Don't show badge when filtering by account
+            accounts = session.query(EmailAccount).filter_by(is_active=True).all()
+            account_options = [(f"{acc.name} ({acc.email})", acc.id) for acc in accounts]
             
-            emails = query.order_by(Email.sent_at.desc()).limit(50).all()
+            query = EmailView._email_query(session, folder, account_filter)
+            page = keyset_page(query, Email.sent_at).map(EmailView._email_snapshots)
             
             # Check if any accounts configured
             accounts_count = session.query(EmailAccount).count()
-            
-            if not emails:
-                if accounts_count == 0:
-                    empty_text = "Geen email accounts geconfigureerd.\n\nGa naar ⚙️ Instellingen om je email accounts toe te voegen."
-                else:
-                    empty_text = "Geen emails in deze folder.\n\nKlik op 🔄 Sync om emails op te halen."
-                
-                empty_label = ctk.CTkLabel(
-                    self.list_frame,
-                    text=empty_text,
-                    text_color="gray50",
-                    justify="center"
-                )
-                empty_label.pack(pady=50)
-            else:
-                for email in emails:
-                    item = EmailListItem(
-                        self.list_frame,
-                        email=email,
-                        on_click=self._on_email_click,
-                        show_account=show_account_badge
-                    )
-                    item.pack(fill="x", pady=4)
+        
+        return {
+            "page": page,
+            "account_options": account_options,
+            "accounts_count": accounts_count,
+            "show_account_badge": not account_filter,  # Don't show badge when filtering by account
+        }
+    
+    @staticmethod
+    def _load_email_page(folder: str, account_filter, after: PageCursor) -> Page:
+        """Query the next page of emails (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = EmailView._email_query(session, folder, account_filter)
+            return keyset_page(query, Email.sent_at, after).map(EmailView._email_snapshots)
+    
+    @staticmethod
+    def _load_changed_emails(folder: str, account_filter, ids: List[int]) -> List[RowSnapshot]:
+        """Query changed emails within the current folder/account (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = EmailView._email_query(session, folder, account_filter)
+            return EmailView._email_snapshots(query.filter(Email.id.in_(ids)).all())
+    
+    @staticmethod
+    def _email_query(session, folder: str, account_filter):
+        """Emails in a folder, with the account relationship loaded."""
+        query = session.query(Email).options(
+            joinedload(Email.account)
+        ).filter_by(folder=folder)
+        
+        # Filter by account if selected
+        if account_filter:
+            query = query.filter_by(account_id=account_filter)
+        
+        return query
+    
+    @staticmethod
+    def _email_snapshots(emails: List[Email]) -> List[RowSnapshot]:
+        return snapshots(
+            emails,
+            account_name=lambda e: (e.account.name or e.account.email.split('@')[0]) if e.account else None
+        )
+    
+    def _show_emails(self, data: dict, fetch):
+        """Show the first page of emails (main thread)."""
+        if self._showing_detail:
+            return
+        
+        self._set_account_options(data["account_options"])
+        
+        if data["accounts_count"] == 0:
+            empty_text = "Geen email accounts geconfigureerd.\n\nGa naar ⚙️ Instellingen om je email accounts toe te voegen."
+        else:
+            empty_text = "Geen emails in deze folder.\n\nKlik op 🔄 Sync om emails op te halen."
+        
+        self._show_account_badge = data["show_account_badge"]
+        self.pages.show(data["page"], fetch, empty_text=empty_text)
     
     def _switch_folder(self, folder: str):
         """Switch email folder."""
@@ -659,9 +728,10 @@ class EmailView(ctk.CTkFrame):
             self.inbox_btn.configure(fg_color="gray40")
             self.sent_btn.configure(fg_color=["#1a73e8", "#1a73e8"])
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
-    def _on_email_click(self, email: Email):
+    def _on_email_click(self, email: RowSnapshot):
         """Handle email item click."""
         # Re-fetch email from database to get fresh data (avoid detached session issues)
         db = get_db()
@@ -703,25 +773,21 @@ class EmailView(ctk.CTkFrame):
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         self.refresh()
     
-    def _load_account_options(self):
-        """Load email accounts into dropdown."""
-        db = get_db()
-        with db.session() as session:
-            accounts = session.query(EmailAccount).filter_by(is_active=True).all()
-            
-            options = ["Alle accounts"]
-            self._account_map = {"Alle accounts": None}
-            
-            for acc in accounts:
-                label = f"{acc.name} ({acc.email})"
-                options.append(label)
-                self._account_map[label] = acc.id
-            
-            self.account_dropdown.configure(values=options)
+    def _set_account_options(self, account_options: List[tuple]):
+        """Fill the accounts dropdown."""
+        options = ["Alle accounts"]
+        self._account_map = {"Alle accounts": None}
+        
+        for label, account_id in account_options:
+            options.append(label)
+            self._account_map[label] = account_id
+        
+        self.account_dropdown.configure(values=options)
     
     def _on_account_filter(self, selection: str):
         """Handle account filter change."""
         self._account_filter = self._account_map.get(selection)
+        self.list_frame.scroll_to(0)
         self.refresh()
     
     def _on_compose(self):
@@ -784,7 +850,6 @@ class EmailView(ctk.CTkFrame):
             def finish():
                 self._syncing = False
                 self.sync_btn.configure(text="🔄 Sync", state="normal")
-                self._load_account_options()
                 self.refresh()
                 
                 if errors:
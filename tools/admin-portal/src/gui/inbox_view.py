@@ -4,19 +4,28 @@ Contact forms, offerte aanvragen en werkorders.
 """
 
 import customtkinter as ctk
+import threading
 from tkinter import messagebox
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 from ..database import get_db
 from ..database.models import FormSubmission, FormStatus, FormType, Note
+from ..database.pagination import keyset_page, Page, PageCursor
+from ..utils.config import logger
 from ..utils.helpers import format_datetime, format_relative_time, truncate_text
 from ..services.cursor_prompt_generator import get_cursor_prompt_generator
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot, snapshots
+from .live_list import LiveList
+from .paged_list import PagedList
 
 
-class FormListItem(ctk.CTkFrame):
+class FormListItem(VirtualListRow):
     """Form submission list item."""
     
+    HEIGHT = 56
+    
     STATUS_COLORS = {
         FormStatus.NEW.value: "#1a73e8",
         FormStatus.IN_PROGRESS.value: "#fbbc04",
@@ -30,14 +39,8 @@ class FormListItem(ctk.CTkFrame):
         FormType.QUOTE.value: "💰",
     }
     
-    def __init__(self, parent, form: FormSubmission, on_click: callable, **kwargs):
-        super().__init__(parent, corner_radius=8, **kwargs)
-        
-        self.form = form
-        self.on_click = on_click
-        
-        self.bind("<Button-1>", lambda e: on_click(form))
-        self.configure(cursor="hand2")
+    def __init__(self, parent, on_click: callable, **kwargs):
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
         self._setup_ui()
     
@@ -46,56 +49,62 @@ class FormListItem(ctk.CTkFrame):
         self.grid_columnconfigure(2, weight=1)
         
         # Status indicator
-        status_color = self.STATUS_COLORS.get(self.form.status, "gray50")
-        indicator = ctk.CTkFrame(
+        self.indicator = ctk.CTkFrame(
             self,
             width=4,
-            fg_color=status_color,
             corner_radius=2
         )
-        indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
+        self.indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
         
         # Type icon
-        icon = self.TYPE_ICONS.get(self.form.form_type, "📥")
-        icon_label = ctk.CTkLabel(
+        self.icon_label = ctk.CTkLabel(
             self,
-            text=icon,
+            text="",
             font=ctk.CTkFont(size=20)
         )
-        icon_label.grid(row=0, column=1, rowspan=2, padx=(0, 10))
+        self.icon_label.grid(row=0, column=1, rowspan=2, padx=(0, 10))
         
         # Name + Subject
-        name_text = self.form.name
-        if self.form.company:
-            name_text += f" ({self.form.company})"
-        
-        name_label = ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             self,
-            text=name_text,
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             anchor="w"
         )
-        name_label.grid(row=0, column=2, sticky="w", pady=(8, 0))
-        name_label.bind("<Button-1>", lambda e: self.on_click(self.form))
+        self.name_label.grid(row=0, column=2, sticky="w", pady=(8, 0))
         
-        subject_label = ctk.CTkLabel(
+        self.subject_label = ctk.CTkLabel(
             self,
-            text=truncate_text(self.form.subject or self.form.message, 60),
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray60",
             anchor="w"
         )
-        subject_label.grid(row=1, column=2, sticky="w", pady=(0, 8))
-        subject_label.bind("<Button-1>", lambda e: self.on_click(self.form))
+        self.subject_label.grid(row=1, column=2, sticky="w", pady=(0, 8))
+        
+        self.clickable(self.name_label, self.subject_label)
         
         # Time
-        time_label = ctk.CTkLabel(
+        self.time_label = ctk.CTkLabel(
             self,
-            text=format_relative_time(self.form.submitted_at),
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray50"
         )
-        time_label.grid(row=0, column=3, rowspan=2, padx=(10, 8))
+        self.time_label.grid(row=0, column=3, rowspan=2, padx=(10, 8))
+    
+    def bind_item(self, form: RowSnapshot):
+        """Show a form submission in this row."""
+        self.indicator.configure(fg_color=self.STATUS_COLORS.get(form.status, "gray50"))
+        self.icon_label.configure(text=self.TYPE_ICONS.get(form.form_type, "📥"))
+        
+        name_text = form.name
+        if form.company:
+            name_text += f" ({form.company})"
+        self.name_label.configure(text=name_text)
+        
+        self.subject_label.configure(text=truncate_text(form.subject or form.message, 60))
+        self.time_label.configure(text=format_relative_time(form.submitted_at))
 
 
 class FormDetailView(ctk.CTkFrame):
@@ -470,8 +479,20 @@ class InboxView(ctk.CTkFrame):
         
         self._showing_detail = False
         self._current_filter = "all"
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
+        
+        # Older forms load page by page while scrolling
+        self.pages = PagedList(self.list_frame, self.loader)
+        
+        # Patch the list on form changes instead of reloading it
+        self.live = LiveList(
+            self, self.list_frame, self.loader, "form",
+            lambda ids: self._load_changed_forms(self._current_filter, self._type_filter, ids),
+            FormSubmission.submitted_at,
+            has_more=lambda: self.pages.has_more
+        )
     
     def _setup_ui(self):
         """Setup inbox view UI."""
@@ -488,14 +509,14 @@ class InboxView(ctk.CTkFrame):
         title.pack(side="left")
         
         # Sync button
-        sync_btn = ctk.CTkButton(
+        self.sync_btn = ctk.CTkButton(
             header_frame,
             text="🔄 Sync",
             width=80,
             fg_color="gray40",
             command=self._sync_orders
         )
-        sync_btn.pack(side="right")
+        self.sync_btn.pack(side="right")
         
         # Filters
         filter_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -553,7 +574,12 @@ class InboxView(ctk.CTkFrame):
         self.content_frame.grid_rowconfigure(0, weight=1)
         
         # List
-        self.list_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
+        self.list_frame = VirtualList(
+            self.content_frame,
+            row_factory=lambda parent: FormListItem(parent, on_click=self._on_form_click),
+            row_height=FormListItem.HEIGHT,
+            empty_text="Geen werk opdrachten.\n\nWerk opdrachten van klanten worden hier\nautomatisch weergegeven zodra ze binnenkomen."
+        )
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         
         # Detail view
@@ -570,38 +596,38 @@ class InboxView(ctk.CTkFrame):
         if self._showing_detail:
             return
         
-        # Clear list
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+        status_filter, type_filter = self._current_filter, self._type_filter
+        fetch = lambda after=None: self._load_forms(status_filter, type_filter, after)
+        self.loader.load(fetch, lambda page: self.pages.show(page, fetch))
+    
+    @staticmethod
+    def _form_query(session, status_filter: str, type_filter: Optional[str]):
+        """Form submissions within the status and type filters."""
+        query = session.query(FormSubmission)
+        
+        if status_filter != "all":
+            query = query.filter_by(status=status_filter)
         
+        if type_filter:
+            query = query.filter_by(form_type=type_filter)
+        
+        return query
+    
+    @staticmethod
+    def _load_forms(status_filter: str, type_filter: Optional[str], after: Optional[PageCursor] = None) -> Page:
+        """Query one page of form submissions, newest first (worker thread)."""
         db = get_db()
         with db.session() as session:
-            query = session.query(FormSubmission)
-            
-            if self._current_filter != "all":
-                query = query.filter_by(status=self._current_filter)
-            
-            if self._type_filter:
-                query = query.filter_by(form_type=self._type_filter)
-            
-            forms = query.order_by(FormSubmission.submitted_at.desc()).limit(50).all()
-            
-            if not forms:
-                empty_label = ctk.CTkLabel(
-                    self.list_frame,
-                    text="Geen werk opdrachten.\n\nWerk opdrachten van klanten worden hier\nautomatisch weergegeven zodra ze binnenkomen.",
-                    text_color="gray50",
-                    justify="center"
-                )
-                empty_label.pack(pady=50)
-            else:
-                for form in forms:
-                    item = FormListItem(
-                        self.list_frame,
-                        form=form,
-                        on_click=self._on_form_click
-                    )
-                    item.pack(fill="x", pady=2)
+            query = InboxView._form_query(session, status_filter, type_filter)
+            return keyset_page(query, FormSubmission.submitted_at, after).map(snapshots)
+    
+    @staticmethod
+    def _load_changed_forms(status_filter: str, type_filter: Optional[str], ids: List[int]) -> List[RowSnapshot]:
+        """Query changed form submissions that match the filters (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = InboxView._form_query(session, status_filter, type_filter)
+            return snapshots(query.filter(FormSubmission.id.in_(ids)).all())
     
     def _set_filter(self, filter_value: str):
         """Set status filter."""
@@ -613,6 +639,7 @@ class InboxView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
     def _set_type_filter(self, type_value: str):
@@ -628,9 +655,10 @@ class InboxView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
-    def _on_form_click(self, form: FormSubmission):
+    def _on_form_click(self, form: RowSnapshot):
         """Handle form click."""
         self._showing_detail = True
         self.list_frame.grid_forget()
@@ -645,13 +673,25 @@ class InboxView(ctk.CTkFrame):
         self.refresh()
     
     def _sync_orders(self):
-        """Sync work orders from website."""
-        from tkinter import messagebox
-        from ..services.work_order_service import get_work_order_sync_service
+        """Sync work orders from website (via de scheduler, op een achtergrond thread)."""
+        from ..services.work_order_service import get_work_order_scheduler
         
-        service = get_work_order_sync_service()
-        synced, errors, msgs = service.sync_work_orders()
+        self.sync_btn.configure(state="disabled")
         
+        def do_sync():
+            try:
+                result = get_work_order_scheduler().sync_now()
+            except Exception as e:
+                logger.error(f"Work order sync failed: {e}")
+                result = (0, 1, [str(e)])
+            self.after(0, lambda: self._on_sync_complete(*result))
+        
+        threading.Thread(target=do_sync, daemon=True).start()
+    
+    def _on_sync_complete(self, synced: int, errors: int, msgs: List[str]):
+        if not self.winfo_exists():
+            return
+        self.sync_btn.configure(state="normal")
         self.refresh()
         
         if synced > 0:
@@ -13,12 +13,21 @@ import csv
 import subprocess
 import os
 
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
 from ..database import get_db
 from ..database.models import Invoice, InvoiceStatus, InvoiceType, Client
+from ..database.pagination import keyset_page, Page, PageCursor
 from ..utils.config import Config, logger
 from ..utils.helpers import format_datetime, truncate_text
-from ..services.payment_sync_service import get_payment_sync_service, get_payment_sync_scheduler
+from ..services.payment_sync_service import get_payment_sync_scheduler
 from ..services.snelstart_sync_service import get_snelstart_sync_service
+from ..services.invoice_numbering import get_invoice_number_allocator
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot, snapshots
+from .live_list import LiveList
+from .paged_list import PagedList
 
 
 # Create invoices directory
@@ -26,9 +35,11 @@ INVOICES_DIR = Config.DATA_DIR / "invoices"
 INVOICES_DIR.mkdir(exist_ok=True)
 
 
-class InvoiceListItem(ctk.CTkFrame):
+class InvoiceListItem(VirtualListRow):
     """Invoice list item widget."""
     
+    HEIGHT = 56
+    
     STATUS_COLORS = {
         InvoiceStatus.DRAFT.value: "gray50",
         InvoiceStatus.SENT.value: "#1a73e8",
@@ -37,14 +48,15 @@ class InvoiceListItem(ctk.CTkFrame):
         InvoiceStatus.CANCELLED.value: "gray40",
     }
     
-    def __init__(self, parent, invoice: Invoice, on_click: callable, **kwargs):
-        super().__init__(parent, corner_radius=8, **kwargs)
-        
-        self.invoice = invoice
-        self.on_click = on_click
-        
-        self.bind("<Button-1>", lambda e: on_click(invoice))
-        self.configure(cursor="hand2")
+    # Snelstart sync status: (icon, color)
+    SYNC_ICONS = {
+        "synced": ("✓", "#34a853"),
+        "error": ("⚠", "#ea4335"),
+        "pending": ("⏳", "#fbbc04"),
+    }
+    
+    def __init__(self, parent, on_click: callable, **kwargs):
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
         self._setup_ui()
     
@@ -53,92 +65,97 @@ class InvoiceListItem(ctk.CTkFrame):
         self.grid_columnconfigure(2, weight=1)
         
         # Status indicator
-        status_color = self.STATUS_COLORS.get(self.invoice.status, "gray50")
-        indicator = ctk.CTkFrame(
+        self.indicator = ctk.CTkFrame(
             self,
             width=4,
-            fg_color=status_color,
             corner_radius=2
         )
-        indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
+        self.indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
         
         # Type icon
-        icon = "📤" if self.invoice.invoice_type == InvoiceType.OUTGOING.value else "📥"
-        icon_label = ctk.CTkLabel(
+        self.icon_label = ctk.CTkLabel(
             self,
-            text=icon,
+            text="",
             font=ctk.CTkFont(size=18)
         )
-        icon_label.grid(row=0, column=1, rowspan=2, padx=(0, 10))
+        self.icon_label.grid(row=0, column=1, rowspan=2, padx=(0, 10))
         
         # Invoice number + Company
-        company = self.invoice.company_name or (self.invoice.client.name if self.invoice.client else "Onbekend")
-        
-        top_label = ctk.CTkLabel(
+        self.top_label = ctk.CTkLabel(
             self,
-            text=f"{self.invoice.invoice_number} - {company}",
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             anchor="w"
         )
-        top_label.grid(row=0, column=2, sticky="w", pady=(8, 0))
-        top_label.bind("<Button-1>", lambda e: self.on_click(self.invoice))
+        self.top_label.grid(row=0, column=2, sticky="w", pady=(8, 0))
         
         # Description + Date
-        desc = truncate_text(self.invoice.description or "", 40)
-        date_str = self.invoice.invoice_date.strftime("%d-%m-%Y") if self.invoice.invoice_date else ""
-        
-        bottom_label = ctk.CTkLabel(
+        self.bottom_label = ctk.CTkLabel(
             self,
-            text=f"{desc} • {date_str}",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray60",
             anchor="w"
         )
-        bottom_label.grid(row=1, column=2, sticky="w", pady=(0, 8))
-        bottom_label.bind("<Button-1>", lambda e: self.on_click(self.invoice))
+        self.bottom_label.grid(row=1, column=2, sticky="w", pady=(0, 8))
+        
+        self.clickable(self.top_label, self.bottom_label)
         
         # Amount
-        amount_label = ctk.CTkLabel(
+        self.amount_label = ctk.CTkLabel(
             self,
-            text=f"€ {self.invoice.amount_incl_vat:,.2f}",
-            font=ctk.CTkFont(size=13, weight="bold"),
-            text_color="#34a853" if self.invoice.invoice_type == InvoiceType.OUTGOING.value else "#ea4335"
+            text="",
+            font=ctk.CTkFont(size=13, weight="bold")
         )
-        amount_label.grid(row=0, column=3, rowspan=2, padx=(10, 15))
+        self.amount_label.grid(row=0, column=3, rowspan=2, padx=(10, 15))
         
         # File indicator
-        if self.invoice.file_path:
-            file_label = ctk.CTkLabel(
-                self,
-                text="📄",
-                font=ctk.CTkFont(size=14)
-            )
-            file_label.grid(row=0, column=4, rowspan=2, padx=(0, 5))
+        self.file_label = ctk.CTkLabel(
+            self,
+            text="📄",
+            font=ctk.CTkFont(size=14)
+        )
+        self.file_label.grid(row=0, column=4, rowspan=2, padx=(0, 5))
         
         # Snelstart sync indicator
-        if self.invoice.invoice_type == InvoiceType.OUTGOING.value:
-            sync_status = self.invoice.snelstart_sync_status
-            if sync_status == "synced":
-                sync_icon = "✓"
-                sync_color = "#34a853"
-            elif sync_status == "error":
-                sync_icon = "⚠"
-                sync_color = "#ea4335"
-            elif sync_status == "pending":
-                sync_icon = "⏳"
-                sync_color = "#fbbc04"
-            else:
-                sync_icon = "○"
-                sync_color = "gray50"
-            
-            sync_label = ctk.CTkLabel(
-                self,
-                text=sync_icon,
-                font=ctk.CTkFont(size=12),
-                text_color=sync_color,
-                width=20
-            )
-            sync_label.grid(row=0, column=5, rowspan=2, padx=(0, 10))
+        self.sync_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=12),
+            width=20
+        )
+        self.sync_label.grid(row=0, column=5, rowspan=2, padx=(0, 10))
+    
+    def bind_item(self, invoice: RowSnapshot):
+        """Show an invoice in this row."""
+        outgoing = invoice.invoice_type == InvoiceType.OUTGOING.value
+        
+        self.indicator.configure(fg_color=self.STATUS_COLORS.get(invoice.status, "gray50"))
+        self.icon_label.configure(text="📤" if outgoing else "📥")
+        
+        company = invoice.company_name or invoice.client_name or "Onbekend"
+        self.top_label.configure(text=f"{invoice.invoice_number} - {company}")
+        
+        desc = truncate_text(invoice.description or "", 40)
+        date_str = invoice.invoice_date.strftime("%d-%m-%Y") if invoice.invoice_date else ""
+        self.bottom_label.configure(text=f"{desc} • {date_str}")
+        
+        self.amount_label.configure(
+            text=f"€ {invoice.amount_incl_vat:,.2f}",
+            text_color="#34a853" if outgoing else "#ea4335"
+        )
+        
+        if invoice.file_path:
+            self.file_label.grid()
+        else:
+            self.file_label.grid_remove()
+        
+        if outgoing:
+            sync_icon, sync_color = self.SYNC_ICONS.get(invoice.snelstart_sync_status, ("○", "gray50"))
+            self.sync_label.configure(text=sync_icon, text_color=sync_color)
+            self.sync_label.grid()
+        else:
+            self.sync_label.grid_remove()
 
 
 class AddInvoiceDialog(ctk.CTkToplevel):
@@ -186,7 +203,12 @@ class AddInvoiceDialog(ctk.CTkToplevel):
         
         # Invoice number
         ctk.CTkLabel(content, text="Factuurnr: *", width=100, anchor="w").grid(row=row, column=0, sticky="w", pady=5)
-        self.number_entry = ctk.CTkEntry(content, placeholder_text="2024-001")
+        # Leeg laten bij een uitgaande factuur = volgende nummer uit de reeks
+        next_number = get_invoice_number_allocator().peek() if not self.invoice else ""
+        self.number_entry = ctk.CTkEntry(
+            content,
+            placeholder_text=f"Automatisch ({next_number})" if next_number else "2024-001"
+        )
         self.number_entry.grid(row=row, column=1, sticky="ew", pady=5)
         row += 1
         
@@ -377,7 +399,9 @@ class AddInvoiceDialog(ctk.CTkToplevel):
         invoice_number = self.number_entry.get().strip()
         company_name = self.company_entry.get().strip()
         
-        if not invoice_number or not company_name:
+        outgoing = self.type_var.get() == InvoiceType.OUTGOING.value
+        
+        if not company_name or (not invoice_number and not outgoing):
             messagebox.showwarning("Validatie", "Factuurnummer en bedrijf zijn verplicht.")
             return
         
@@ -400,6 +424,14 @@ class AddInvoiceDialog(ctk.CTkToplevel):
                 invoice = Invoice()
                 session.add(invoice)
             
+            if outgoing:
+                numbers = get_invoice_number_allocator()
+                if not invoice_number:
+                    # In dezelfde transactie, zodat een mislukte save geen gat achterlaat
+                    invoice_number = numbers.allocate(session, year=invoice_date.year)
+                else:
+                    numbers.observe(session, invoice_number)
+            
             invoice.invoice_type = self.type_var.get()
             invoice.invoice_number = invoice_number
             invoice.company_name = company_name
@@ -772,8 +804,21 @@ class InvoicesView(ctk.CTkFrame):
         self._showing_detail = False
         self._current_filter = "all"
         self._type_filter = None
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
+        
+        # Older invoices load page by page while scrolling
+        self.pages = PagedList(self.list_frame, self.loader)
+        
+        # Patch the list (and totals) on invoice changes instead of reloading it
+        self.live = LiveList(
+            self, self.list_frame, self.loader, "invoice",
+            lambda ids: self._load_changed_invoices(self._current_filter, self._type_filter, ids),
+            Invoice.invoice_date,
+            has_more=lambda: self.pages.has_more,
+            on_patched=self._reload_totals
+        )
     
     def _setup_ui(self):
         """Setup invoices view UI."""
@@ -886,9 +931,46 @@ class InvoicesView(ctk.CTkFrame):
         self.content_frame.grid_columnconfigure(0, weight=1)
         self.content_frame.grid_rowconfigure(0, weight=1)
         
+        # List panel: summary bar + list
+        self.list_panel = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        self.list_panel.grid(row=0, column=0, sticky="nsew")
+        self.list_panel.grid_columnconfigure(0, weight=1)
+        self.list_panel.grid_rowconfigure(1, weight=1)
+        
+        # Summary bar
+        self.summary_frame = ctk.CTkFrame(self.list_panel, corner_radius=8, fg_color=("gray85", "gray20"))
+        
+        self.total_out_label = ctk.CTkLabel(
+            self.summary_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#34a853"
+        )
+        self.total_out_label.pack(side="left", padx=15, pady=8)
+        
+        self.total_in_label = ctk.CTkLabel(
+            self.summary_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color="#ea4335"
+        )
+        self.total_in_label.pack(side="left", padx=15, pady=8)
+        
+        self.balance_label = ctk.CTkLabel(
+            self.summary_frame,
+            text="",
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        self.balance_label.pack(side="right", padx=15, pady=8)
+        
         # List
-        self.list_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
-        self.list_frame.grid(row=0, column=0, sticky="nsew")
+        self.list_frame = VirtualList(
+            self.list_panel,
+            row_factory=lambda parent: InvoiceListItem(parent, on_click=self._on_invoice_click),
+            row_height=InvoiceListItem.HEIGHT,
+            empty_text="Geen facturen gevonden.\n\nKlik op '+ Nieuwe Factuur' om te beginnen."
+        )
+        self.list_frame.grid(row=1, column=0, sticky="nsew")
         
         # Detail view
         self.detail_view = InvoiceDetailView(
@@ -905,66 +987,83 @@ class InvoicesView(ctk.CTkFrame):
         # Update sync status
         self._update_sync_status()
         
-        # Clear list
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+        status_filter, type_filter = self._current_filter, self._type_filter
+        fetch = lambda after=None: self._load_invoices(status_filter, type_filter, after)
+        self.loader.load(
+            lambda: {"page": fetch(), "totals": self._load_totals(status_filter, type_filter)},
+            lambda data: self._show_invoices(data, fetch)
+        )
+    
+    @staticmethod
+    def _filter_invoices(query, status_filter: str, type_filter: Optional[str]):
+        """Restrict an invoice query to the status and type filters."""
+        if status_filter != "all":
+            query = query.filter_by(status=status_filter)
+        
+        if type_filter:
+            query = query.filter_by(invoice_type=type_filter)
         
+        return query
+    
+    @staticmethod
+    def _invoice_snapshots(invoices: List[Invoice]) -> List[RowSnapshot]:
+        return snapshots(invoices, client_name=lambda i: i.client.name if i.client else None)
+    
+    @staticmethod
+    def _load_invoices(status_filter: str, type_filter: Optional[str], after: Optional[PageCursor] = None) -> Page:
+        """Query one page of invoices, newest first (worker thread)."""
         db = get_db()
         with db.session() as session:
-            query = session.query(Invoice)
-            
-            if self._current_filter != "all":
-                query = query.filter_by(status=self._current_filter)
-            
-            if self._type_filter:
-                query = query.filter_by(invoice_type=self._type_filter)
-            
-            invoices = query.order_by(Invoice.invoice_date.desc()).limit(100).all()
+            query = session.query(Invoice).options(joinedload(Invoice.client))
+            query = InvoicesView._filter_invoices(query, status_filter, type_filter)
+            return keyset_page(query, Invoice.invoice_date, after).map(InvoicesView._invoice_snapshots)
+    
+    @staticmethod
+    def _load_changed_invoices(status_filter: str, type_filter: Optional[str], ids: List[int]) -> List[RowSnapshot]:
+        """Query changed invoices that match the filters (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = session.query(Invoice).options(joinedload(Invoice.client))
+            query = InvoicesView._filter_invoices(query, status_filter, type_filter)
+            return InvoicesView._invoice_snapshots(query.filter(Invoice.id.in_(ids)).all())
+    
+    @staticmethod
+    def _load_totals(status_filter: str, type_filter: Optional[str]) -> dict:
+        """Sum all invoices within the filters per type (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = session.query(
+                Invoice.invoice_type, func.count(Invoice.id), func.sum(Invoice.amount_incl_vat)
+            )
+            query = InvoicesView._filter_invoices(query, status_filter, type_filter)
+            rows = query.group_by(Invoice.invoice_type).all()
+        
+        return {
+            "count": sum(count for _, count, _ in rows),
+            **{invoice_type: total or 0.0 for invoice_type, _, total in rows},
+        }
+    
+    def _reload_totals(self):
+        status_filter, type_filter = self._current_filter, self._type_filter
+        self.loader.load(lambda: self._load_totals(status_filter, type_filter), self._show_totals, key="totals")
+    
+    def _show_invoices(self, data: dict, fetch):
+        """Show the first page of invoices with the totals (main thread)."""
+        self.pages.show(data["page"], fetch)
+        self._show_totals(data["totals"])
+    
+    def _show_totals(self, totals: dict):
+        """Show the totals of all invoices within the filters."""
+        if totals["count"]:
+            total_out = totals.get(InvoiceType.OUTGOING.value, 0.0)
+            total_in = totals.get(InvoiceType.INCOMING.value, 0.0)
             
-            if not invoices:
-                empty_label = ctk.CTkLabel(
-                    self.list_frame,
-                    text="Geen facturen gevonden.\n\nKlik op '+ Nieuwe Factuur' om te beginnen.",
-                    text_color="gray50",
-                    justify="center"
-                )
-                empty_label.pack(pady=50)
-            else:
-                # Calculate totals
-                total_out = sum(i.amount_incl_vat for i in invoices if i.invoice_type == InvoiceType.OUTGOING.value)
-                total_in = sum(i.amount_incl_vat for i in invoices if i.invoice_type == InvoiceType.INCOMING.value)
-                
-                # Summary bar
-                summary = ctk.CTkFrame(self.list_frame, corner_radius=8, fg_color=("gray85", "gray20"))
-                summary.pack(fill="x", pady=(0, 10))
-                
-                ctk.CTkLabel(
-                    summary,
-                    text=f"📤 Uitgaand: € {total_out:,.2f}",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#34a853"
-                ).pack(side="left", padx=15, pady=8)
-                
-                ctk.CTkLabel(
-                    summary,
-                    text=f"📥 Inkomend: € {total_in:,.2f}",
-                    font=ctk.CTkFont(size=12),
-                    text_color="#ea4335"
-                ).pack(side="left", padx=15, pady=8)
-                
-                ctk.CTkLabel(
-                    summary,
-                    text=f"Saldo: € {total_out - total_in:,.2f}",
-                    font=ctk.CTkFont(size=12, weight="bold")
-                ).pack(side="right", padx=15, pady=8)
-                
-                for invoice in invoices:
-                    item = InvoiceListItem(
-                        self.list_frame,
-                        invoice=invoice,
-                        on_click=self._on_invoice_click
-                    )
-                    item.pack(fill="x", pady=2)
+            self.total_out_label.configure(text=f"📤 Uitgaand: € {total_out:,.2f}")
+            self.total_in_label.configure(text=f"📥 Inkomend: € {total_in:,.2f}")
+            self.balance_label.configure(text=f"Saldo: € {total_out - total_in:,.2f}")
+            self.summary_frame.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+        else:
+            self.summary_frame.grid_forget()
     
     def _set_filter(self, filter_value: str):
         """Set status filter."""
@@ -976,6 +1075,7 @@ class InvoicesView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
     def _set_type_filter(self, type_value: str):
@@ -991,12 +1091,13 @@ class InvoicesView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
-    def _on_invoice_click(self, invoice: Invoice):
+    def _on_invoice_click(self, invoice: RowSnapshot):
         """Handle invoice click."""
         self._showing_detail = True
-        self.list_frame.grid_forget()
+        self.list_panel.grid_forget()
         self.detail_view.grid(row=0, column=0, sticky="nsew")
         self.detail_view.show_invoice(invoice)
     
@@ -1004,7 +1105,7 @@ class InvoicesView(ctk.CTkFrame):
         """Go back to list."""
         self._showing_detail = False
         self.detail_view.grid_forget()
-        self.list_frame.grid(row=0, column=0, sticky="nsew")
+        self.list_panel.grid(row=0, column=0, sticky="nsew")
         self.refresh()
     
     def _update_sync_status(self):
@@ -1043,8 +1144,8 @@ class InvoicesView(ctk.CTkFrame):
         
         def do_sync():
             try:
-                sync_service = get_payment_sync_service()
-                synced, errors, error_messages = sync_service.sync_payments()
+                # Via de scheduler: nooit naast een geplande sync
+                synced, errors, error_messages = get_payment_sync_scheduler().sync_now()
                 
                 # Update UI on main thread
                 self.after(0, lambda: self._on_sync_complete(synced, errors, error_messages))
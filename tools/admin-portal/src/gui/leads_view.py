@@ -11,13 +11,20 @@ import csv
 
 from ..database import get_db
 from ..database.models import Lead, LeadStatus
+from ..database.pagination import keyset_page, Page, PageCursor
 from ..utils.config import Config, logger
 from ..utils.helpers import format_datetime, truncate_text, generate_id
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot, snapshots
+from .live_list import LiveList
+from .paged_list import PagedList
 
 
-class LeadListItem(ctk.CTkFrame):
+class LeadListItem(VirtualListRow):
     """Lead list item widget."""
     
+    HEIGHT = 56
+    
     # Status colors
     STATUS_COLORS = {
         LeadStatus.NEW.value: "#1a73e8",
@@ -27,14 +34,8 @@ class LeadListItem(ctk.CTkFrame):
         LeadStatus.LOST.value: "#ea4335",
     }
     
-    def __init__(self, parent, lead: Lead, on_click: callable, **kwargs):
-        super().__init__(parent, corner_radius=8, **kwargs)
-        
-        self.lead = lead
-        self.on_click = on_click
-        
-        self.bind("<Button-1>", lambda e: on_click(lead))
-        self.configure(cursor="hand2")
+    def __init__(self, parent, on_click: callable, **kwargs):
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
         self._setup_ui()
     
@@ -43,66 +44,71 @@ class LeadListItem(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=1)
         
         # Status indicator
-        status_color = self.STATUS_COLORS.get(self.lead.status, "gray50")
-        indicator = ctk.CTkFrame(
+        self.indicator = ctk.CTkFrame(
             self,
             width=4,
-            fg_color=status_color,
             corner_radius=2
         )
-        indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
+        self.indicator.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, 10), pady=5)
         
         # Business name
-        name_label = ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             self,
-            text=truncate_text(self.lead.business_name, 40),
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             anchor="w"
         )
-        name_label.grid(row=0, column=1, sticky="w", pady=(8, 0))
-        name_label.bind("<Button-1>", lambda e: self.on_click(self.lead))
+        self.name_label.grid(row=0, column=1, sticky="w", pady=(8, 0))
         
         # City + Category
-        info_parts = []
-        if self.lead.city:
-            info_parts.append(self.lead.city)
-        if self.lead.category:
-            info_parts.append(self.lead.category)
-        
-        info_label = ctk.CTkLabel(
+        self.info_label = ctk.CTkLabel(
             self,
-            text=" • ".join(info_parts) if info_parts else "-",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray60",
             anchor="w"
         )
-        info_label.grid(row=1, column=1, sticky="w", pady=(0, 8))
-        info_label.bind("<Button-1>", lambda e: self.on_click(self.lead))
+        self.info_label.grid(row=1, column=1, sticky="w", pady=(0, 8))
         
-        # Score badge
-        score = self.lead.lead_score or 0
-        score_color = "#34a853" if score >= 70 else "#fbbc04" if score >= 40 else "#ea4335"
+        self.clickable(self.name_label, self.info_label)
         
-        score_label = ctk.CTkLabel(
+        # Score badge
+        self.score_label = ctk.CTkLabel(
             self,
-            text=f"{score:.0f}",
+            text="",
             font=ctk.CTkFont(size=11, weight="bold"),
             text_color="white",
-            fg_color=score_color,
             corner_radius=4,
             width=35,
             height=22
         )
-        score_label.grid(row=0, column=2, rowspan=2, padx=(10, 8))
+        self.score_label.grid(row=0, column=2, rowspan=2, padx=(10, 8))
         
         # Website indicator
-        website_text = "🌐" if self.lead.has_website else "❌"
-        website_label = ctk.CTkLabel(
+        self.website_label = ctk.CTkLabel(
             self,
-            text=website_text,
+            text="",
             font=ctk.CTkFont(size=14)
         )
-        website_label.grid(row=0, column=3, rowspan=2, padx=(0, 8))
+        self.website_label.grid(row=0, column=3, rowspan=2, padx=(0, 8))
+    
+    def bind_item(self, lead: RowSnapshot):
+        """Show a lead in this row."""
+        self.indicator.configure(fg_color=self.STATUS_COLORS.get(lead.status, "gray50"))
+        self.name_label.configure(text=truncate_text(lead.business_name, 40))
+        
+        info_parts = []
+        if lead.city:
+            info_parts.append(lead.city)
+        if lead.category:
+            info_parts.append(lead.category)
+        self.info_label.configure(text=" • ".join(info_parts) if info_parts else "-")
+        
+        score = lead.lead_score or 0
+        score_color = "#34a853" if score >= 70 else "#fbbc04" if score >= 40 else "#ea4335"
+        self.score_label.configure(text=f"{score:.0f}", fg_color=score_color)
+        
+        self.website_label.configure(text="🌐" if lead.has_website else "❌")
 
 
 class LeadDetailView(ctk.CTkFrame):
@@ -524,8 +530,20 @@ class LeadsView(ctk.CTkFrame):
         
         self._showing_detail = False
         self._current_filter = "all"
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
+        
+        # Older leads load page by page while scrolling
+        self.pages = PagedList(self.list_frame, self.loader)
+        
+        # Patch the list on lead changes instead of reloading it
+        self.live = LiveList(
+            self, self.list_frame, self.loader, "lead",
+            lambda ids: self._load_changed_leads(self._current_filter, ids),
+            Lead.lead_score,
+            has_more=lambda: self.pages.has_more
+        )
     
     def _setup_ui(self):
         """Setup leads view UI."""
@@ -584,7 +602,12 @@ class LeadsView(ctk.CTkFrame):
         self.content_frame.grid_rowconfigure(0, weight=1)
         
         # List
-        self.list_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
+        self.list_frame = VirtualList(
+            self.content_frame,
+            row_factory=lambda parent: LeadListItem(parent, on_click=self._on_lead_click),
+            row_height=LeadListItem.HEIGHT,
+            empty_text="Geen leads gevonden.\n\nKlik op 'Import CSV' om leads te importeren\nvanuit de lead-finder."
+        )
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         
         # Detail view
@@ -599,35 +622,35 @@ class LeadsView(ctk.CTkFrame):
         if self._showing_detail:
             return
         
-        # Clear list
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
+        status_filter = self._current_filter
+        fetch = lambda after=None: self._load_leads(status_filter, after)
+        self.loader.load(fetch, lambda page: self.pages.show(page, fetch))
+    
+    @staticmethod
+    def _lead_query(session, status_filter: str):
+        """Leads within the status filter."""
+        query = session.query(Lead)
+        
+        if status_filter != "all":
+            query = query.filter_by(status=status_filter)
         
+        return query
+    
+    @staticmethod
+    def _load_leads(status_filter: str, after: Optional[PageCursor] = None) -> Page:
+        """Query one page of leads, highest score first (worker thread)."""
         db = get_db()
         with db.session() as session:
-            query = session.query(Lead)
-            
-            if self._current_filter != "all":
-                query = query.filter_by(status=self._current_filter)
-            
-            leads = query.order_by(Lead.lead_score.desc()).limit(100).all()
-            
-            if not leads:
-                empty_label = ctk.CTkLabel(
-                    self.list_frame,
-                    text="Geen leads gevonden.\n\nKlik op 'Import CSV' om leads te importeren\nvanuit de lead-finder.",
-                    text_color="gray50",
-                    justify="center"
-                )
-                empty_label.pack(pady=50)
-            else:
-                for lead in leads:
-                    item = LeadListItem(
-                        self.list_frame,
-                        lead=lead,
-                        on_click=self._on_lead_click
-                    )
-                    item.pack(fill="x", pady=2)
+            query = LeadsView._lead_query(session, status_filter)
+            return keyset_page(query, Lead.lead_score, after).map(snapshots)
+    
+    @staticmethod
+    def _load_changed_leads(status_filter: str, ids: List[int]) -> List[RowSnapshot]:
+        """Query changed leads that match the filter (worker thread)."""
+        db = get_db()
+        with db.session() as session:
+            query = LeadsView._lead_query(session, status_filter)
+            return snapshots(query.filter(Lead.id.in_(ids)).all())
     
     def _set_filter(self, filter_value: str):
         """Set filter and refresh."""
@@ -640,9 +663,10 @@ class LeadsView(ctk.CTkFrame):
             else:
                 btn.configure(fg_color="gray40")
         
+        self.list_frame.scroll_to(0)
         self.refresh()
     
-    def _on_lead_click(self, lead: Lead):
+    def _on_lead_click(self, lead: RowSnapshot):
         """Handle lead click."""
         self._showing_detail = True
         self.list_frame.grid_forget()
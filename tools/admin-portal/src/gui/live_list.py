@@ -0,0 +1,169 @@
+"""
+Live List - Houdt een open lijst bij met change events in plaats van refresh().
+
+Per commit komen de gewijzigde ids van één entity binnen (zie
+`database.change_events`). Alleen die ids worden opnieuw geladen, met de
+filters van de view, en de lijst wordt gepatcht:
+- nieuw en binnen het filter: invoegen op de plek die de sortering van de
+  view aangeeft (zelfde volgorde als `keyset_page`)
+- gewijzigd en in de lijst: rij vervangen, en verplaatsen als de
+  sorteerwaarde veranderd is (of verwijderen als hij niet meer binnen het
+  filter valt)
+- verwijderd: rij verwijderen
+
+Valt een nieuwe rij voorbij de laatste geladen rij terwijl er nog pagina's
+volgen, dan wordt hij niet ingevoegd; hij komt mee met de volgende pagina.
+
+De kosten hangen af van het aantal wijzigingen; rijen worden niet opnieuw
+opgebouwd en de scroll positie blijft staan.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from ..database.change_events import ChangeEvent, get_change_bus, INSERT, DELETE
+from .data_loader import ViewLoader, RowSnapshot
+from .virtual_list import VirtualList
+
+
+class LiveList:
+    """Koppelt een `VirtualList` aan de change events van één entity."""
+
+    def __init__(
+        self,
+        widget,
+        list_view: VirtualList,
+        loader: ViewLoader,
+        entity: str,
+        load_rows: Callable[[List[int]], List[RowSnapshot]],
+        sort_column,
+        descending: bool = True,
+        has_more: Optional[Callable[[], bool]] = None,
+        on_patched: Optional[Callable[[], None]] = None
+    ):
+        """
+        Args:
+            widget: View die eigenaar is (voor `after()` en de levensduur)
+            list_view: De lijst die gepatcht wordt
+            loader: Loader van de view; patches gebruiken een eigen key
+            entity: Entity naam, bv. "lead"
+            load_rows: Laadt snapshots voor deze ids met de huidige filters
+                (worker thread); ids die niet terugkomen vallen buiten het filter
+            sort_column: Sorteerkolom van de lijst, zoals aan `keyset_page` gegeven
+            descending: Sorteerrichting, zoals aan `keyset_page` gegeven
+            has_more: True als er nog niet geladen pagina's zijn (bv. `PagedList.has_more`)
+            on_patched: Na elke patch (main thread), bv. om totalen bij te werken
+        """
+        self.widget = widget
+        self.list_view = list_view
+        self.loader = loader
+        self.entity = entity
+        self.load_rows = load_rows
+        self.sort_key = sort_column.key
+        self.descending = descending
+        self.has_more = has_more
+        self.on_patched = on_patched
+
+        self._pending: Dict[int, str] = {}  # id: operation
+
+        get_change_bus().subscribe(self._on_events, entities=[entity])
+
+    def close(self):
+        get_change_bus().unsubscribe(self._on_events)
+        self.loader.cancel(self._key)
+
+    @property
+    def _key(self) -> str:
+        return f"changes:{self.entity}"
+
+    def _on_events(self, events: List[ChangeEvent]):
+        # Thread van de commit: door naar de main thread
+        try:
+            self.widget.after(0, lambda: self._queue(events))
+        except RuntimeError:
+            pass  # main loop is gestopt (app sluit af)
+
+    def _queue(self, events: List[ChangeEvent]):
+        if not self.widget.winfo_exists():
+            self.close()
+            return
+
+        for change in events:
+            if self._pending.get(change.entity_id) == INSERT and change.operation != DELETE:
+                continue  # nog niet getoond: blijft een insert
+            self._pending[change.entity_id] = change.operation
+        self._load()
+
+    def _load(self):
+        if not self._pending:
+            return
+
+        batch = dict(self._pending)
+        items = self.list_view.items
+        ids = [entity_id for entity_id, operation in batch.items() if operation != DELETE]
+
+        # Een nieuwere batch vervangt deze load (en bevat ook deze ids), dus
+        # bij aflevering is `batch` nog steeds alles wat er openstaat
+        self.loader.load(
+            lambda: self.load_rows(ids) if ids else [],
+            lambda rows: self._apply(batch, items, rows),
+            key=self._key
+        )
+
+    def _apply(self, batch: Dict[int, str], items, rows: List[RowSnapshot]):
+        if self.list_view.items is not items:
+            # Intussen volledig herladen: opnieuw laden met de nieuwe filters
+            self._load()
+            return
+
+        found = {row.id: row for row in rows}
+
+        for entity_id, operation in batch.items():
+            self._pending.pop(entity_id, None)
+
+            index = self.list_view.index_of(entity_id)
+            row = found.get(entity_id)
+
+            if row is None:
+                if index is not None:
+                    self.list_view.remove_item(index)
+            elif index is not None:
+                if self._sort_value(self.list_view.items[index]) == self._sort_value(row):
+                    self.list_view.update_item(index, row)
+                else:
+                    self.list_view.remove_item(index)
+                    self._insert(row)
+            elif operation == INSERT:
+                self._insert(row)
+            # Gewijzigd maar niet geladen (bv. voorbij de eerste pagina): komt bij refresh
+
+        if self.on_patched:
+            self.on_patched()
+
+    # === SORTERING ===
+
+    def _sort_value(self, row) -> Any:
+        return getattr(row, self.sort_key, None)
+
+    def _insert(self, row: RowSnapshot):
+        """Voeg een rij in op zijn plek in de sortering (binary search)."""
+        items = self.list_view.items
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(items[middle], row):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(items) and self.has_more and self.has_more():
+            return  # hoort in een pagina die nog niet geladen is
+        self.list_view.insert_item(low, row)
+
+    def _precedes(self, a, b) -> bool:
+        """True als `a` vóór `b` staat: (sorteerwaarde, id), NULL achteraan."""
+        value_a, value_b = self._sort_value(a), self._sort_value(b)
+        if (value_a is None) != (value_b is None):
+            return value_b is None
+        if value_a is None or value_a == value_b:
+            return a.id > b.id if self.descending else a.id < b.id
+        return value_a > value_b if self.descending else value_a < value_b
@@ -0,0 +1,69 @@
+"""
+Paged List - Laadt een `VirtualList` pagina voor pagina bij het scrollen.
+
+De view laadt zelf de eerste pagina (samen met wat hij verder nodig heeft)
+en geeft die met een `fetch(cursor)` functie aan `show()`. Komen de laatste
+rijen in beeld, dan haalt `PagedList` de volgende pagina op de loader pool
+op en voegt hem achteraan toe. Er is steeds maar één pagina ORM objecten
+tegelijk geladen; de lijst zelf bevat snapshots.
+"""
+
+from typing import Callable, Optional
+
+from ..database.pagination import Page, PageCursor
+from .data_loader import ViewLoader
+from .virtual_list import VirtualList
+
+
+class PagedList:
+    """Infinite scroll voor een `VirtualList` met keyset pagina's."""
+
+    KEY = "page"
+
+    def __init__(self, list_view: VirtualList, loader: ViewLoader):
+        self.list_view = list_view
+        self.loader = loader
+
+        self._cursor: Optional[PageCursor] = None
+        self._fetch: Optional[Callable[[PageCursor], Page]] = None
+
+        list_view.on_near_end = self.load_more
+
+    def show(self, page: Page, fetch: Callable[[PageCursor], Page], empty_text: Optional[str] = None):
+        """
+        Toon de eerste pagina.
+
+        Args:
+            page: Eerste pagina (rijen als snapshots)
+            fetch: Laadt de pagina na een cursor, met dezelfde filters (worker thread)
+            empty_text: Zie `VirtualList.set_items`
+        """
+        self.loader.cancel(self.KEY)
+        self._cursor = page.cursor
+        self._fetch = fetch
+        self.list_view.set_items(page.rows, empty_text=empty_text)
+
+    @property
+    def has_more(self) -> bool:
+        return self._cursor is not None
+
+    def load_more(self):
+        """Laad de volgende pagina (no-op als hij al laadt of alles er is)."""
+        if self._cursor is None or self._fetch is None or self.loader.is_loading(self.KEY):
+            return
+
+        cursor, fetch, items = self._cursor, self._fetch, self.list_view.items
+        self.loader.load(
+            lambda: fetch(cursor),
+            lambda page: self._append(items, page),
+            key=self.KEY
+        )
+
+    def _append(self, items, page: Page):
+        if self.list_view.items is not items:
+            return  # intussen een nieuwe eerste pagina getoond
+
+        # Rijen die via change events al bovenaan staan niet dubbel tonen
+        known = {item.id for item in items}
+        self._cursor = page.cursor
+        self.list_view.append_items([row for row in page.rows if row.id not in known])
@@ -5,18 +5,20 @@ Snelstart View - Snelstart API beheer, synchronisatie en monitoring.
 import customtkinter as ctk
 from tkinter import messagebox
 import threading
-from typing import Optional
+from typing import Optional, Dict, Any
 from datetime import datetime
 
 from ..database import get_db
 from ..database.models import Invoice, InvoiceType, InvoiceStatus, Client
 from ..utils.config import Config, logger
 from ..services.snelstart_api import get_snelstart_api, SnelstartStatus
+from ..services.snelstart_reference import get_reference_cache
 from ..services.snelstart_sync_service import (
     get_snelstart_sync_service, 
     get_snelstart_scheduler,
     SyncResult
 )
+from .data_loader import ViewLoader
 
 
 class StatusIndicator(ctk.CTkFrame):
@@ -101,6 +103,7 @@ class SyncQueueItem(ctk.CTkFrame):
             "pending": "#fbbc04",
             "synced": "#34a853",
             "error": "#ea4335",
+            "review": "#9c27b0",
         }
         status_label = ctk.CTkLabel(
             self,
@@ -119,6 +122,8 @@ class SnelstartView(ctk.CTkFrame):
         
         self.api = get_snelstart_api()
         self.sync_service = get_snelstart_sync_service()
+        self.reference = get_reference_cache()
+        self.loader = ViewLoader(self)
         
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(4, weight=1)
@@ -198,7 +203,18 @@ class SnelstartView(ctk.CTkFrame):
             justify="left",
             anchor="w"
         )
-        config_info.grid(row=2, column=0, columnspan=3, sticky="w", padx=20, pady=(5, 15))
+        config_info.grid(row=2, column=0, columnspan=3, sticky="w", padx=20, pady=(5, 5))
+        
+        # Reference data (uit de lokale cache, zonder API call)
+        self.reference_label = ctk.CTkLabel(
+            config_frame,
+            text="📚 Referentiedata: nog niet opgehaald",
+            font=ctk.CTkFont(size=11),
+            text_color="gray50",
+            justify="left",
+            anchor="w"
+        )
+        self.reference_label.grid(row=3, column=0, columnspan=3, sticky="w", padx=20, pady=(0, 15))
         
         # =====================================================================
         # Sync Section
@@ -336,8 +352,25 @@ class SnelstartView(ctk.CTkFrame):
         """Refresh the view."""
         self._update_status()
         self._update_queue_stats()
+        self._update_reference()
         self._update_history()
     
+    def _update_reference(self):
+        """Show cached reference data; verversen gebeurt op de achtergrond."""
+        if Config.is_snelstart_configured():
+            self.reference.start()
+        
+        status = self.reference.get_status()
+        fetched = [s["fetched_at"] for s in status.values() if s["fetched_at"]]
+        if not fetched:
+            return
+        
+        counts = ", ".join(f"{s['count']} {name}" for name, s in status.items() if s["fetched_at"])
+        expired = " (wordt ververst)" if any(s["expired"] for s in status.values()) else ""
+        self.reference_label.configure(
+            text=f"📚 Referentiedata: {counts} — bijgewerkt {min(fetched):%d-%m-%Y %H:%M}{expired}"
+        )
+    
     def _update_status(self):
         """Update connection status."""
         health = self.api.get_health()
@@ -350,7 +383,12 @@ class SnelstartView(ctk.CTkFrame):
             self.last_sync_label.configure(text=f"Laatste sync: {time_str}")
     
     def _update_queue_stats(self):
-        """Update queue statistics."""
+        """Update queue statistics (queries run on the loader pool)."""
+        self.loader.load(self._load_queue, self._show_queue, key="queue")
+    
+    @staticmethod
+    def _load_queue() -> Dict[str, Any]:
+        """Count and list items waiting for sync (worker thread)."""
         db = get_db()
         with db.session() as session:
             # Count pending clients
@@ -374,52 +412,58 @@ class SnelstartView(ctk.CTkFrame):
             error_invoices = session.query(Invoice).filter(
                 Invoice.snelstart_sync_status == "error"
             ).count()
-        
-        self.clients_pending_label.configure(text=f"👥 Klanten: {pending_clients} wachtend")
-        self.invoices_pending_label.configure(text=f"📄 Facturen: {pending_invoices} wachtend")
-        
-        total_errors = error_clients + error_invoices
-        if total_errors > 0:
-            self.errors_label.configure(text=f"⚠️ Fouten: {total_errors}", text_color="#ea4335")
-        else:
-            self.errors_label.configure(text="⚠️ Fouten: 0", text_color="gray50")
-        
-        # Update queue list
-        self._update_queue_list()
-    
-    def _update_queue_list(self):
-        """Update the queue list with pending items."""
-        # Clear list
-        for widget in self.queue_list.winfo_children():
-            widget.destroy()
-        
-        db = get_db()
-        with db.session() as session:
+            
             # Get recent items needing sync or with errors
             items = []
             
             # Clients
-            clients = session.query(Client).filter(
+            clients = session.query(Client.name, Client.snelstart_sync_status).filter(
                 (Client.snelstart_sync_status == "pending") |
                 (Client.snelstart_sync_status == "error") |
+                (Client.snelstart_sync_status == "review") |
                 (Client.snelstart_sync_status == None)
             ).limit(10).all()
             
-            for client in clients:
-                status = client.snelstart_sync_status or "pending"
-                items.append(("client", client.name, status))
+            for name, status in clients:
+                items.append(("client", name, status or "pending"))
             
             # Invoices
-            invoices = session.query(Invoice).filter(
+            invoices = session.query(Invoice.invoice_number, Invoice.snelstart_sync_status).filter(
                 Invoice.invoice_type == InvoiceType.OUTGOING.value,
                 (Invoice.snelstart_sync_status == "pending") |
                 (Invoice.snelstart_sync_status == "error") |
                 (Invoice.snelstart_sync_status == None)
             ).limit(10).all()
             
-            for invoice in invoices:
-                status = invoice.snelstart_sync_status or "pending"
-                items.append(("invoice", invoice.invoice_number, status))
+            for invoice_number, status in invoices:
+                items.append(("invoice", invoice_number, status or "pending"))
+        
+        return {
+            "pending_clients": pending_clients,
+            "pending_invoices": pending_invoices,
+            "errors": error_clients + error_invoices,
+            "items": items,
+        }
+    
+    def _show_queue(self, data: Dict[str, Any]):
+        """Show loaded queue statistics (main thread)."""
+        self.clients_pending_label.configure(text=f"👥 Klanten: {data['pending_clients']} wachtend")
+        self.invoices_pending_label.configure(text=f"📄 Facturen: {data['pending_invoices']} wachtend")
+        
+        total_errors = data["errors"]
+        if total_errors > 0:
+            self.errors_label.configure(text=f"⚠️ Fouten: {total_errors}", text_color="#ea4335")
+        else:
+            self.errors_label.configure(text="⚠️ Fouten: 0", text_color="gray50")
+        
+        # Update queue list
+        self._update_queue_list(data["items"])
+    
+    def _update_queue_list(self, items: list):
+        """Update the queue list with pending items."""
+        # Clear list
+        for widget in self.queue_list.winfo_children():
+            widget.destroy()
         
         if not items:
             empty_label = ctk.CTkLabel(
@@ -506,7 +550,8 @@ class SnelstartView(ctk.CTkFrame):
         self.sync_all_btn.configure(state="disabled", text="⏳ Bezig...")
         
         def do_sync():
-            client_result, invoice_result = self.sync_service.sync_all()
+            # Via de scheduler: nooit naast een geplande sync
+            client_result, invoice_result = get_snelstart_scheduler().sync_now()
             self.after(0, lambda: self._on_sync_complete(client_result, invoice_result))
         
         threading.Thread(target=do_sync, daemon=True).start()
@@ -518,7 +563,7 @@ class SnelstartView(ctk.CTkFrame):
             return
         
         def do_sync():
-            result = self.sync_service.sync_all_clients()
+            result = get_snelstart_scheduler().sync_clients_now()
             self.after(0, lambda: self._on_client_sync_complete(result))
         
         threading.Thread(target=do_sync, daemon=True).start()
@@ -530,7 +575,7 @@ class SnelstartView(ctk.CTkFrame):
             return
         
         def do_sync():
-            result = self.sync_service.sync_all_invoices()
+            result = get_snelstart_scheduler().sync_invoices_now()
             self.after(0, lambda: self._on_invoice_sync_complete(result))
         
         threading.Thread(target=do_sync, daemon=True).start()
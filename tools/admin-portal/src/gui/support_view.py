@@ -5,7 +5,7 @@ IT-style ticketing system met AI integration.
 
 import customtkinter as ctk
 from tkinter import messagebox
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 import threading
 
@@ -17,19 +17,33 @@ from ..database.models import (
 from ..services.support_service import get_support_service, start_support_sync
 from ..utils.config import logger
 from ..utils.helpers import format_datetime, truncate_text
+from .virtual_list import VirtualList, VirtualListRow
+from .data_loader import ViewLoader, RowSnapshot
 
 
-class TicketCard(ctk.CTkFrame):
+class TicketCard(VirtualListRow):
     """Card voor een support ticket in de lijst."""
     
-    def __init__(self, parent, ticket: Dict, on_click: callable, **kwargs):
-        super().__init__(parent, corner_radius=8, **kwargs)
-        
-        self.ticket = ticket
-        self.on_click = on_click
-        
-        self.bind("<Button-1>", self._handle_click)
-        self.configure(cursor="hand2")
+    HEIGHT = 88
+    
+    PRIORITY_COLORS = {
+        "low": "#34a853",
+        "medium": "#1a73e8",
+        "high": "#ff6d01",
+        "urgent": "#ea4335"
+    }
+    
+    STATUS_COLORS = {
+        "open": "#ea4335",
+        "in_progress": "#1a73e8",
+        "waiting_customer": "#fbbc04",
+        "ai_processing": "#9c27b0",
+        "resolved": "#34a853",
+        "closed": "gray50"
+    }
+    
+    def __init__(self, parent, on_click: callable, **kwargs):
+        super().__init__(parent, on_click=on_click, height=self.HEIGHT, **kwargs)
         
         self._setup_ui()
     
@@ -37,101 +51,124 @@ class TicketCard(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=1)
         
         # Priority indicator
-        priority_colors = {
-            "low": "#34a853",
-            "medium": "#1a73e8",
-            "high": "#ff6d01",
-            "urgent": "#ea4335"
-        }
-        color = priority_colors.get(self.ticket.get("priority", "medium"), "#1a73e8")
-        
-        indicator = ctk.CTkFrame(self, width=6, fg_color=color, corner_radius=3)
-        indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(8, 12), pady=8)
+        self.indicator = ctk.CTkFrame(self, width=6, corner_radius=3)
+        self.indicator.grid(row=0, column=0, rowspan=3, sticky="ns", padx=(8, 12), pady=8)
         
         # Ticket number + Subject
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
         header_frame.grid(row=0, column=1, sticky="ew", pady=(8, 0))
-        header_frame.bind("<Button-1>", self._handle_click)
         
-        ctk.CTkLabel(
+        self.number_label = ctk.CTkLabel(
             header_frame,
-            text=self.ticket.get("ticket_number", ""),
+            text="",
             font=ctk.CTkFont(size=11, weight="bold"),
             text_color="#1a73e8"
-        ).pack(side="left")
+        )
+        self.number_label.pack(side="left")
         
         # Status badge
-        status = self.ticket.get("status", "open")
-        status_colors = {
-            "open": "#ea4335",
-            "in_progress": "#1a73e8",
-            "waiting_customer": "#fbbc04",
-            "ai_processing": "#9c27b0",
-            "resolved": "#34a853",
-            "closed": "gray50"
-        }
-        
-        status_text = status.replace("_", " ").upper()
-        if status == "ai_processing":
-            status_text = "🤖 AI"
-        
-        ctk.CTkLabel(
+        self.status_label = ctk.CTkLabel(
             header_frame,
-            text=status_text,
+            text="",
             font=ctk.CTkFont(size=9),
             text_color="white",
-            fg_color=status_colors.get(status, "gray50"),
             corner_radius=4,
             padx=6,
             pady=2
-        ).pack(side="left", padx=(10, 0))
+        )
+        self.status_label.pack(side="left", padx=(10, 0))
         
         # AI badge
-        if self.ticket.get("ai_analyzed"):
-            ctk.CTkLabel(
-                header_frame,
-                text="🧠 AI",
-                font=ctk.CTkFont(size=9),
-                text_color="white",
-                fg_color="#9c27b0",
-                corner_radius=4,
-                padx=6,
-                pady=2
-            ).pack(side="left", padx=(5, 0))
+        self.ai_label = ctk.CTkLabel(
+            header_frame,
+            text="🧠 AI",
+            font=ctk.CTkFont(size=9),
+            text_color="white",
+            fg_color="#9c27b0",
+            corner_radius=4,
+            padx=6,
+            pady=2
+        )
         
         # Subject
-        ctk.CTkLabel(
+        self.subject_label = ctk.CTkLabel(
             self,
-            text=truncate_text(self.ticket.get("subject", ""), 60),
+            text="",
             font=ctk.CTkFont(size=13, weight="bold"),
             anchor="w"
-        ).grid(row=1, column=1, sticky="w")
+        )
+        self.subject_label.grid(row=1, column=1, sticky="w")
         
         # Customer + Time
         info_frame = ctk.CTkFrame(self, fg_color="transparent")
         info_frame.grid(row=2, column=1, sticky="ew", pady=(0, 8))
-        info_frame.bind("<Button-1>", self._handle_click)
-        
-        customer = self.ticket.get("customer_name", "")
-        if self.ticket.get("company_name"):
-            customer += f" ({self.ticket['company_name']})"
         
-        ctk.CTkLabel(
+        self.customer_label = ctk.CTkLabel(
             info_frame,
-            text=f"👤 {customer}",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray50"
-        ).pack(side="left")
+        )
+        self.customer_label.pack(side="left")
         
-        ctk.CTkLabel(
+        self.category_label = ctk.CTkLabel(
             info_frame,
-            text=f"• {self.ticket.get('category', 'other').replace('_', ' ').title()}",
+            text="",
             font=ctk.CTkFont(size=11),
             text_color="gray50"
-        ).pack(side="left", padx=(10, 0))
+        )
+        self.category_label.pack(side="left", padx=(10, 0))
+        
+        # Time
+        self.time_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray50"
+        )
+        self.time_label.grid(row=0, column=2, rowspan=3, padx=10)
+        
+        # Assigned
+        self.assigned_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=10),
+            text_color="gray60"
+        )
+        self.assigned_label.grid(row=0, column=3, rowspan=3, padx=(0, 10))
+        
+        self.clickable(
+            header_frame, info_frame, self.number_label, self.subject_label,
+            self.customer_label, self.category_label
+        )
+    
+    def bind_item(self, ticket: RowSnapshot):
+        self.indicator.configure(fg_color=self.PRIORITY_COLORS.get(ticket.get("priority", "medium"), "#1a73e8"))
+        self.number_label.configure(text=ticket.get("ticket_number", ""))
+        
+        status = ticket.get("status", "open")
+        status_text = status.replace("_", " ").upper()
+        if status == "ai_processing":
+            status_text = "🤖 AI"
+        self.status_label.configure(text=status_text, fg_color=self.STATUS_COLORS.get(status, "gray50"))
+        
+        if ticket.get("ai_analyzed"):
+            self.ai_label.pack(side="left", padx=(5, 0))
+        else:
+            self.ai_label.pack_forget()
+        
+        self.subject_label.configure(text=truncate_text(ticket.get("subject", ""), 60))
+        
+        customer = ticket.get("customer_name", "")
+        if ticket.get("company_name"):
+            customer += f" ({ticket['company_name']})"
+        self.customer_label.configure(text=f"👤 {customer}")
+        self.category_label.configure(
+            text=f"• {ticket.get('category', 'other').replace('_', ' ').title()}"
+        )
         
         # Time
-        created = self.ticket.get("created_at", "")
+        created = ticket.get("created_at", "")
         if created:
             try:
                 dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
@@ -140,27 +177,15 @@ class TicketCard(ctk.CTkFrame):
                 time_str = created[:10]
         else:
             time_str = ""
-        
-        ctk.CTkLabel(
-            self,
-            text=time_str,
-            font=ctk.CTkFont(size=10),
-            text_color="gray50"
-        ).grid(row=0, column=2, rowspan=3, padx=10)
+        self.time_label.configure(text=time_str)
         
         # Assigned
-        assigned = self.ticket.get("assigned_to")
+        assigned = ticket.get("assigned_to")
         if assigned:
-            ctk.CTkLabel(
-                self,
-                text=f"→ {assigned}",
-                font=ctk.CTkFont(size=10),
-                text_color="gray60"
-            ).grid(row=0, column=3, rowspan=3, padx=(0, 10))
-    
-    def _handle_click(self, event=None):
-        if self.on_click:
-            self.on_click(self.ticket)
+            self.assigned_label.configure(text=f"→ {assigned}")
+            self.assigned_label.grid()
+        else:
+            self.assigned_label.grid_remove()
 
 
 class TicketDetailView(ctk.CTkFrame):
@@ -462,6 +487,7 @@ class SupportView(ctk.CTkFrame):
         self._showing_detail = False
         self._current_filter = None
         self.service = get_support_service()
+        self.loader = ViewLoader(self)
         
         self._setup_ui()
         
@@ -512,7 +538,14 @@ class SupportView(ctk.CTkFrame):
         self.content_frame.grid_rowconfigure(0, weight=1)
         
         # Ticket list
-        self.list_frame = ctk.CTkScrollableFrame(self.content_frame, fg_color="transparent")
+        self.list_frame = VirtualList(
+            self.content_frame,
+            row_factory=lambda parent: TicketCard(parent, on_click=self._on_ticket_click),
+            row_height=TicketCard.HEIGHT,
+            row_spacing=6,
+            empty_text="Geen tickets gevonden.\n\n"
+                       "Tickets worden automatisch gesynchroniseerd van de website."
+        )
         self.list_frame.grid(row=0, column=0, sticky="nsew")
         
         # Detail view
@@ -523,16 +556,25 @@ class SupportView(ctk.CTkFrame):
         if self._showing_detail:
             return
         
-        self._refresh_stats()
-        self._refresh_tickets()
+        self.loader.load(self._load, self._show)
     
-    def _refresh_stats(self):
+    def _load(self) -> Dict[str, Any]:
+        """Load stats and tickets (worker thread)."""
+        return {
+            "stats": self.service.get_stats(),
+            "tickets": [RowSnapshot(ticket) for ticket in self.service.get_tickets(limit=50)],
+        }
+    
+    def _show(self, data: Dict[str, Any]):
+        """Show loaded stats and tickets (main thread)."""
+        self._refresh_stats(data["stats"])
+        self.list_frame.set_items(data["tickets"])
+    
+    def _refresh_stats(self, stats: Dict[str, Any]):
         """Update stats bar."""
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
         
-        stats = self.service.get_stats()
-        
         stat_items = [
             ("📊 Totaal", stats.get("total", 0), "gray50"),
             ("🔴 Open", stats.get("open", 0), "#ea4335"),
@@ -560,31 +602,7 @@ class SupportView(ctk.CTkFrame):
                 text_color=color
             ).pack(padx=15, pady=(0, 8))
     
-    def _refresh_tickets(self):
-        """Refresh ticket list."""
-        for widget in self.list_frame.winfo_children():
-            widget.destroy()
-        
-        tickets = self.service.get_tickets(limit=50)
-        
-        if not tickets:
-            ctk.CTkLabel(
-                self.list_frame,
-                text="Geen tickets gevonden.\n\n"
-                     "Tickets worden automatisch gesynchroniseerd van de website.",
-                text_color="gray50",
-                justify="center"
-            ).pack(pady=50)
-        else:
-            for ticket in tickets:
-                card = TicketCard(
-                    self.list_frame,
-                    ticket=ticket,
-                    on_click=self._on_ticket_click
-                )
-                card.pack(fill="x", pady=3)
-    
-    def _on_ticket_click(self, ticket: Dict):
+    def _on_ticket_click(self, ticket: RowSnapshot):
         """Handle ticket click."""
         self._showing_detail = True
         self.list_frame.grid_forget()
@@ -0,0 +1,294 @@
+"""
+Virtual List - Gedeelde lijst widget voor grote lijsten.
+
+Alleen de zichtbare regels bestaan als widgets: een vaste pool rijen wordt
+bij het scrollen verplaatst en opnieuw gebonden aan items uit het data
+model. Item `i` gebruikt altijd pool rij `i % pool_size`, dus bij een stap
+van één regel wordt maar één rij opnieuw gevuld. `set_items()` bewaart
+alleen een referentie naar de lijst en bindt de zichtbare rijen opnieuw;
+de kosten hangen af van de hoogte van het venster, niet van het aantal
+items.
+"""
+
+import math
+import sys
+import customtkinter as ctk
+from typing import Callable, Optional, Sequence, Any, List, Dict
+
+
+SCROLL_STEP = 40  # pixels per muiswiel stap
+NEAR_END_ROWS = 5  # `on_near_end` zodra de laatste zoveel rijen in beeld komen
+
+
+class VirtualListRow(ctk.CTkFrame):
+    """
+    Basis voor een herbruikbare rij in een `VirtualList`.
+
+    Subclasses bouwen hun widgets één keer in `__init__` en vullen ze in
+    `bind_item()`; widgets die niet bij elk item horen worden met
+    `grid_remove()` verborgen in plaats van verwijderd.
+    """
+
+    def __init__(self, parent, on_click: Optional[Callable] = None, height: int = 56, **kwargs):
+        kwargs.setdefault("corner_radius", 8)
+        super().__init__(parent, height=height, **kwargs)
+
+        self.item = None
+        self.index: Optional[int] = None
+        self.virtual_list: Optional["VirtualList"] = None
+        self.on_click = on_click
+
+        # Vaste hoogte: de inhoud mag de rij niet laten groeien
+        self.grid_propagate(False)
+        self.configure(cursor="hand2")
+        self.bind("<Button-1>", self._handle_click)
+
+    def bind_item(self, item: Any):
+        """Vul de rij met de gegevens van een item."""
+        raise NotImplementedError
+
+    def replace_item(self, item: Any):
+        """Vervang het item van deze rij in het model (bv. na een actie in de rij)."""
+        if self.virtual_list is not None and self.index is not None:
+            self.virtual_list.update_item(self.index, item)
+
+    def clickable(self, *widgets):
+        """Laat klikken op child widgets doorgaan naar `on_click`."""
+        for widget in widgets:
+            widget.bind("<Button-1>", self._handle_click)
+
+    def _handle_click(self, event=None):
+        if self.on_click and self.item is not None:
+            self.on_click(self.item)
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollbare lijst die alleen de zichtbare rijen rendert."""
+
+    def __init__(
+        self,
+        parent,
+        row_factory: Callable[[Any], VirtualListRow],
+        row_height: int,
+        row_spacing: int = 4,
+        empty_text: str = "",
+        on_near_end: Optional[Callable[[], None]] = None,
+        **kwargs
+    ):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(parent, **kwargs)
+
+        self.row_factory = row_factory
+        self.row_height = row_height
+        self.row_spacing = row_spacing
+        self.empty_text = empty_text
+        self.on_near_end = on_near_end  # bv. volgende pagina laden
+
+        self._items: Sequence[Any] = []
+        self._offset = 0.0  # scroll positie in (ongeschaalde) pixels
+        self._pool: List[VirtualListRow] = []
+        self._bound: Dict[int, int] = {}  # pool positie: item index
+        self._placed: set = set()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.body.bind("<Configure>", lambda e: self._render())
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", padx=(4, 0))
+
+        self.empty_label = ctk.CTkLabel(self.body, text="", text_color="gray50", justify="center")
+
+        # Muiswiel boven rijen komt binnen op de rij widgets; filter op pad
+        self.bind_all("<MouseWheel>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-4>", self._on_mouse_wheel, add="+")
+        self.bind_all("<Button-5>", self._on_mouse_wheel, add="+")
+
+    # === DATA ===
+
+    def set_items(self, items: Sequence[Any], empty_text: Optional[str] = None):
+        """
+        Toon een nieuwe lijst items.
+
+        De lijst wordt niet gekopieerd. De scroll positie blijft staan (binnen
+        de nieuwe lengte); gebruik `scroll_to(0)` na het wisselen van filter.
+        """
+        self._items = items
+        if empty_text is not None:
+            self.empty_text = empty_text
+        self._bound.clear()
+        self._render()
+
+    @property
+    def items(self) -> Sequence[Any]:
+        return self._items
+
+    def update_item(self, index: int, item: Any):
+        """Vervang één item; de rij wordt alleen opnieuw gevuld als hij zichtbaar is."""
+        self._items[index] = item
+        self._render()
+
+    def append_items(self, items: Sequence[Any]):
+        """Voeg items achteraan toe (volgende pagina); bestaande rijen blijven gebonden."""
+        self._items.extend(items)
+        self._render()
+
+    def insert_item(self, index: int, item: Any):
+        """
+        Voeg één item in.
+
+        Staat de lijst niet bovenaan en valt het item boven de eerste
+        zichtbare rij, dan schuift de scroll positie mee zodat de zichtbare
+        rijen blijven staan.
+        """
+        if self._offset > 0 and index <= self.first_visible:
+            self._offset += self._stride
+        self._items.insert(index, item)
+        self._bound.clear()
+        self._render()
+
+    def remove_item(self, index: int):
+        """Verwijder één item; de zichtbare rijen blijven staan (zie `insert_item`)."""
+        if self._offset > 0 and index < self.first_visible:
+            self._offset -= self._stride
+        del self._items[index]
+        self._bound.clear()
+        self._render()
+
+    def index_of(self, item_id: Any) -> Optional[int]:
+        """Positie van het item met dit `id`, of None."""
+        for index, item in enumerate(self._items):
+            if item.id == item_id:
+                return index
+        return None
+
+    def refresh_rows(self):
+        """Bind de zichtbare rijen opnieuw (bv. na het wijzigen van een item)."""
+        self._bound.clear()
+        self._render()
+
+    # === SCROLLING ===
+
+    def scroll_to(self, index: int):
+        """Scroll zodat item `index` bovenaan staat."""
+        self._offset = float(max(0, index) * self._stride)
+        self._render()
+
+    def scroll_by(self, pixels: float):
+        self._offset += pixels
+        self._render()
+
+    @property
+    def first_visible(self) -> int:
+        return int(self._offset // self._stride)
+
+    @property
+    def _stride(self) -> int:
+        return self.row_height + self.row_spacing
+
+    def _viewport_height(self) -> float:
+        return self._reverse_widget_scaling(self.body.winfo_height())
+
+    def _max_offset(self) -> float:
+        content = len(self._items) * self._stride - self.row_spacing
+        return max(0.0, content - self._viewport_height())
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            content = max(1, len(self._items) * self._stride)
+            self._offset = float(args[0]) * content
+        elif action == "scroll":
+            amount, unit = int(args[0]), args[1] if len(args) > 1 else "units"
+            step = self._viewport_height() if unit == "pages" else SCROLL_STEP
+            self._offset += amount * step
+        self._render()
+
+    def _on_mouse_wheel(self, event):
+        if not self.winfo_exists() or not self._contains(event.widget):
+            return
+
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -event.delta / 120
+        self.scroll_by(steps * SCROLL_STEP)
+
+    def _contains(self, widget) -> bool:
+        # Tk widget paden zijn hiërarchisch; `widget` kan ook een string zijn
+        path, own = str(widget), str(self.body)
+        return path == own or path.startswith(own + ".")
+
+    # === RENDERING ===
+
+    def _render(self):
+        if not self.winfo_exists():
+            return
+
+        count = len(self._items)
+        height = self._viewport_height()
+        stride = self._stride
+
+        self._offset = min(max(0.0, self._offset), self._max_offset())
+        self._update_scrollbar(count, height)
+
+        if count == 0:
+            self._hide_rows(set())
+            if self.empty_text:
+                self.empty_label.configure(text=self.empty_text)
+                self.empty_label.place(relx=0.5, y=50, anchor="n")
+            else:
+                self.empty_label.place_forget()
+            return
+        self.empty_label.place_forget()
+
+        self._ensure_pool(math.ceil(height / stride) + 1)
+
+        first = int(self._offset // stride)
+        last = min(count, int((self._offset + height) // stride) + 1)
+        size = len(self._pool)
+
+        used = set()
+        for index in range(first, last):
+            slot = index % size
+            row = self._pool[slot]
+            if self._bound.get(slot) != index or row.item is not self._items[index]:
+                row.item = self._items[index]
+                row.index = index
+                row.bind_item(row.item)
+                self._bound[slot] = index
+            row.place(x=0, y=round(index * stride - self._offset), relwidth=1)
+            used.add(slot)
+
+        self._hide_rows(used)
+
+        if self.on_near_end and last >= count - NEAR_END_ROWS:
+            self.on_near_end()
+
+    def _ensure_pool(self, size: int):
+        if size <= len(self._pool):
+            return
+        while len(self._pool) < size:
+            row = self.row_factory(self.body)
+            row.virtual_list = self
+            self._pool.append(row)
+        # Andere pool grootte: item -> rij toewijzing verschuift
+        self._bound.clear()
+
+    def _hide_rows(self, used: set):
+        for slot in self._placed - used:
+            self._pool[slot].place_forget()
+        self._placed = used
+
+    def _update_scrollbar(self, count: int, height: float):
+        content = count * self._stride
+        if content <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._offset / content, (self._offset + height) / content)
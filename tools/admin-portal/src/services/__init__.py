@@ -1,60 +1,116 @@
-"""Business logic services."""
-
-from .email_service import EmailService
-from .lead_service import LeadService
-from .webhook_service import WebhookServer, WebsitePoller, start_webhook_server, poll_website_forms
-from .sync_service import EmailSyncScheduler, get_sync_scheduler, start_background_sync, stop_background_sync
-from .payment_sync_service import (
-    PaymentSyncService, 
-    get_payment_sync_service,
-    PaymentSyncScheduler,
-    get_payment_sync_scheduler,
-    start_payment_sync,
-    stop_payment_sync
-)
-from .monitor_service import MonitorService, get_monitor_service, start_monitoring, stop_monitoring
-from .ai_troubleshooter import AITroubleshooter, get_troubleshooter
-from .report_service import ReportService, get_report_service
-from .project_discovery import (
-    ProjectDiscoveryService, 
-    get_discovery_service, 
-    start_project_discovery, 
-    stop_project_discovery
-)
-from .support_service import (
-    SupportService,
-    get_support_service,
-    start_support_sync,
-    stop_support_sync
-)
-from .work_order_service import (
-    WorkOrderSyncService,
-    get_work_order_sync_service,
-    start_work_order_sync,
-    stop_work_order_sync
-)
-from .website_api import (
-    WebsiteAPI,
-    get_website_api,
-    APIStatus,
-    APIHealth
-)
-from .snelstart_api import (
-    SnelstartAPI,
-    get_snelstart_api,
-    SnelstartStatus,
-    SnelstartHealth
-)
-from .snelstart_sync_service import (
-    SnelstartSyncService,
-    get_snelstart_sync_service,
-    SnelstartSyncScheduler,
-    get_snelstart_scheduler,
-    start_snelstart_sync,
-    stop_snelstart_sync,
-    SyncResult
-)
-from .cursor_prompt_generator import (
-    CursorPromptGenerator,
-    get_cursor_prompt_generator
-)
\ No newline at end of file
+"""
+Business logic services.
+
+De exports worden pas bij het eerste gebruik geïmporteerd (module
+`__getattr__`), zodat het importeren van één service niet alle services
+en hun zware dependencies (openai, watchdog, ...) meeneemt.
+"""
+
+import importlib
+
+# module: geëxporteerde namen
+_EXPORTS = {
+    ".email_service": ("EmailService",),
+    ".lead_service": ("LeadService",),
+    ".webhook_service": (
+        "WebhookServer",
+        "WebsitePoller",
+        "start_webhook_server",
+        "poll_website_forms",
+    ),
+    ".sync_service": (
+        "EmailSyncScheduler",
+        "get_sync_scheduler",
+        "start_background_sync",
+        "stop_background_sync",
+    ),
+    ".payment_sync_service": (
+        "PaymentSyncService",
+        "get_payment_sync_service",
+        "PaymentSyncScheduler",
+        "get_payment_sync_scheduler",
+        "start_payment_sync",
+        "stop_payment_sync",
+    ),
+    ".monitor_service": (
+        "MonitorService",
+        "get_monitor_service",
+        "start_monitoring",
+        "stop_monitoring",
+    ),
+    ".ai_troubleshooter": ("AITroubleshooter", "get_troubleshooter"),
+    ".similarity_index": ("SimilarityIndex", "get_similarity_index"),
+    ".remediation_runner": ("RemediationRunner", "RemediationJob", "get_remediation_runner"),
+    ".report_service": ("ReportService", "get_report_service"),
+    ".project_discovery": (
+        "ProjectDiscoveryService",
+        "get_discovery_service",
+        "start_project_discovery",
+        "stop_project_discovery",
+    ),
+    ".support_service": (
+        "SupportService",
+        "get_support_service",
+        "start_support_sync",
+        "stop_support_sync",
+    ),
+    ".work_order_service": (
+        "WorkOrderSyncService",
+        "get_work_order_sync_service",
+        "start_work_order_sync",
+        "stop_work_order_sync",
+    ),
+    ".sync_cursor": ("SyncCursorStore", "get_sync_cursor_store"),
+    ".invoice_numbering": ("InvoiceNumberAllocator", "get_invoice_number_allocator"),
+    ".orchestrator": ("SyncOrchestrator", "Job", "get_orchestrator"),
+    ".telemetry": ("Telemetry", "get_telemetry"),
+    ".http_client": (
+        "HttpClient",
+        "CircuitOpenError",
+        "RateLimiter",
+        "get_http_client",
+    ),
+    ".website_api": (
+        "WebsiteAPI",
+        "get_website_api",
+        "APIStatus",
+        "APIHealth",
+        "APIError",
+    ),
+    ".snelstart_api": (
+        "SnelstartAPI",
+        "get_snelstart_api",
+        "SnelstartStatus",
+        "SnelstartHealth",
+        "SnelstartPagingError",
+    ),
+    ".sync_outbox": ("OutboxStore", "OutboxChange", "get_outbox_store"),
+    ".snelstart_reference": ("ReferenceDataCache", "get_reference_cache"),
+    ".snelstart_relaties": ("RelatieIndex", "get_relatie_index"),
+    ".snelstart_sync_service": (
+        "SnelstartSyncService",
+        "get_snelstart_sync_service",
+        "SnelstartSyncScheduler",
+        "get_snelstart_scheduler",
+        "start_snelstart_sync",
+        "stop_snelstart_sync",
+        "SyncResult",
+    ),
+    ".cursor_prompt_generator": ("CursorPromptGenerator", "get_cursor_prompt_generator"),
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -6,11 +6,9 @@ Bevat self-learning capabilities.
 
 import os
 import json
-import subprocess
 import re
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
-from openai import OpenAI
 
 from ..database import get_db
 from ..database.models import (
@@ -18,6 +16,9 @@ from ..database.models import (
     IssueStatus, IssueSeverity
 )
 from ..utils.config import Config, logger
+from ..utils.log_reader import tail_with_rotation, LogFollower
+from .similarity_index import get_similarity_index
+from .remediation_runner import get_remediation_runner, RemediationJob, RemediationStatus
 
 
 class AITroubleshooter:
@@ -30,10 +31,21 @@ class AITroubleshooter:
         self.model = "gpt-4o"  # Best for code analysis
         
         if self.api_key:
+            from openai import OpenAI  # lazy: zware import, alleen nodig met API key
             self.client = OpenAI(api_key=self.api_key)
         else:
             logger.warning("No OpenAI API key configured - AI troubleshooting disabled")
         
+        # Per-command timeouts (seconds) voor remediation commando's
+        self.command_timeouts = {
+            "restart_service": 120,
+            "redeploy": 900,  # npm run build kan lang duren
+            "ai_suggested": 300,
+        }
+        
+        # Follow state per logbestand (alleen nieuwe bytes lezen bij herhaalde analyses)
+        self._log_followers: Dict[str, LogFollower] = {}
+        
         # Known fix patterns (hardcoded common fixes)
         self.known_fixes = {
             "timeout": [
@@ -57,13 +69,24 @@ class AITroubleshooter:
             ]
         }
     
-    def analyze_and_fix(self, issue_id: int, auto_fix: bool = True) -> Dict[str, Any]:
+    def analyze_and_fix(
+        self, 
+        issue_id: int, 
+        auto_fix: bool = True, 
+        wait: bool = False
+    ) -> Dict[str, Any]:
         """
         Analyseer een issue en probeer automatisch te fixen.
         
+        Commando-fixes (restart, redeploy) draaien asynchroon via de
+        RemediationRunner; het resultaat bevat dan "pending": True en de
+        issue wordt afgerond zodra het commando klaar is.
+        
         Args:
             issue_id: ID van de MonitorIssue
             auto_fix: Of automatisch fixes toegepast mogen worden
+            wait: Wacht tot een lopende remediation klaar is (alleen vanuit
+                  achtergrond threads gebruiken)
             
         Returns:
             Dict met analyse resultaat en eventuele fix acties
@@ -75,6 +98,7 @@ class AITroubleshooter:
             "analysis": None,
             "suggested_fixes": [],
             "fixes_applied": [],
+            "similar": [],
             "success": False
         }
         
@@ -95,10 +119,19 @@ class AITroubleshooter:
             if known_solution:
                 result["suggested_fixes"].append(known_solution)
             
-            # 2. AI Analysis
+            # 2. Similar resolved issues/tickets (cheap context)
+            try:
+                result["similar"] = get_similarity_index().search(
+                    f"{issue.title}\n{issue.error_message or ''}",
+                    exclude=f"issue:{issue.id}"
+                )
+            except Exception as e:
+                logger.warning(f"Similarity lookup failed: {e}")
+            
+            # 3. AI Analysis
             if self.client:
                 try:
-                    analysis = self._ai_analyze(issue, project)
+                    analysis = self._ai_analyze(issue, project, result["similar"])
                     result["analyzed"] = True
                     result["analysis"] = analysis.get("analysis")
                     
@@ -118,7 +151,7 @@ class AITroubleshooter:
                     logger.error(f"AI analysis error: {e}")
                     result["ai_error"] = str(e)
             
-            # 3. Auto-fix if enabled and we have suggestions
+            # 4. Auto-fix if enabled and we have suggestions
             if auto_fix and result["suggested_fixes"]:
                 issue.status = IssueStatus.FIXING.value
                 session.commit()
@@ -128,12 +161,14 @@ class AITroubleshooter:
                         fix_result = self._apply_fix(session, issue, project, fix)
                         result["fixes_applied"].append(fix_result)
                         
+                        if fix_result.get("pending"):
+                            # Remediation draait in de achtergrond; afronding via callback
+                            result["pending"] = True
+                            result["job"] = fix_result.pop("job")
+                            break
+                        
                         if fix_result.get("success"):
-                            issue.status = IssueStatus.RESOLVED.value
-                            issue.resolved_by = "ai_auto"
-                            issue.resolved_at = datetime.now()
-                            issue.resolution = fix_result.get("description")
-                            project.issues_resolved_auto += 1
+                            self._mark_resolved(issue, project, fix_result)
                             result["success"] = True
                             
                             # Learn from success
@@ -144,14 +179,54 @@ class AITroubleshooter:
                             self._learn_from_fix(session, issue, fix, success=False)
             
             # If no auto-fix applied, keep investigating
-            if not result["success"]:
+            if not result["success"] and not result.get("pending"):
                 issue.status = IssueStatus.OPEN.value
             
             session.commit()
         
+        if wait and result.get("pending"):
+            job: RemediationJob = result["job"]
+            job.wait()
+            result["success"] = job.success
+            result["fixes_applied"][-1]["success"] = job.success
+            result["fixes_applied"][-1]["output"] = job.output_text(5000)
+        
+        result.pop("job", None)
         return result
     
-    def _ai_analyze(self, issue: MonitorIssue, project: MonitoredProject) -> Dict[str, Any]:
+    def _mark_resolved(self, issue: MonitorIssue, project: MonitoredProject, fix_result: Dict):
+        """Markeer een issue als automatisch opgelost."""
+        issue.status = IssueStatus.RESOLVED.value
+        issue.resolved_by = "ai_auto"
+        issue.resolved_at = datetime.now()
+        issue.resolution = fix_result.get("description")
+        project.issues_resolved_auto += 1
+    
+    def _on_remediation_complete(self, job: RemediationJob, issue_id: int, fix: Dict):
+        """Rond een issue af nadat een asynchrone remediation klaar is."""
+        db = get_db()
+        
+        with db.session() as session:
+            issue = session.query(MonitorIssue).get(issue_id)
+            if not issue:
+                return
+            
+            if job.success:
+                self._mark_resolved(issue, issue.project, fix)
+            elif issue.status == IssueStatus.FIXING.value:
+                issue.status = IssueStatus.OPEN.value
+            
+            if job.status != RemediationStatus.CANCELLED:
+                self._learn_from_fix(session, issue, fix, success=job.success)
+            
+            session.commit()
+    
+    def _ai_analyze(
+        self, 
+        issue: MonitorIssue, 
+        project: MonitoredProject,
+        similar: List[Dict] = None
+    ) -> Dict[str, Any]:
         """Gebruik AI om het probleem te analyseren."""
         
         # Build context
@@ -174,6 +249,9 @@ Project Config:
 - Deploy Command: {project.deploy_command or 'N/A'}
 """
         
+        if similar:
+            context += "\n" + get_similarity_index().format_context(similar) + "\n"
+        
         messages = [
             {
                 "role": "system",
@@ -262,7 +340,12 @@ Antwoord in JSON format:
         project: MonitoredProject,
         fix: Dict
     ) -> Dict[str, Any]:
-        """Pas een fix toe."""
+        """
+        Pas een fix toe.
+        
+        Shell commando's worden niet hier uitgevoerd maar aan de
+        RemediationRunner gegeven; het resultaat is dan "pending".
+        """
         result = {
             "action": fix.get("action"),
             "description": fix.get("description"),
@@ -270,31 +353,25 @@ Antwoord in JSON format:
         }
         
         action = fix.get("action", "")
+        command = None
         
         try:
             if action == "restart_service" and project.restart_command:
-                # Execute restart command
-                output = self._execute_command(project.restart_command, project.local_path)
-                result["success"] = output.get("success", False)
-                result["output"] = output.get("output")
+                command = project.restart_command
                 
             elif action == "check_logs" and project.local_path:
                 # Get recent logs
                 log_path = os.path.join(project.local_path, "logs")
                 if os.path.exists(log_path):
-                    result["output"] = self._get_recent_logs(log_path)
+                    result["output"] = self._get_recent_logs(log_path, follow=True)
                     result["success"] = True
                     
             elif action == "redeploy" and project.deploy_command:
-                output = self._execute_command(project.deploy_command, project.local_path)
-                result["success"] = output.get("success", False)
-                result["output"] = output.get("output")
+                command = project.deploy_command
                 
             elif fix.get("fix_command"):
                 # AI-suggested command
-                output = self._execute_command(fix["fix_command"], project.local_path)
-                result["success"] = output.get("success", False)
-                result["output"] = output.get("output")
+                command = fix["fix_command"]
             
             else:
                 result["error"] = "No executable action found"
@@ -303,6 +380,9 @@ Antwoord in JSON format:
             result["error"] = str(e)
             logger.error(f"Fix application error: {e}")
         
+        if command:
+            return self._start_remediation(session, issue, project, fix, command, result)
+        
         # Save solution
         solution = IssueSolution(
             issue_id=issue.id,
@@ -316,56 +396,96 @@ Antwoord in JSON format:
         
         return result
     
-    def _execute_command(self, command: str, working_dir: str = None) -> Dict[str, Any]:
-        """Execute a shell command safely."""
-        result = {
-            "success": False,
-            "output": ""
-        }
+    def _start_remediation(
+        self,
+        session,
+        issue: MonitorIssue,
+        project: MonitoredProject,
+        fix: Dict,
+        command: str,
+        result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Start een commando via de RemediationRunner (niet-blokkerend)."""
+        runner = get_remediation_runner()
         
-        # Safety check - don't execute dangerous commands
-        dangerous = ["rm -rf /", "format", "del /", ":(){:|:&};:"]
-        if any(d in command.lower() for d in dangerous):
-            result["error"] = "Dangerous command blocked"
+        if runner.is_busy(project.id):
+            result["error"] = "Er loopt al een remediation voor dit project"
             return result
         
-        try:
-            process = subprocess.run(
-                command,
-                shell=True,
-                cwd=working_dir,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            result["output"] = process.stdout + process.stderr
-            result["success"] = process.returncode == 0
-            result["return_code"] = process.returncode
-            
-        except subprocess.TimeoutExpired:
-            result["error"] = "Command timed out"
-        except Exception as e:
-            result["error"] = str(e)
+        action = fix.get("action", "")
+        solution = IssueSolution(
+            issue_id=issue.id,
+            action_type=action,
+            action_command=command,
+            action_description=fix.get("description"),
+            status=RemediationStatus.RUNNING,
+            was_successful=False
+        )
+        session.add(solution)
+        # Commit zodat de runner het record vanuit zijn eigen sessie kan bijwerken
+        session.commit()
+        
+        issue_id = issue.id
+        job = runner.submit(
+            project_id=project.id,
+            solution_id=solution.id,
+            command=command,
+            working_dir=project.local_path,
+            timeout=self.command_timeouts.get(action, self.command_timeouts["ai_suggested"]),
+            on_complete=lambda job: self._on_remediation_complete(job, issue_id, fix)
+        )
         
+        if job is None:
+            result["error"] = "Er loopt al een remediation voor dit project"
+            return result
+        
+        result["pending"] = True
+        result["solution_id"] = solution.id
+        result["job"] = job
         return result
     
-    def _get_recent_logs(self, log_path: str, lines: int = 100) -> str:
-        """Get recent log entries."""
+    def _get_recent_logs(
+        self, 
+        log_path: str, 
+        lines: int = 100, 
+        pattern: str = None,
+        follow: bool = False
+    ) -> str:
+        """
+        Get recent log entries.
+        
+        Leest van achteren in blokken (geen volledige bestanden in geheugen),
+        inclusief geroteerde/gzip varianten. Met follow=True worden bij een
+        herhaalde analyse alleen regels gelezen die sinds de vorige keer zijn
+        toegevoegd.
+        """
         logs = []
         
         try:
-            for filename in os.listdir(log_path):
-                if filename.endswith('.log'):
-                    filepath = os.path.join(log_path, filename)
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        # Get last N lines
-                        content = f.readlines()[-lines:]
-                        logs.extend(content)
+            for filename in sorted(os.listdir(log_path)):
+                if not filename.endswith('.log'):
+                    continue
+                
+                filepath = os.path.join(log_path, filename)
+                follower = self._log_followers.get(filepath) if follow else None
+                
+                if follower is not None:
+                    logs.extend(follower.read_new()[-lines:])
+                    continue
+                
+                logs.extend(tail_with_rotation(filepath, lines, pattern))
+                
+                if follow:
+                    follower = LogFollower(filepath, pattern)
+                    follower.seek_end()
+                    self._log_followers[filepath] = follower
         except Exception as e:
             return f"Error reading logs: {e}"
         
-        return "".join(logs[-lines:])
+        if follow and not logs:
+            return "(geen nieuwe logregels sinds vorige analyse)"
+        
+        return "\n".join(logs[-lines:])
     
     def _learn_from_fix(self, session, issue: MonitorIssue, fix: Dict, success: bool):
         """Learn from a fix attempt for future improvements."""
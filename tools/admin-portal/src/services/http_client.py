@@ -0,0 +1,430 @@
+"""
+HTTP Client - Gedeelde HTTP client voor alle website communicatie.
+
+Eén requests.Session met keep-alive connection pool, zodat opeenvolgende
+calls naar dezelfde host de TCP/TLS verbinding hergebruiken. Voegt retries
+met exponential backoff + jitter toe voor 429/5xx en een circuit breaker
+per host, zodat een onbereikbare website niet elke sync cycle alle timeouts
+afwacht.
+"""
+
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, List, Callable
+from urllib.parse import urlsplit, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.config import logger
+from .telemetry import get_telemetry, normalize_endpoint
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Request geweigerd omdat de circuit breaker voor de host open staat."""
+
+
+class CircuitState:
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Circuit breaker voor één host.
+
+    Na `failure_threshold` opeenvolgende mislukte requests gaat de breaker
+    open en worden requests direct geweigerd. Na `reset_timeout` seconden
+    mag er één proef-request door (half open); slaagt die, dan sluit de
+    breaker weer. Een proef die na `reset_timeout` nog steeds geen
+    uitkomst heeft vastgelegd telt niet meer als lopend.
+    """
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: str = CircuitState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    probe_started: float = 0.0
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == CircuitState.OPEN:
+            if now - self.opened_at >= self.reset_timeout:
+                self.state = CircuitState.HALF_OPEN
+                self.probe_started = now
+                return True
+            return False
+
+        # Half open: er loopt al een proef-request, tenzij die is blijven hangen
+        if now - self.probe_started >= self.reset_timeout:
+            self.probe_started = now
+            return True
+        return False
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                logger.warning(f"Circuit breaker opened after {self.failures} failures")
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket.
+
+    `acquire()` blokkeert tot er een token is; zo delen meerdere
+    threads één maximum aantal requests per seconde.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate  # tokens per seconde
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class ConditionalCache:
+    """
+    Kleine on-disk cache met ETag/Last-Modified validators per URL.
+
+    Bij een volgende poll worden `If-None-Match`/`If-Modified-Since`
+    meegestuurd; een 304 betekent dat er niets veranderd is en hoeft dan
+    niet gedownload of geparsed te worden.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 200):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        self._stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
+        self._load()
+
+    @staticmethod
+    def key(method: str, url: str, params: Dict = None) -> str:
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return f"{method.upper()} {url}"
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """Conditional request headers voor een eerder opgeslagen response."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, response: requests.Response):
+        """Bewaar de validators van een 200 response (als de server ze meestuurt)."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        with self._lock:
+            self._stats["misses"] += 1
+            if not etag and not last_modified:
+                if self._entries.pop(key, None) is None:
+                    return
+            else:
+                self._entries.pop(key, None)
+                self._entries[key] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "size": len(response.content),
+                }
+                # Oudste entries eruit (dict houdt insert-volgorde aan)
+                while len(self._entries) > self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+
+        self._save()
+
+    def hit(self, key: str):
+        """Registreer een 304 (bespaarde bytes voor de statistieken)."""
+        with self._lock:
+            entry = self._entries.get(key) or {}
+            self._stats["hits"] += 1
+            self._stats["bytes_saved"] += entry.get("size", 0)
+
+    def forget(self, prefix: str = ""):
+        """Vergeet validators waarvan de key (na de method) met prefix begint."""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if key.split(" ", 1)[1].startswith(prefix)
+            ]
+            for key in keys:
+                del self._entries[key]
+
+        if keys:
+            self._save()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def _load(self):
+        try:
+            self._entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load HTTP cache: {e}")
+
+    def _save(self):
+        with self._lock:
+            data = json.dumps(self._entries)
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(data)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save HTTP cache: {e}")
+
+
+class HttpClient:
+    """
+    Gedeelde, thread-safe HTTP client met connection pooling.
+
+    Listeners krijgen per poging (endpoint, method, status, duration_ms, error)
+    zodat latency per endpoint in de request history terechtkomt.
+    """
+
+    _instance = None
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # Alleen deze methods worden opnieuw geprobeerd na 5xx/verbindingsfouten;
+    # een 429 betekent dat de server niets gedaan heeft en mag altijd opnieuw.
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.max_retries = 3
+        self.backoff_base = 0.5  # seconds
+        self.backoff_max = 30.0  # seconds
+        self.default_timeout = 30
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=0)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._listeners: List[Callable] = []
+
+    # === LISTENERS ===
+
+    def add_listener(self, callback: Callable):
+        """Registreer callback(endpoint, method, status, duration_ms, error)."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def _notify(self, endpoint: str, method: str, status: int, duration_ms: int, error: str = None):
+        for callback in list(self._listeners):
+            try:
+                callback(endpoint, method, status, duration_ms, error)
+            except Exception as e:
+                logger.debug(f"HTTP listener error: {e}")
+
+    # === CIRCUIT BREAKER ===
+
+    def _get_breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker()
+            return breaker
+
+    def get_circuit_states(self) -> Dict[str, str]:
+        """Get circuit breaker state per host."""
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
+
+    # === REQUESTS ===
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Wachttijd voor de volgende poging (Retry-After of exp. backoff met full jitter)."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        endpoint: str = None,
+        retries: int = None,
+        timeout: float = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        Voer een HTTP request uit via de gedeelde session.
+
+        Args:
+            method: HTTP method
+            url: Volledige URL
+            endpoint: Naam/pad voor metrics (default: pad van de URL)
+            retries: Aantal extra pogingen (default: max_retries)
+            timeout: Timeout per poging in seconden
+            **kwargs: Doorgegeven aan requests (params, json, headers, ...)
+
+        Returns:
+            Response van de laatste poging
+
+        Raises:
+            CircuitOpenError: Breaker voor deze host staat open
+            requests.exceptions.RequestException: Verbindingsfout na alle pogingen
+        """
+        method = method.upper()
+        endpoint = endpoint or urlsplit(url).path
+        retries = self.max_retries if retries is None else retries
+        timeout = timeout or self.default_timeout
+        breaker = self._get_breaker(url)
+
+        with self._lock:
+            allowed = breaker.allow()
+        if not allowed:
+            self._notify(endpoint, method, 0, 0, "Circuit open")
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+        # Telemetry per call (inclusief retries), niet per poging
+        series = f"http:{method} {normalize_endpoint(endpoint)}"
+        call_start = time.monotonic()
+
+        # Elke uitgang legt een uitkomst vast, ook een exception buiten
+        # requests om (bv. een listener); anders blijft een proef half open
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                start_time = time.time()
+                response = None
+
+                try:
+                    response = self._session.request(method, url, timeout=timeout, **kwargs)
+                except requests.exceptions.RequestException as e:
+                    duration = int((time.time() - start_time) * 1000)
+                    self._notify(endpoint, method, 0, duration, type(e).__name__)
+
+                    if attempt < retries and method in self.IDEMPOTENT_METHODS:
+                        delay = self._backoff(attempt)
+                        logger.debug(f"{method} {endpoint} failed ({e}), retry in {delay:.1f}s")
+                        time.sleep(delay)
+                        attempt += 1
+                        continue
+
+                    with self._lock:
+                        breaker.record_failure()
+                    settled = True
+                    get_telemetry().record(
+                        series, (time.monotonic() - call_start) * 1000, error=type(e).__name__
+                    )
+                    raise
+
+                duration = int((time.time() - start_time) * 1000)
+                status = response.status_code
+                self._notify(
+                    endpoint, method, status, duration,
+                    None if status < 400 else f"HTTP {status}"
+                )
+
+                retryable = status == 429 or (
+                    status in self.RETRY_STATUSES and method in self.IDEMPOTENT_METHODS
+                )
+                if retryable and attempt < retries:
+                    delay = self._backoff(attempt, response)
+                    logger.debug(f"{method} {endpoint} returned {status}, retry in {delay:.1f}s")
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+                with self._lock:
+                    if status >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                settled = True
+
+                get_telemetry().record(
+                    series,
+                    (time.monotonic() - call_start) * 1000,
+                    size=len(response.content),
+                    error=f"HTTP {status}" if status >= 400 else None
+                )
+                return response
+        finally:
+            if not settled:
+                with self._lock:
+                    breaker.record_failure()
+
+    def close(self):
+        """Sluit alle pooled verbindingen."""
+        self._session.close()
+
+
+# Global instance
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """Get the global HTTP client instance."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
@@ -0,0 +1,169 @@
+"""
+Invoice Numbering - Doorlopende factuurnummers per reeks en jaar.
+
+Factuurnummers (`FAC-2026-0001`) komen uit de `invoice_sequences` tabel.
+Een nummer wordt uitgegeven met één atomische UPDATE op de reeks, binnen
+dezelfde sessie als de factuur zelf. SQLite houdt vanaf die UPDATE de
+write lock vast tot de commit, dus gelijktijdige allocaties (payment sync
+en handmatige invoer) wachten op elkaar en krijgen nooit hetzelfde nummer.
+Rolt de transactie terug, dan rolt ook de teller terug: er ontstaan geen
+gaten in de reeks.
+"""
+
+import re
+from datetime import datetime
+from typing import Optional, List, Tuple
+
+from sqlalchemy import update, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..database import get_db
+from ..database.models import Invoice, InvoiceSequence
+from ..utils.config import logger
+
+
+DEFAULT_SERIES = "FAC"
+NUMBER_WIDTH = 4
+
+_NUMBER_PATTERN = re.compile(r"^([A-Z]+)-(\d{4})-(\d+)$")
+
+
+def format_invoice_number(series: str, year: int, number: int) -> str:
+    """Format een factuurnummer, bv. FAC-2026-0001."""
+    return f"{series}-{year}-{number:0{NUMBER_WIDTH}d}"
+
+
+def parse_invoice_number(invoice_number: str) -> Optional[Tuple[str, int, int]]:
+    """Get (series, year, number) uit een factuurnummer, of None als het geen reeksnummer is."""
+    match = _NUMBER_PATTERN.match((invoice_number or "").strip())
+    if not match:
+        return None
+    return (match.group(1), int(match.group(2)), int(match.group(3)))
+
+
+class InvoiceNumberAllocator:
+    """Geeft factuurnummers uit de `invoice_sequences` tabel uit."""
+
+    def reserve(self, session, count: int = 1, series: str = DEFAULT_SERIES, year: int = None) -> List[str]:
+        """
+        Reserveer `count` opeenvolgende nummers binnen een bestaande sessie.
+
+        De caller moet de facturen in dezelfde sessie aanmaken en committen;
+        bij een rollback komen de nummers weer vrij.
+
+        Returns:
+            Lijst met factuurnummers in oplopende volgorde
+        """
+        if count < 1:
+            return []
+
+        year = year or datetime.now().year
+        self._ensure_sequence(session, series, year)
+
+        session.execute(
+            update(InvoiceSequence)
+            .where(InvoiceSequence.series == series, InvoiceSequence.year == year)
+            .values(
+                last_number=InvoiceSequence.last_number + count,
+                updated_at=datetime.utcnow()
+            )
+        )
+        last_number = session.execute(
+            select(InvoiceSequence.last_number)
+            .where(InvoiceSequence.series == series, InvoiceSequence.year == year)
+        ).scalar_one()
+
+        first_number = last_number - count + 1
+        return [format_invoice_number(series, year, n) for n in range(first_number, last_number + 1)]
+
+    def allocate(self, session, series: str = DEFAULT_SERIES, year: int = None) -> str:
+        """Reserveer één factuurnummer binnen een bestaande sessie."""
+        return self.reserve(session, 1, series, year)[0]
+
+    def observe(self, session, invoice_number: str) -> bool:
+        """
+        Verwerk een handmatig ingevoerd nummer uit een reeks.
+
+        Ligt het hoger dan de teller, dan schuift de teller mee zodat het
+        nummer later niet nog eens uitgegeven wordt.
+
+        Returns:
+            True als het nummer bij een reeks hoort
+        """
+        parsed = parse_invoice_number(invoice_number)
+        if not parsed:
+            return False
+
+        series, year, number = parsed
+        self._ensure_sequence(session, series, year)
+        session.execute(
+            update(InvoiceSequence)
+            .where(
+                InvoiceSequence.series == series,
+                InvoiceSequence.year == year,
+                InvoiceSequence.last_number < number
+            )
+            .values(last_number=number, updated_at=datetime.utcnow())
+        )
+        return True
+
+    def peek(self, series: str = DEFAULT_SERIES, year: int = None) -> str:
+        """Get het volgende nummer zonder het te reserveren (alleen voor weergave)."""
+        year = year or datetime.now().year
+        db = get_db()
+        with db.session() as session:
+            last_number = session.execute(
+                select(InvoiceSequence.last_number)
+                .where(InvoiceSequence.series == series, InvoiceSequence.year == year)
+            ).scalar_one_or_none()
+
+            if last_number is None:
+                last_number = self._highest_existing(session, series, year)
+
+        return format_invoice_number(series, year, last_number + 1)
+
+    # === SEEDING ===
+
+    def _ensure_sequence(self, session, series: str, year: int):
+        """Maak de reeks aan als die nog niet bestaat (startend bij het hoogste bestaande nummer)."""
+        exists = session.execute(
+            select(InvoiceSequence.id)
+            .where(InvoiceSequence.series == series, InvoiceSequence.year == year)
+        ).first()
+        if exists:
+            return
+
+        seed = self._highest_existing(session, series, year)
+        # Een gelijktijdige allocatie kan de reeks net aangemaakt hebben
+        session.execute(
+            sqlite_insert(InvoiceSequence)
+            .values(series=series, year=year, last_number=seed, updated_at=datetime.utcnow())
+            .on_conflict_do_nothing(index_elements=["series", "year"])
+        )
+        logger.info(f"Invoice sequence {series}-{year} started at {seed}")
+
+    def _highest_existing(self, session, series: str, year: int) -> int:
+        """Hoogste nummer dat al in de facturen staat (eenmalig bij een nieuwe reeks)."""
+        prefix = f"{series}-{year}-"
+        numbers = session.execute(
+            select(Invoice.invoice_number).where(Invoice.invoice_number.like(f"{prefix}%"))
+        ).scalars()
+
+        highest = 0
+        for invoice_number in numbers:
+            parsed = parse_invoice_number(invoice_number)
+            if parsed and parsed[:2] == (series, year):
+                highest = max(highest, parsed[2])
+        return highest
+
+
+# Global instance
+_allocator: Optional[InvoiceNumberAllocator] = None
+
+
+def get_invoice_number_allocator() -> InvoiceNumberAllocator:
+    """Get the global invoice number allocator instance."""
+    global _allocator
+    if _allocator is None:
+        _allocator = InvoiceNumberAllocator()
+    return _allocator
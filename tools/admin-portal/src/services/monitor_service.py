@@ -3,7 +3,6 @@ Monitor Service - Background monitoring van alle projecten.
 Voert health checks uit, detecteert issues, en triggert AI troubleshooting.
 """
 
-import threading
 import time
 import ssl
 import socket
@@ -21,6 +20,7 @@ from ..database.models import (
     HealthStatus, IssueSeverity, IssueStatus
 )
 from ..utils.config import Config, logger
+from .orchestrator import get_orchestrator
 
 
 class MonitorService:
@@ -41,7 +41,6 @@ class MonitorService:
         
         self._initialized = True
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         self._check_interval = 60  # Base check interval (seconds)
         self._on_status_change: Optional[callable] = None
         self._on_issue_detected: Optional[callable] = None
@@ -67,33 +66,24 @@ class MonitorService:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self._thread.start()
+        get_orchestrator().add_job(
+            "monitor",
+            self._run_checks,
+            interval=self._check_interval,
+            initial_delay=5
+        )
         logger.info("Monitor service started")
     
     def stop(self):
         """Stop de monitoring."""
         self._running = False
+        get_orchestrator().remove_job("monitor")
         logger.info("Monitor service stopped")
     
     @property
     def is_running(self) -> bool:
         return self._running
     
-    def _monitor_loop(self):
-        """Main monitoring loop."""
-        # Initial delay
-        time.sleep(5)
-        
-        while self._running:
-            try:
-                self._run_checks()
-            except Exception as e:
-                logger.error(f"Monitor loop error: {e}")
-            
-            # Wait before next cycle
-            time.sleep(self._check_interval)
-    
     def _run_checks(self):
         """Run health checks voor alle actieve projecten."""
         db = get_db()
@@ -224,6 +214,9 @@ class MonitorService:
                     IssueSeverity.CRITICAL.value
                 ]:
                     try:
+                        # Troubleshooter werkt in een eigen sessie; issue moet zichtbaar zijn.
+                        # Remediation commando's draaien async, dus dit blokkeert de loop niet.
+                        session.commit()
                         self._ai_troubleshooter.analyze_and_fix(issue.id)
                     except Exception as e:
                         logger.error(f"AI troubleshooter error: {e}")
@@ -0,0 +1,392 @@
+"""
+Sync Orchestrator - Eén scheduler voor alle periodieke achtergrondtaken.
+
+In plaats van een eigen thread per service (die in slices van 5 seconden
+slaapt) houdt één timer thread een heap met de volgende run per job bij.
+Jobs die aan de beurt zijn gaan naar een gedeelde, begrensde executor.
+
+Per job:
+- interval met jitter, zodat jobs niet tegelijk afgaan
+- exponential backoff na een exception
+- mutual exclusion: een job loopt nooit dubbel, en jobs in dezelfde
+  `group` (bv. alles wat naar de website schrijft) wachten op elkaar
+- `run_now()` voor handmatige syncs via hetzelfde pad, en `run_once()`
+  voor handmatige taken zonder eigen schema (met dezelfde exclusie)
+- duur, laatste fout en aantal runs voor weergave in de GUI
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, List, Callable, Any
+
+from ..utils.config import logger
+from .telemetry import get_telemetry, count_items, result_error
+
+
+# Mutual exclusion groep voor jobs die via de website API syncen en
+# daarna formulieren/facturen/tickets wegschrijven
+WEBSITE_GROUP = "website"
+
+# Mutual exclusion groep voor pushes naar Snelstart
+SNELSTART_GROUP = "snelstart"
+
+
+@dataclass
+class Job:
+    """Een periodieke taak in de orchestrator."""
+    name: str
+    func: Callable[[], Any]
+    interval: float  # seconds
+    initial_delay: float = 0.0
+    jitter: float = 0.1  # fractie van het interval
+    max_backoff: float = 3600.0  # seconds
+    group: Optional[str] = None  # jobs in dezelfde groep lopen nooit tegelijk
+    once: bool = False  # eenmalige run_once() job, verdwijnt na de run
+
+    # Runtime state
+    enabled: bool = True
+    next_run: float = 0.0
+    running: bool = False
+    failures: int = 0
+    run_count: int = 0
+    last_run: Optional[datetime] = None
+    last_duration_ms: int = 0
+    total_duration_ms: int = 0
+    last_error: Optional[str] = None
+    pending: List[Future] = field(default_factory=list)  # wachtende run_now() callers
+
+
+class SyncOrchestrator:
+    """
+    Heap-gebaseerde scheduler met een gedeelde thread pool.
+
+    Eén timer thread wacht tot de eerstvolgende job aan de beurt is; de job
+    zelf draait in de executor zodat een trage sync de rest niet ophoudt.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, max_workers: int = 3):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.max_workers = max_workers
+        self._jobs: Dict[str, Job] = {}
+        self._heap: List[tuple] = []  # (next_run, seq, name)
+        self._seq = itertools.count()
+        self._busy_groups: set = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # === JOBS ===
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval: float,
+        initial_delay: float = 0.0,
+        jitter: float = 0.1,
+        max_backoff: float = 3600.0,
+        group: str = None
+    ) -> Job:
+        """
+        Registreer (of vervang) een periodieke job en start de timer thread.
+
+        Args:
+            name: Unieke naam (ook gebruikt voor run_now en statistieken)
+            func: Functie zonder argumenten; een exception telt als mislukt
+            interval: Seconden tussen twee runs
+            initial_delay: Seconden tot de eerste run
+            jitter: Willekeurige extra wachttijd als fractie van het interval
+            max_backoff: Maximale wachttijd na herhaalde fouten
+            group: Mutual exclusion groep
+        """
+        with self._lock:
+            # Een uitgeschakelde job die nog loopt wordt hergebruikt, zodat
+            # die niet dubbel kan draaien
+            job = self._jobs.get(name)
+            if job is None:
+                job = Job(name=name, func=func, interval=interval)
+                self._jobs[name] = job
+
+            job.enabled = True
+            job.once = False
+            job.func = func
+            job.interval = interval
+            job.initial_delay = initial_delay
+            job.jitter = jitter
+            job.max_backoff = max(max_backoff, interval)
+            job.group = group
+            self._schedule(job, initial_delay + self._jitter(job))
+
+        self._ensure_started()
+        logger.info(f"Scheduled job '{name}' every {int(interval)}s")
+        return job
+
+    def remove_job(self, name: str):
+        """Verwijder een job; een lopende run wordt afgemaakt."""
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None:
+                return
+
+            job.enabled = False
+            if not job.running:
+                del self._jobs[name]
+
+            waiters, job.pending = job.pending, []
+
+        for future in waiters:
+            future.set_exception(KeyError(f"Job removed: {name}"))
+
+    def has_job(self, name: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(name)
+            return job is not None and job.enabled
+
+    def set_interval(self, name: str, interval: float):
+        """Pas het interval aan; de volgende run wordt opnieuw ingepland."""
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None or not job.enabled:
+                return
+            job.interval = interval
+            job.max_backoff = max(job.max_backoff, interval)
+            if not job.running:
+                self._schedule(job, interval + self._jitter(job))
+
+    def run_now(self, name: str) -> Future:
+        """
+        Voer een job direct uit (buiten het schema om).
+
+        Loopt de job al, dan krijgt de caller het resultaat van een run die
+        direct daarna start. De periodieke run schuift mee.
+
+        Returns:
+            Future met de return waarde van de job functie
+        """
+        future: Future = Future()
+
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None or not job.enabled:
+                future.set_exception(KeyError(f"Unknown job: {name}"))
+                return future
+
+            job.pending.append(future)
+            if not job.running:
+                self._schedule(job, 0)
+
+        return future
+
+    def run_once(self, name: str, func: Callable[[], Any], group: str = None) -> Future:
+        """
+        Voer een taak eenmalig uit met dezelfde exclusie als geplande jobs.
+
+        Bestaat er al een job met deze naam, dan is dit `run_now(name)` (en
+        wordt `func` niet gebruikt). Anders loopt `func` zodra de groep vrij
+        is; net als bij `run_now()` delen aanroepen met dezelfde naam een
+        run die nog niet gestart is.
+
+        Returns:
+            Future met de return waarde van `func`
+        """
+        future: Future = Future()
+
+        with self._lock:
+            job = self._jobs.get(name)
+            if job is None or not job.enabled:
+                job = self._jobs[name] = Job(
+                    name=name, func=func, interval=0, jitter=0, group=group, once=True
+                )
+            job.pending.append(future)
+            if not job.running:
+                self._schedule(job, 0)
+
+        self._ensure_started()
+        return future
+
+    # === SCHEDULING ===
+
+    def _jitter(self, job: Job) -> float:
+        return random.uniform(0, job.interval * job.jitter) if job.jitter else 0.0
+
+    def _schedule(self, job: Job, delay: float):
+        """Plan de volgende run (lock moet vastgehouden worden)."""
+        job.next_run = time.monotonic() + max(0.0, delay)
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job.name))
+        self._wakeup.notify()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="sync"
+                )
+
+        self._thread = threading.Thread(target=self._timer_loop, daemon=True)
+        self._thread.start()
+
+    def _timer_loop(self):
+        """Wacht tot de eerstvolgende job aan de beurt is en dispatch die."""
+        with self._lock:
+            while self._running:
+                if not self._heap:
+                    self._wakeup.wait()
+                    continue
+
+                next_run, _, name = self._heap[0]
+                delay = next_run - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+
+                heapq.heappop(self._heap)
+                job = self._jobs.get(name)
+
+                # Verouderde heap entry (job verwijderd of opnieuw ingepland)
+                if job is None or not job.enabled or job.next_run != next_run or job.running:
+                    continue
+
+                if job.group and job.group in self._busy_groups:
+                    # Groep bezet: opnieuw proberen zodra die vrijkomt
+                    job.next_run = float("inf")
+                    continue
+
+                job.running = True
+                if job.group:
+                    self._busy_groups.add(job.group)
+                self._executor.submit(self._execute, job)
+
+    def _execute(self, job: Job):
+        """Draai een job in de executor en plan de volgende run."""
+        with self._lock:
+            waiters, job.pending = job.pending, []
+
+        start_time = time.monotonic()
+        result = None
+        error: Optional[Exception] = None
+
+        try:
+            result = job.func()
+        except Exception as e:
+            error = e
+            logger.error(f"Job '{job.name}' failed: {e}")
+
+        duration = int((time.monotonic() - start_time) * 1000)
+        get_telemetry().record(
+            f"job:{job.name}",
+            duration,
+            items=count_items(result),
+            error=str(error) or type(error).__name__ if error else result_error(result)
+        )
+
+        with self._lock:
+            job.running = False
+            job.run_count += 1
+            job.last_run = datetime.now()
+            job.last_duration_ms = duration
+            job.total_duration_ms += duration
+
+            if error is None:
+                job.failures = 0
+                job.last_error = None
+                delay = job.interval
+            else:
+                job.failures += 1
+                job.last_error = str(error)
+                delay = min(job.interval * (2 ** min(job.failures, 10)), job.max_backoff)
+
+            if job.group:
+                self._busy_groups.discard(job.group)
+                self._release_group(job.group)
+
+            if job.enabled and (job.pending or not job.once):
+                # Tijdens de run aangevraagde run_now() direct uitvoeren
+                self._schedule(job, 0 if job.pending else delay + self._jitter(job))
+            elif self._jobs.get(job.name) is job:
+                del self._jobs[job.name]
+
+        for future in waiters:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _release_group(self, group: str):
+        """Plan jobs in die op een bezette groep wachtten (lock moet vastgehouden worden)."""
+        for job in self._jobs.values():
+            if job.enabled and job.group == group and job.next_run == float("inf"):
+                self._schedule(job, 0)
+
+    # === STATUS ===
+
+    def get_job_stats(self) -> List[Dict[str, Any]]:
+        """Get status en latency per job (voor de GUI)."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": job.name,
+                    "group": job.group,
+                    "interval": job.interval,
+                    "running": job.running,
+                    "run_count": job.run_count,
+                    "failures": job.failures,
+                    "last_run": job.last_run,
+                    "last_duration_ms": job.last_duration_ms,
+                    "avg_duration_ms": job.total_duration_ms // job.run_count if job.run_count else 0,
+                    "last_error": job.last_error,
+                    "next_run_in": max(0, int(job.next_run - now)) if job.next_run != float("inf") else None,
+                }
+                for job in self._jobs.values()
+                if job.enabled
+            ]
+
+    def get_job(self, name: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(name)
+
+    def shutdown(self, wait: bool = False):
+        """Stop de timer thread en de executor."""
+        with self._lock:
+            self._running = False
+            self._jobs.clear()
+            self._heap.clear()
+            self._wakeup.notify()
+            executor, self._executor = self._executor, None
+
+        if executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instance
+_orchestrator: Optional[SyncOrchestrator] = None
+
+
+def get_orchestrator() -> SyncOrchestrator:
+    """Get the global sync orchestrator instance."""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = SyncOrchestrator()
+    return _orchestrator
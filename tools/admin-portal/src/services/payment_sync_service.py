@@ -3,45 +3,29 @@ Payment Sync Service - Synchroniseert betalingen van website naar Admin Portal.
 Haalt betalingen op via de website API en maakt automatisch facturen aan.
 """
 
-import requests
-import threading
-import time
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Callable
 
 from ..database import get_db
 from ..database.models import Invoice, InvoiceStatus, InvoiceType, Client
 from ..utils.config import Config, logger
+from .website_api import get_website_api
+from .sync_cursor import get_sync_cursor_store, sort_by_position
+from .invoice_numbering import get_invoice_number_allocator
+from .orchestrator import get_orchestrator, WEBSITE_GROUP
 
 
 class PaymentSyncService:
     """Service voor synchroniseren van website betalingen naar facturen."""
     
     def __init__(self):
-        self.api_url = Config.WEBSITE_API_URL
-        self.api_key = Config.WEBSITE_ADMIN_API_KEY
+        self.api = get_website_api()
+        self.cursors = get_sync_cursor_store()
+        self.numbers = get_invoice_number_allocator()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
-        """Make authenticated API request to website."""
-        url = f"{self.api_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=30,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            return None
+        """Make authenticated API request to website (shared pooled client)."""
+        return self.api.call(method, endpoint, **kwargs)
     
     def fetch_unsynced_payments(self) -> List[Dict]:
         """
@@ -50,19 +34,73 @@ class PaymentSyncService:
         Returns:
             List van payment dictionaries
         """
-        result = self._make_request("GET", "/admin/payments?unsynced=true")
+        params = {"unsynced": "true"}
+        since = self.cursors.since("payments")
+        if since:
+            params["since"] = since
+        
+        result = self._make_request("GET", "/admin/payments", params=params, conditional=True)
         
         if result and result.get("success"):
             return result.get("payments", [])
         
         return []
     
-    def create_invoice_from_payment(self, payment: Dict) -> Optional[Invoice]:
+    def _build_invoice(self, payment: Dict, invoice_number: str, client_id: Optional[int]) -> Invoice:
+        """Maak (nog niet opgeslagen) Invoice object voor een betaling."""
+        # Bepaal bedrijfsnaam
+        company_name = payment.get("companyName") or payment.get("customerName", "Onbekend")
+        
+        # Bepaal omschrijving
+        parts = []
+        if payment.get("packageName"):
+            parts.append(payment["packageName"])
+        if payment.get("paymentType") == "deposit":
+            parts.append("Aanbetaling")
+        elif payment.get("paymentType") == "final":
+            parts.append("Eindbetaling")
+        elif payment.get("paymentType") == "subscription":
+            parts.append("Abonnement")
+            if payment.get("maintenancePlanName"):
+                parts.append(payment["maintenancePlanName"])
+        
+        description = " - ".join(parts) if parts else payment.get("description", "Website betaling")
+        
+        # Bereken BTW (21%)
+        amount_incl = payment.get("amount", 0)
+        vat_percentage = 21.0
+        amount_excl = round(amount_incl / (1 + vat_percentage / 100), 2)
+        vat_amount = round(amount_incl - amount_excl, 2)
+        
+        paid_at = datetime.fromisoformat(payment.get("paidAt", datetime.now().isoformat()).replace("Z", "+00:00"))
+        
+        return Invoice(
+            invoice_type=InvoiceType.OUTGOING.value,
+            status=InvoiceStatus.PAID.value,
+            invoice_number=invoice_number,
+            reference=payment.get("stripePaymentId"),
+            client_id=client_id,
+            company_name=company_name,
+            description=description,
+            amount_excl_vat=amount_excl,
+            vat_percentage=vat_percentage,
+            vat_amount=vat_amount,
+            amount_incl_vat=amount_incl,
+            invoice_date=paid_at,
+            paid_date=paid_at,
+            notes=f"Automatisch geïmporteerd van website\n"
+                  f"Klant: {payment.get('customerName')}\n"
+                  f"Email: {payment.get('customerEmail')}\n"
+                  f"Stripe ID: {payment.get('stripePaymentId')}",
+        )
+    
+    def create_invoice_from_payment(self, payment: Dict, advance_cursor: bool = False) -> Optional[Invoice]:
         """
         Maak een factuur aan vanuit een betaling.
         
         Args:
             payment: Payment dict van de website API
+            advance_cursor: Payments sync cursor in dezelfde transactie bijwerken
             
         Returns:
             Created Invoice object of None bij fout
@@ -71,46 +109,20 @@ class PaymentSyncService:
         
         try:
             with db.session() as session:
-                # Bepaal factuurnummer (jaar-volgnummer)
-                year = datetime.now().year
-                last_invoice = session.query(Invoice).filter(
-                    Invoice.invoice_number.like(f"FAC-{year}-%")
-                ).order_by(Invoice.id.desc()).first()
-                
-                if last_invoice:
-                    try:
-                        last_num = int(last_invoice.invoice_number.split("-")[-1])
-                        next_num = last_num + 1
-                    except ValueError:
-                        next_num = 1
-                else:
-                    next_num = 1
-                
-                invoice_number = f"FAC-{year}-{next_num:04d}"
-                
-                # Bepaal bedrijfsnaam
-                company_name = payment.get("companyName") or payment.get("customerName", "Onbekend")
-                
-                # Bepaal omschrijving
-                parts = []
-                if payment.get("packageName"):
-                    parts.append(payment["packageName"])
-                if payment.get("paymentType") == "deposit":
-                    parts.append("Aanbetaling")
-                elif payment.get("paymentType") == "final":
-                    parts.append("Eindbetaling")
-                elif payment.get("paymentType") == "subscription":
-                    parts.append("Abonnement")
-                    if payment.get("maintenancePlanName"):
-                        parts.append(payment["maintenancePlanName"])
-                
-                description = " - ".join(parts) if parts else payment.get("description", "Website betaling")
-                
-                # Bereken BTW (21%)
-                amount_incl = payment.get("amount", 0)
-                vat_percentage = 21.0
-                amount_excl = round(amount_incl / (1 + vat_percentage / 100), 2)
-                vat_amount = round(amount_incl - amount_excl, 2)
+                # Betaling al eerder geïmporteerd (bv. opnieuw geleverd na cursor reset)
+                stripe_id = payment.get("stripePaymentId")
+                if stripe_id:
+                    existing = session.query(Invoice).filter(
+                        Invoice.reference == stripe_id
+                    ).first()
+                    
+                    if existing:
+                        if advance_cursor:
+                            self.cursors.advance_to_item(session, "payments", payment)
+                            session.commit()
+                            session.refresh(existing)
+                        session.expunge(existing)
+                        return existing
                 
                 # Probeer klant te vinden
                 client = None
@@ -120,37 +132,103 @@ class PaymentSyncService:
                         Client.email == customer_email
                     ).first()
                 
-                # Maak factuur aan
-                invoice = Invoice(
-                    invoice_type=InvoiceType.OUTGOING.value,
-                    status=InvoiceStatus.PAID.value,
-                    invoice_number=invoice_number,
-                    reference=payment.get("stripePaymentId"),
-                    client_id=client.id if client else None,
-                    company_name=company_name,
-                    description=description,
-                    amount_excl_vat=amount_excl,
-                    vat_percentage=vat_percentage,
-                    vat_amount=vat_amount,
-                    amount_incl_vat=amount_incl,
-                    invoice_date=datetime.fromisoformat(payment.get("paidAt", datetime.now().isoformat()).replace("Z", "+00:00")),
-                    paid_date=datetime.fromisoformat(payment.get("paidAt", datetime.now().isoformat()).replace("Z", "+00:00")),
-                    notes=f"Automatisch geïmporteerd van website\n"
-                          f"Klant: {payment.get('customerName')}\n"
-                          f"Email: {customer_email}\n"
-                          f"Stripe ID: {payment.get('stripePaymentId')}",
-                )
-                
+                # Volgnummer uit de reeks; rolt mee terug als de factuur niet opgeslagen wordt
+                invoice_number = self.numbers.allocate(session)
+                invoice = self._build_invoice(payment, invoice_number, client.id if client else None)
                 session.add(invoice)
+                if advance_cursor:
+                    self.cursors.advance_to_item(session, "payments", payment)
                 session.commit()
                 
-                logger.info(f"Created invoice {invoice_number} from payment {payment.get('stripePaymentId')}")
+                # Losmaken van de sessie zodat invoice.id bruikbaar blijft voor de caller
+                session.refresh(invoice)
+                session.expunge(invoice)
+                
+                logger.info(f"Created invoice {invoice.invoice_number} from payment {payment.get('stripePaymentId')}")
                 return invoice
                 
         except Exception as e:
             logger.error(f"Failed to create invoice from payment: {e}")
             return None
     
+    def create_invoices_from_payments(self, payments: List[Dict]) -> Dict[str, Invoice]:
+        """
+        Maak facturen voor een batch betalingen in één transactie.
+        
+        Bestaande facturen worden met één IN query op Stripe ID gevonden en
+        voor de nieuwe betalingen wordt in één keer een blok opeenvolgende
+        nummers gereserveerd. De payments cursor schuift in dezelfde commit mee.
+        
+        Args:
+            payments: Payment dicts van de website API
+            
+        Returns:
+            Dict van payment id -> Invoice (losgemaakt van de sessie)
+            
+        Raises:
+            Exception: Bij een database fout; er is dan niets opgeslagen
+        """
+        db = get_db()
+        
+        with db.session() as session:
+            stripe_ids = [p.get("stripePaymentId") for p in payments if p.get("stripePaymentId")]
+            existing = {}
+            if stripe_ids:
+                existing = {
+                    invoice.reference: invoice
+                    for invoice in session.query(Invoice).filter(Invoice.reference.in_(stripe_ids))
+                }
+            
+            emails = {p.get("customerEmail") for p in payments if p.get("customerEmail")}
+            client_ids = {}
+            if emails:
+                client_ids = {
+                    email: client_id
+                    for client_id, email in session.query(Client.id, Client.email).filter(Client.email.in_(emails))
+                }
+            
+            # Dezelfde betaling kan twee keer in een batch zitten
+            new_payments = []
+            seen = set(existing)
+            for payment in payments:
+                stripe_id = payment.get("stripePaymentId")
+                if stripe_id and stripe_id in seen:
+                    continue
+                if stripe_id:
+                    seen.add(stripe_id)
+                new_payments.append(payment)
+            
+            numbers = self.numbers.reserve(session, len(new_payments))
+            created = []
+            for payment, invoice_number in zip(new_payments, numbers):
+                invoice = self._build_invoice(
+                    payment, invoice_number, client_ids.get(payment.get("customerEmail"))
+                )
+                created.append((payment, invoice))
+            
+            session.add_all([invoice for _, invoice in created])
+            self.cursors.advance_to_items(session, "payments", payments)
+            session.commit()
+            
+            # Losmaken van de sessie zodat invoice.id bruikbaar blijft voor de caller
+            by_reference = dict(existing)
+            for payment, invoice in created:
+                if invoice.reference:
+                    by_reference[invoice.reference] = invoice
+            for invoice in [*existing.values(), *(invoice for _, invoice in created)]:
+                session.refresh(invoice)
+                session.expunge(invoice)
+            
+            result = {payment.get("id"): invoice for payment, invoice in created}
+            for payment in payments:
+                invoice = by_reference.get(payment.get("stripePaymentId"))
+                if invoice is not None:
+                    result.setdefault(payment.get("id"), invoice)
+        
+        if numbers:
+            logger.info(f"Created invoices {numbers[0]}..{numbers[-1]} from {len(numbers)} payments")
+        return result
+    
     def sync_payments(self) -> Tuple[int, int, List[str]]:
         """
         Synchroniseer alle nieuwe betalingen van de website.
@@ -172,20 +250,42 @@ class PaymentSyncService:
         synced_payment_ids = []
         invoice_mapping = {}
         
+        # Bulk import: één transactie met een blok gereserveerde nummers
+        if len(payments) > 1:
+            try:
+                invoices = self.create_invoices_from_payments(payments)
+            except Exception as e:
+                logger.warning(f"Batch invoice import failed, falling back to one by one: {e}")
+            else:
+                synced_payment_ids = list(invoices)
+                invoice_mapping = {pid: invoice.id for pid, invoice in invoices.items()}
+                synced = len(synced_payment_ids)
+                payments = []
+        
+        # Cursor gaat alleen vooruit zolang er geen betaling mislukt is; de
+        # website levert nieuwste eerst, dus oplopend verwerken
+        advance_cursor = True
+        payments = sort_by_position(payments)
+        
         for payment in payments:
             payment_id = payment.get("id")
             stripe_id = payment.get("stripePaymentId")
             
-            invoice = self.create_invoice_from_payment(payment)
+            invoice = self.create_invoice_from_payment(payment, advance_cursor=advance_cursor)
             
             if invoice:
                 synced += 1
                 synced_payment_ids.append(payment_id)
                 invoice_mapping[payment_id] = invoice.id
             else:
+                advance_cursor = False
                 errors += 1
                 error_messages.append(f"Kon factuur niet maken voor betaling {stripe_id}")
         
+        if errors:
+            # Mislukte betalingen bij de volgende poll opnieuw ophalen (geen 304)
+            self.api.forget_cached("/admin/payments")
+        
         # Mark payments as synced on website
         if synced_payment_ids:
             result = self._make_request(
@@ -219,7 +319,9 @@ def get_payment_sync_service() -> PaymentSyncService:
 
 
 class PaymentSyncScheduler:
-    """Background scheduler voor automatische payment synchronisatie."""
+    """Background scheduler voor automatische payment synchronisatie (job in de sync orchestrator)."""
+    
+    JOB_NAME = "payment_sync"
     
     _instance: Optional['PaymentSyncScheduler'] = None
     
@@ -236,7 +338,6 @@ class PaymentSyncScheduler:
         
         self._initialized = True
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         self._interval = Config.PAYMENT_SYNC_INTERVAL * 60  # Convert to seconds
         self._on_new_payments: Optional[Callable[[int], None]] = None
         self._last_sync: Optional[datetime] = None
@@ -245,6 +346,7 @@ class PaymentSyncScheduler:
     def set_interval(self, minutes: int):
         """Set sync interval in minutes."""
         self._interval = minutes * 60
+        get_orchestrator().set_interval(self.JOB_NAME, self._interval)
         logger.info(f"Payment sync interval set to {minutes} minutes")
     
     def set_callback(self, callback: Callable[[int], None]):
@@ -258,13 +360,20 @@ class PaymentSyncScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self._thread.start()
+        # Initial sync after 30 seconds (give app time to start)
+        get_orchestrator().add_job(
+            self.JOB_NAME,
+            self._scheduled_sync,
+            interval=self._interval,
+            initial_delay=30,
+            group=WEBSITE_GROUP
+        )
         logger.info(f"Payment sync scheduler started (interval: {self._interval // 60} min)")
     
     def stop(self):
         """Stop de scheduler."""
         self._running = False
+        get_orchestrator().remove_job(self.JOB_NAME)
         logger.info("Payment sync scheduler stopped")
     
     def sync_now(self) -> Tuple[int, int, List[str]]:
@@ -274,29 +383,20 @@ class PaymentSyncScheduler:
         Returns:
             Tuple van (synced, errors, error_messages)
         """
-        return self._do_sync()
+        # Via de orchestrator, zodat hij niet naast een geplande sync loopt
+        if self._running:
+            return get_orchestrator().run_now(self.JOB_NAME).result()
+        return get_orchestrator().run_once(self.JOB_NAME, self._do_sync, group=WEBSITE_GROUP).result()
     
-    def _sync_loop(self):
-        """Background sync loop."""
-        # Initial sync after 30 seconds (give app time to start)
-        time.sleep(30)
+    def _scheduled_sync(self) -> Tuple[int, int, List[str]]:
+        """Job functie: sync en meld nieuwe betalingen."""
+        result = self._do_sync()
         
-        while self._running:
-            try:
-                synced, errors, _ = self._do_sync()
-                
-                if synced > 0 and self._on_new_payments:
-                    self._on_new_payments(synced)
-                
-            except Exception as e:
-                logger.error(f"Payment sync loop error: {e}")
-            
-            # Wait for next interval
-            # Check every 5 seconds if still running
-            waited = 0
-            while waited < self._interval and self._running:
-                time.sleep(5)
-                waited += 5
+        synced = result[0]
+        if synced > 0 and self._on_new_payments:
+            self._on_new_payments(synced)
+        
+        return result
     
     def _do_sync(self) -> Tuple[int, int, List[str]]:
         """Execute sync."""
@@ -10,17 +10,14 @@ De service scant periodiek voor nieuwe projecten en registreert ze automatisch.
 
 import os
 import json
-import time
-import threading
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pathlib import Path
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileModifiedEvent
 
 from ..database import get_db
 from ..database.models import MonitoredProject, ProjectType
 from ..utils.config import Config, logger
+from .orchestrator import get_orchestrator
 
 
 # Config bestand naam dat in project roots gezocht wordt
@@ -163,12 +160,23 @@ def register_project_from_config(config: Dict[str, Any]) -> Optional[MonitoredPr
         return project
 
 
-class ProjectConfigHandler(FileSystemEventHandler):
-    """Handler voor file system events op project configs."""
+class ProjectConfigHandler:
+    """
+    Handler voor file system events op project configs.
+    
+    Implementeert zelf `dispatch()` (het enige wat de watchdog Observer
+    aanroept), zodat watchdog pas geïmporteerd wordt als de watcher start.
+    """
     
     def __init__(self, on_project_found: callable):
         self.on_project_found = on_project_found
     
+    def dispatch(self, event):
+        if event.event_type == "created":
+            self.on_created(event)
+        elif event.event_type == "modified":
+            self.on_modified(event)
+    
     def on_created(self, event):
         if event.is_directory:
             return
@@ -210,8 +218,7 @@ class ProjectDiscoveryService:
         
         self._initialized = True
         self._running = False
-        self._observer: Optional[Observer] = None
-        self._scan_thread: Optional[threading.Thread] = None
+        self._observer = None  # watchdog Observer, zie _start_watcher
         self._on_project_found: Optional[callable] = None
         
         # Watch directories
@@ -259,15 +266,20 @@ class ProjectDiscoveryService:
         # Start file watcher
         self._start_watcher()
         
-        # Start periodic scan thread
-        self._scan_thread = threading.Thread(target=self._periodic_scan, daemon=True)
-        self._scan_thread.start()
+        # Periodieke scan elke 5 minuten
+        get_orchestrator().add_job(
+            "project_discovery",
+            self._scan_all_directories,
+            interval=300,
+            initial_delay=300
+        )
         
         logger.info(f"Project discovery started. Watching {len(self._watch_dirs)} directories")
     
     def stop(self):
         """Stop de discovery service."""
         self._running = False
+        get_orchestrator().remove_job("project_discovery")
         
         if self._observer:
             self._observer.stop()
@@ -294,14 +306,6 @@ class ProjectDiscoveryService:
         except Exception as e:
             logger.error(f"Failed to start file watcher: {e}")
     
-    def _periodic_scan(self):
-        """Periodieke scan voor nieuwe projecten."""
-        while self._running:
-            time.sleep(300)  # Scan elke 5 minuten
-            
-            if self._running:
-                self._scan_all_directories()
-    
     def _scan_all_directories(self):
         """Scan alle watch directories voor project configs."""
         found = 0
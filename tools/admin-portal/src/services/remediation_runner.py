@@ -0,0 +1,333 @@
+"""
+Remediation Runner - Voert herstel-commando's (restart, redeploy) asynchroon uit.
+
+Commando's draaien in een eigen thread zodat de monitor loop en de GUI niet
+blokkeren. Stdout/stderr worden tijdens het uitvoeren naar het IssueSolution
+record gestreamd. Per project kan maar één remediation tegelijk draaien.
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Dict, List, Callable
+
+from ..database import get_db
+from ..database.models import IssueSolution
+from ..utils.config import logger
+
+
+# Commando's die nooit uitgevoerd mogen worden
+DANGEROUS_COMMANDS = ["rm -rf /", "format", "del /", ":(){:|:&};:"]
+
+
+class RemediationStatus:
+    """Status waarden voor IssueSolution.status."""
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class RemediationJob:
+    """Een lopende of afgeronde remediation."""
+    solution_id: int
+    project_id: int
+    command: str
+    working_dir: Optional[str] = None
+    timeout: int = 300
+    status: str = RemediationStatus.RUNNING
+    return_code: Optional[int] = None
+    error: Optional[str] = None
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    output: List[str] = field(default_factory=list)
+    on_complete: Optional[Callable[["RemediationJob"], None]] = None
+
+    def __post_init__(self):
+        self._done = threading.Event()
+        self._cancel = threading.Event()
+        self._output_lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def success(self) -> bool:
+        return self.status == RemediationStatus.SUCCEEDED
+
+    @property
+    def is_done(self) -> bool:
+        return self._done.is_set()
+
+    def output_text(self, max_chars: int = 100_000) -> str:
+        """Get (het einde van) de output tot nu toe."""
+        with self._output_lock:
+            text = "".join(self.output)
+        return text[-max_chars:]
+
+    def wait(self, timeout: float = None) -> bool:
+        """Wacht tot de job klaar is. Returns True als klaar."""
+        return self._done.wait(timeout)
+
+
+class RemediationRunner:
+    """Asynchrone uitvoerder van remediation commando's."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._active: Dict[int, RemediationJob] = {}  # project_id -> job
+        self._flush_interval = 1.0  # seconds
+        self._kill_grace = 5  # seconds tussen terminate en kill
+
+    # === PUBLIC API ===
+
+    def submit(
+        self,
+        project_id: int,
+        solution_id: int,
+        command: str,
+        working_dir: str = None,
+        timeout: int = 300,
+        on_complete: Callable[[RemediationJob], None] = None
+    ) -> Optional[RemediationJob]:
+        """
+        Start een commando in de achtergrond.
+
+        Args:
+            project_id: Project waarvoor de remediation draait
+            solution_id: IssueSolution record waar output naartoe gestreamd wordt
+            command: Shell commando
+            working_dir: Working directory
+            timeout: Maximale looptijd in seconden
+            on_complete: Callback (in worker thread) als de job klaar is
+
+        Returns:
+            RemediationJob, of None als er al een remediation loopt voor dit project
+        """
+        job = RemediationJob(
+            solution_id=solution_id,
+            project_id=project_id,
+            command=command,
+            working_dir=working_dir,
+            timeout=timeout,
+            on_complete=on_complete
+        )
+
+        with self._lock:
+            if project_id in self._active:
+                logger.warning(f"Remediation already running for project {project_id}")
+                return None
+            self._active[project_id] = job
+
+        if any(d in command.lower() for d in DANGEROUS_COMMANDS):
+            job.error = "Dangerous command blocked"
+            self._finish(job, RemediationStatus.FAILED)
+            return job
+
+        thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        thread.start()
+
+        logger.info(f"Remediation started for project {project_id}: {command}")
+        return job
+
+    def cancel(self, project_id: int) -> bool:
+        """Annuleer de lopende remediation van een project."""
+        with self._lock:
+            job = self._active.get(project_id)
+
+        if not job:
+            return False
+
+        job._cancel.set()
+        return True
+
+    def is_busy(self, project_id: int) -> bool:
+        """Check of er een remediation loopt voor dit project."""
+        with self._lock:
+            return project_id in self._active
+
+    def get_job(self, project_id: int) -> Optional[RemediationJob]:
+        """Get de lopende job van een project."""
+        with self._lock:
+            return self._active.get(project_id)
+
+    def get_active_jobs(self) -> List[RemediationJob]:
+        """Get alle lopende jobs."""
+        with self._lock:
+            return list(self._active.values())
+
+    # === EXECUTION ===
+
+    def _run(self, job: RemediationJob):
+        """Voer het commando uit en stream output (worker thread)."""
+        popen_kwargs = {}
+        if sys.platform == "win32":
+            popen_kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Eigen process group zodat child processen (npm, node) mee gestopt worden
+            popen_kwargs["start_new_session"] = True
+
+        try:
+            process = subprocess.Popen(
+                job.command,
+                shell=True,
+                cwd=job.working_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                **popen_kwargs
+            )
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, RemediationStatus.FAILED)
+            return
+
+        job._process = process
+
+        readers = [
+            threading.Thread(target=self._pump, args=(job, process.stdout, ""), daemon=True),
+            threading.Thread(target=self._pump, args=(job, process.stderr, "[stderr] "), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        deadline = time.monotonic() + job.timeout
+        status = None
+
+        while process.poll() is None:
+            if job._cancel.wait(self._flush_interval):
+                self._kill(process)
+                status = RemediationStatus.CANCELLED
+                break
+
+            if time.monotonic() >= deadline:
+                self._kill(process)
+                status = RemediationStatus.TIMEOUT
+                job.error = f"Command timed out after {job.timeout}s"
+                break
+
+            self._flush(job)
+
+        process.wait()
+        for reader in readers:
+            reader.join(timeout=self._kill_grace)
+
+        job.return_code = process.returncode
+        if status is None:
+            status = RemediationStatus.SUCCEEDED if process.returncode == 0 else RemediationStatus.FAILED
+
+        self._finish(job, status)
+
+    def _pump(self, job: RemediationJob, stream, prefix: str):
+        """Lees regels van een pipe naar de job output."""
+        try:
+            for line in iter(stream.readline, ""):
+                with job._output_lock:
+                    job.output.append(prefix + line)
+        except Exception:
+            pass
+        finally:
+            stream.close()
+
+    def _kill(self, process: subprocess.Popen):
+        """Stop het process inclusief child processen."""
+        try:
+            if sys.platform == "win32":
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                    capture_output=True
+                )
+                return
+
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=self._kill_grace)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to kill remediation process: {e}")
+
+    def _flush(self, job: RemediationJob, final: bool = False):
+        """Schrijf de huidige output (en eindstatus) naar het IssueSolution record."""
+        output = job.output_text()
+        if job.error:
+            output = f"{output}\n{job.error}" if output else job.error
+
+        try:
+            db = get_db()
+            with db.session() as session:
+                solution = session.query(IssueSolution).get(job.solution_id)
+                if not solution:
+                    return
+
+                solution.error_output = output
+                solution.status = job.status
+
+                if final:
+                    solution.was_successful = job.success
+                    solution.return_code = job.return_code
+                    solution.finished_at = job.finished_at
+
+                session.commit()
+        except Exception as e:
+            logger.error(f"Failed to store remediation output: {e}")
+
+    def _finish(self, job: RemediationJob, status: str):
+        """Rond een job af: status opslaan, slot vrijgeven, callback."""
+        job.status = status
+        job.finished_at = datetime.now()
+
+        self._flush(job, final=True)
+
+        with self._lock:
+            if self._active.get(job.project_id) is job:
+                del self._active[job.project_id]
+
+        logger.info(
+            f"Remediation for project {job.project_id} {status}"
+            + (f" (exit {job.return_code})" if job.return_code is not None else "")
+        )
+
+        # Wachtende callers (wait=True) pas wekken als de callback klaar is
+        try:
+            if job.on_complete:
+                job.on_complete(job)
+        except Exception as e:
+            logger.error(f"Remediation callback error: {e}")
+        finally:
+            job._done.set()
+
+
+# Global instance
+_runner: Optional[RemediationRunner] = None
+
+
+def get_remediation_runner() -> RemediationRunner:
+    """Get the global remediation runner instance."""
+    global _runner
+    if _runner is None:
+        _runner = RemediationRunner()
+    return _runner
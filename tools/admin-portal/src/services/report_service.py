@@ -5,8 +5,6 @@ Slaat rapporten op en kan AI-powered samenvattingen maken.
 
 import os
 import json
-import threading
-import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
@@ -16,6 +14,7 @@ from ..database.models import (
     HealthStatus, IssueStatus
 )
 from ..utils.config import Config, logger
+from .orchestrator import get_orchestrator
 
 
 class ReportService:
@@ -36,7 +35,8 @@ class ReportService:
         
         self._initialized = True
         self._running = False
-        self._thread: Optional[threading.Thread] = None
+        self._last_daily = None  # Datum van het laatst gegenereerde dagrapport
+        self._last_weekly = None
         self._report_dir = os.path.join(Config.DATA_DIR, "reports")
         
         # Ensure report directory exists
@@ -48,33 +48,34 @@ class ReportService:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._scheduler_loop, daemon=True)
-        self._thread.start()
+        # Geen jitter: de check moet binnen het rapport-uur blijven vallen
+        get_orchestrator().add_job(
+            "reports",
+            self._check_schedule,
+            interval=300,
+            jitter=0
+        )
         logger.info("Report scheduler started")
     
     def stop_scheduler(self):
         """Stop de scheduler."""
         self._running = False
+        get_orchestrator().remove_job("reports")
     
-    def _scheduler_loop(self):
-        """Check elke uur of het tijd is voor een rapport."""
-        while self._running:
-            try:
-                now = datetime.now()
-                
-                # Generate daily report at 6:00 AM
-                if now.hour == 6 and now.minute < 5:
-                    self.generate_daily_report()
-                
-                # Generate weekly report on Monday at 7:00 AM
-                if now.weekday() == 0 and now.hour == 7 and now.minute < 5:
-                    self.generate_weekly_report()
-                
-            except Exception as e:
-                logger.error(f"Report scheduler error: {e}")
-            
-            # Wait 5 minutes
-            time.sleep(300)
+    def _check_schedule(self):
+        """Check elke 5 minuten of het tijd is voor een rapport."""
+        now = datetime.now()
+        today = now.date()
+        
+        # Generate daily report at 6:00 AM (één keer binnen dat uur)
+        if now.hour == 6 and self._last_daily != today:
+            self._last_daily = today
+            self.generate_daily_report()
+        
+        # Generate weekly report on Monday at 7:00 AM
+        if now.weekday() == 0 and now.hour == 7 and self._last_weekly != today:
+            self._last_weekly = today
+            self.generate_weekly_report()
     
     def generate_daily_report(self, date: datetime = None) -> Dict[str, Any]:
         """
@@ -0,0 +1,344 @@
+"""
+Similarity Index - Lokale vector index over opgeloste tickets en issues.
+
+Bouwt gehashte n-gram vectoren van SupportTicket (subject/description/resolution)
+en MonitorIssue (error_message/resolution) en zoekt met cosine similarity.
+Zo kunnen eerdere oplossingen direct als context gebruikt worden, nog
+voordat er een (dure) LLM call gedaan wordt.
+"""
+
+import json
+import re
+import threading
+import zlib
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+import numpy as np
+
+from ..database import get_db
+from ..database.models import SupportTicket, MonitorIssue
+from ..utils.config import Config, logger
+
+
+# Tokens: woorden van minimaal 2 tekens (inclusief cijfers, bv. "500", "ssl")
+_TOKEN_RE = re.compile(r"[a-z0-9_]{2,}")
+
+
+class SimilarityIndex:
+    """
+    In-memory vector index met gehashte n-grams en NumPy cosine similarity.
+
+    Elke entry krijgt een vaste key ("ticket:12", "issue:7"). Vectoren worden
+    L2-genormaliseerd opgeslagen, zodat een zoekopdracht één matrix-vector
+    product is. De index wordt incrementeel bijgewerkt op basis van
+    `updated_at` en op schijf bewaard in de data folder.
+    """
+
+    _instance = None
+
+    N_FEATURES = 2 ** 11  # 2048 dimensies, ~8 KB per entry (float32)
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._index_path = Config.DATA_DIR / "similarity_index.npz"
+
+        # Vector storage (rijen 0.._size zijn in gebruik)
+        self._matrix = np.zeros((64, self.N_FEATURES), dtype=np.float32)
+        self._size = 0
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._payloads: List[Dict[str, Any]] = []
+
+        # High-water marks voor incrementele updates
+        self._watermarks: Dict[str, Optional[datetime]] = {
+            "ticket": None,
+            "issue": None,
+        }
+
+        self._load()
+
+    # === VECTORIZATION ===
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        """Zet tekst om naar een genormaliseerde gehashte n-gram vector."""
+        vector = np.zeros(self.N_FEATURES, dtype=np.float32)
+        tokens = _TOKEN_RE.findall((text or "").lower())
+
+        if not tokens:
+            return vector
+
+        # Unigrams + bigrams
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+        for gram in grams:
+            h = zlib.crc32(gram.encode("utf-8"))
+            # Signed hashing voorkomt dat botsingen altijd optellen
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.N_FEATURES] += sign
+
+        # Sublinear tf en L2 normalisatie
+        np.copysign(np.log1p(np.abs(vector)), vector, out=vector)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    # === INDEX MUTATION ===
+
+    def _upsert(self, key: str, text: str, payload: Dict[str, Any]):
+        """Voeg entry toe of overschrijf bestaande (caller houdt lock vast)."""
+        vector = self._vectorize(text)
+
+        position = self._positions.get(key)
+        if position is None:
+            if self._size == self._matrix.shape[0]:
+                # Capaciteit verdubbelen (amortized O(1) append)
+                grown = np.zeros((self._size * 2, self.N_FEATURES), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+
+            position = self._size
+            self._size += 1
+            self._keys.append(key)
+            self._payloads.append(payload)
+            self._positions[key] = position
+        else:
+            self._payloads[position] = payload
+
+        self._matrix[position] = vector
+
+    def add(self, key: str, text: str, payload: Dict[str, Any] = None):
+        """Voeg een document toe aan de index (of werk het bij)."""
+        with self._lock:
+            self._upsert(key, text, payload or {})
+
+    @staticmethod
+    def _ticket_entry(ticket: SupportTicket) -> Tuple[str, str, Dict[str, Any]]:
+        text = "\n".join(filter(None, [
+            ticket.subject, ticket.description, ticket.resolution
+        ]))
+        payload = {
+            "kind": "ticket",
+            "id": ticket.id,
+            "title": f"{ticket.ticket_number}: {ticket.subject}",
+            "resolution": (ticket.resolution or "")[:1000],
+        }
+        return f"ticket:{ticket.id}", text, payload
+
+    @staticmethod
+    def _issue_entry(issue: MonitorIssue) -> Tuple[str, str, Dict[str, Any]]:
+        text = "\n".join(filter(None, [
+            issue.title, issue.error_message, issue.resolution
+        ]))
+        payload = {
+            "kind": "issue",
+            "id": issue.id,
+            "title": issue.title,
+            "resolution": (issue.resolution or "")[:1000],
+        }
+        return f"issue:{issue.id}", text, payload
+
+    def refresh(self) -> int:
+        """
+        Indexeer opgeloste tickets en issues die sinds de vorige refresh
+        gewijzigd zijn.
+
+        Returns:
+            Aantal toegevoegde/bijgewerkte entries
+        """
+        db = get_db()
+        entries = []
+        watermarks = dict(self._watermarks)
+
+        with db.session() as session:
+            query = session.query(SupportTicket).filter(
+                SupportTicket.resolution != None
+            )
+            if watermarks["ticket"]:
+                query = query.filter(SupportTicket.updated_at > watermarks["ticket"])
+
+            for ticket in query.order_by(SupportTicket.updated_at).all():
+                entries.append(self._ticket_entry(ticket))
+                watermarks["ticket"] = ticket.updated_at
+
+            query = session.query(MonitorIssue).filter(
+                MonitorIssue.resolution != None
+            )
+            if watermarks["issue"]:
+                query = query.filter(MonitorIssue.updated_at > watermarks["issue"])
+
+            for issue in query.order_by(MonitorIssue.updated_at).all():
+                entries.append(self._issue_entry(issue))
+                watermarks["issue"] = issue.updated_at
+
+        if not entries:
+            return 0
+
+        with self._lock:
+            for key, text, payload in entries:
+                self._upsert(key, text, payload)
+            self._watermarks = watermarks
+
+        self._save()
+        logger.debug(f"Similarity index updated: {len(entries)} entries")
+        return len(entries)
+
+    def rebuild(self) -> int:
+        """Gooi de index weg en bouw opnieuw op vanuit de database."""
+        with self._lock:
+            self._matrix = np.zeros((64, self.N_FEATURES), dtype=np.float32)
+            self._size = 0
+            self._keys = []
+            self._positions = {}
+            self._payloads = []
+            self._watermarks = {"ticket": None, "issue": None}
+
+        return self.refresh()
+
+    # === SEARCH ===
+
+    def search(
+        self,
+        text: str,
+        k: int = 5,
+        min_score: float = 0.2,
+        exclude: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Zoek de k meest vergelijkbare opgeloste tickets/issues.
+
+        Args:
+            text: Zoektekst (bv. subject + beschrijving of error message)
+            k: Maximum aantal resultaten
+            min_score: Minimale cosine similarity
+            exclude: Key die overgeslagen moet worden (het item zelf)
+
+        Returns:
+            Lijst met payload dicts aangevuld met 'score', hoogste eerst
+        """
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Similarity index refresh failed: {e}")
+
+        query = self._vectorize(text)
+        if not query.any():
+            return []
+
+        with self._lock:
+            if self._size == 0:
+                return []
+
+            scores = self._matrix[:self._size] @ query
+
+            # Alleen de top-k sorteren
+            top = min(k + 1, self._size)
+            candidates = np.argpartition(-scores, top - 1)[:top]
+            candidates = candidates[np.argsort(-scores[candidates])]
+
+            results = []
+            for position in candidates:
+                score = float(scores[position])
+                if score < min_score:
+                    break
+                if self._keys[position] == exclude:
+                    continue
+
+                results.append({**self._payloads[position], "score": round(score, 3)})
+                if len(results) >= k:
+                    break
+
+        return results
+
+    def format_context(self, matches: List[Dict[str, Any]]) -> str:
+        """Formatteer matches als context blok voor een prompt."""
+        if not matches:
+            return ""
+
+        lines = ["Vergelijkbare eerder opgeloste problemen:"]
+        for match in matches:
+            lines.append(
+                f"- [{match['kind']} #{match['id']}, score {match['score']:.2f}] "
+                f"{match['title']}\n  Oplossing: {match['resolution']}"
+            )
+        return "\n".join(lines)
+
+    # === PERSISTENCE ===
+
+    def _load(self):
+        """Laad index van schijf (warm start)."""
+        if not self._index_path.exists():
+            return
+
+        try:
+            with np.load(self._index_path, allow_pickle=False) as data:
+                matrix = data["matrix"]
+                meta = json.loads(str(data["meta"]))
+
+            if matrix.shape[1] != self.N_FEATURES:
+                logger.info("Similarity index has different dimensions, rebuilding")
+                return
+
+            size = matrix.shape[0]
+            self._matrix = np.zeros((max(64, size * 2), self.N_FEATURES), dtype=np.float32)
+            self._matrix[:size] = matrix
+            self._size = size
+            self._keys = meta["keys"]
+            self._payloads = meta["payloads"]
+            self._positions = {key: i for i, key in enumerate(self._keys)}
+            self._watermarks = {
+                kind: datetime.fromisoformat(value) if value else None
+                for kind, value in meta["watermarks"].items()
+            }
+
+            logger.debug(f"Loaded similarity index with {size} entries")
+
+        except Exception as e:
+            logger.warning(f"Could not load similarity index: {e}")
+
+    def _save(self):
+        """Schrijf index naar schijf."""
+        with self._lock:
+            matrix = self._matrix[:self._size].copy()
+            meta = {
+                "keys": list(self._keys),
+                "payloads": list(self._payloads),
+                "watermarks": {
+                    kind: value.isoformat() if value else None
+                    for kind, value in self._watermarks.items()
+                },
+            }
+
+        try:
+            tmp_path = self._index_path.with_suffix(".tmp.npz")
+            np.savez(tmp_path, matrix=matrix, meta=np.array(json.dumps(meta)))
+            tmp_path.replace(self._index_path)
+        except Exception as e:
+            logger.warning(f"Could not save similarity index: {e}")
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+# Global instance
+_similarity_index: Optional[SimilarityIndex] = None
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """Get the global similarity index instance."""
+    global _similarity_index
+    if _similarity_index is None:
+        _similarity_index = SimilarityIndex()
+    return _similarity_index
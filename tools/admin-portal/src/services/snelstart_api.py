@@ -2,15 +2,40 @@
 Snelstart B2B API Client - OAuth 2.0 authenticatie en API communicatie.
 """
 
+import hashlib
+import json
+import queue
 import requests
 import threading
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple, List
+from typing import Optional, Dict, Any, Tuple, List, Iterator, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+from ..database import get_db
+from ..database.models import Setting
 from ..utils.config import Config, logger
+from .telemetry import get_telemetry, normalize_endpoint
+from .orchestrator import get_orchestrator
+from .http_client import RateLimiter
+
+
+# Setting key waaronder het (versleutelde) access token bewaard wordt
+TOKEN_SETTING_KEY = "snelstart_token"
+
+# Gedeelde rate limit voor alle Snelstart calls (onder de quota van de B2B API)
+RATE_LIMIT = 5  # requests per seconde
+RATE_BURST = 5
+MAX_RETRY_AFTER = 30  # seconds
+
+# OData paging: records per pagina en aantal vooruit opgehaalde pagina's
+PAGE_SIZE = 500
+PREFETCH_PAGES = 2
+
+
+class SnelstartPagingError(Exception):
+    """Een pagina van een Snelstart collectie kon niet opgehaald worden."""
 
 
 class SnelstartStatus(Enum):
@@ -72,6 +97,10 @@ class SnelstartAPI:
     _instance = None
     _lock = threading.Lock()
     
+    # Token vernieuwen zodra het binnen deze marge verloopt (seconden)
+    TOKEN_EXPIRY_MARGIN = 60
+    TOKEN_REFRESH_AHEAD = 300
+    
     # API Endpoints
     ENDPOINTS = {
         "relaties": "/relaties",
@@ -104,9 +133,12 @@ class SnelstartAPI:
         self._client_secret = Config.SNELSTART_CLIENT_SECRET
         self._subscription_key = Config.SNELSTART_SUBSCRIPTION_KEY
         
-        # OAuth tokens
+        # OAuth tokens (_token_expires = moment waarop het token echt verloopt)
         self._access_token: Optional[str] = None
         self._token_expires: Optional[datetime] = None
+        self._token_loaded = False
+        self._auth_lock = threading.Lock()  # Single-flight authenticatie
+        self._rate_limiter = RateLimiter(rate=RATE_LIMIT, burst=RATE_BURST)
         
         # Status tracking
         self._health = SnelstartHealth(status=SnelstartStatus.UNKNOWN)
@@ -126,8 +158,11 @@ class SnelstartAPI:
             self._subscription_key = subscription_key
         
         # Reset token when credentials change
-        self._access_token = None
-        self._token_expires = None
+        with self._auth_lock:
+            self._access_token = None
+            self._token_expires = None
+            self._token_loaded = True
+            self._delete_stored_token()
         
         logger.info("Snelstart API configuration updated")
     
@@ -139,10 +174,91 @@ class SnelstartAPI:
             self._subscription_key
         )
     
+    # =========================================================================
+    # Token Storage
+    # =========================================================================
+    
+    def _credentials_fingerprint(self) -> str:
+        """Hash van de credentials; een opgeslagen token van andere credentials is ongeldig."""
+        raw = f"{self._auth_url}|{self._client_id}|{self._subscription_key}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _load_stored_token(self):
+        """Laad een eerder opgeslagen token (eenmalig, bij het eerste gebruik)."""
+        self._token_loaded = True
+        
+        try:
+            db = get_db()
+            with db.session() as session:
+                setting = session.query(Setting).filter_by(key=TOKEN_SETTING_KEY).first()
+                encrypted = setting.value if setting else None
+            
+            if not encrypted:
+                return
+            
+            data = json.loads(Config.decrypt(encrypted))
+            if data.get("fingerprint") != self._credentials_fingerprint():
+                logger.info("Stored Snelstart token belongs to other credentials, ignoring")
+                return
+            
+            expires = datetime.fromisoformat(data["expires"])
+            if datetime.now() < expires - timedelta(seconds=self.TOKEN_EXPIRY_MARGIN):
+                self._access_token = data["access_token"]
+                self._token_expires = expires
+                self._start_refresher()
+                logger.info(f"Using stored Snelstart token (valid until {expires:%H:%M})")
+                
+        except Exception as e:
+            logger.warning(f"Could not load stored Snelstart token: {e}")
+    
+    def _store_token(self):
+        """Bewaar het huidige token versleuteld in de settings tabel."""
+        try:
+            value = Config.encrypt(json.dumps({
+                "access_token": self._access_token,
+                "expires": self._token_expires.isoformat(),
+                "fingerprint": self._credentials_fingerprint(),
+            }))
+            
+            db = get_db()
+            with db.session() as session:
+                setting = session.query(Setting).filter_by(key=TOKEN_SETTING_KEY).first()
+                if setting:
+                    setting.value = value
+                else:
+                    session.add(Setting(key=TOKEN_SETTING_KEY, value=value))
+                session.commit()
+                
+        except Exception as e:
+            logger.warning(f"Could not store Snelstart token: {e}")
+    
+    def _delete_stored_token(self):
+        try:
+            db = get_db()
+            with db.session() as session:
+                session.query(Setting).filter_by(key=TOKEN_SETTING_KEY).delete()
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Could not delete stored Snelstart token: {e}")
+    
+    # =========================================================================
+    # Authentication
+    # =========================================================================
+    
+    def _token_valid(self, margin: int = None) -> bool:
+        """Check of het token nog minstens `margin` seconden geldig is."""
+        if not self._access_token or not self._token_expires:
+            return False
+        margin = self.TOKEN_EXPIRY_MARGIN if margin is None else margin
+        return datetime.now() < self._token_expires - timedelta(seconds=margin)
+    
     def _authenticate(self) -> bool:
         """
         Authenticate with Snelstart OAuth 2.0.
         
+        Alleen aanroepen met `_auth_lock` vast; gebruik anders
+        `_ensure_authenticated()` of `_refresh_token()`.
+        
         Returns True if successful, False otherwise.
         """
         if not self.is_configured():
@@ -173,7 +289,9 @@ class SnelstartAPI:
                 data = response.json()
                 self._access_token = data.get("access_token")
                 expires_in = data.get("expires_in", 3600)
-                self._token_expires = datetime.now() + timedelta(seconds=expires_in - 60)
+                self._token_expires = datetime.now() + timedelta(seconds=expires_in)
+                self._store_token()
+                self._start_refresher()
                 
                 self._health = SnelstartHealth(
                     status=SnelstartStatus.CONNECTED,
@@ -204,12 +322,56 @@ class SnelstartAPI:
             return False
     
     def _ensure_authenticated(self) -> bool:
-        """Ensure we have a valid access token."""
-        if self._access_token and self._token_expires:
-            if datetime.now() < self._token_expires:
+        """
+        Ensure we have a valid access token.
+        
+        Gelijktijdige callers wachten op één token request (single-flight)
+        en gebruiken daarna allemaal hetzelfde token.
+        """
+        if self._token_valid():
+            return True
+        
+        with self._auth_lock:
+            if not self._token_loaded:
+                self._load_stored_token()
+            
+            # Een andere thread kan het token net vernieuwd hebben
+            if self._token_valid():
                 return True
+            
+            return self._authenticate()
+    
+    def _invalidate_token(self, token: Optional[str]):
+        """Gooi het token weg na een 401, tenzij een andere thread het al vernieuwd heeft."""
+        with self._auth_lock:
+            if self._access_token == token:
+                self._access_token = None
+                self._token_expires = None
+    
+    def _refresh_token(self):
+        """
+        Vernieuw het token vóór het verloopt (job in de sync orchestrator).
         
-        return self._authenticate()
+        Loopt er al een authenticatie, dan wordt deze ronde overgeslagen.
+        """
+        if not self._access_token or self._token_valid(self.TOKEN_REFRESH_AHEAD):
+            return
+        
+        if not self._auth_lock.acquire(blocking=False):
+            return
+        
+        try:
+            if not self._token_valid(self.TOKEN_REFRESH_AHEAD):
+                logger.debug("Refreshing Snelstart token before expiry")
+                self._authenticate()
+        finally:
+            self._auth_lock.release()
+    
+    def _start_refresher(self):
+        """Registreer de token refresh job (eenmalig)."""
+        orchestrator = get_orchestrator()
+        if not orchestrator.has_job("snelstart_token"):
+            orchestrator.add_job("snelstart_token", self._refresh_token, interval=60, jitter=0)
     
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
@@ -234,9 +396,8 @@ class SnelstartAPI:
         
         self._request_history.insert(0, entry)
         
-        # Trim history
-        if len(self._request_history) > self._max_history:
-            self._request_history = self._request_history[:self._max_history]
+        # Trim history (in place; requests kunnen uit meerdere threads komen)
+        del self._request_history[self._max_history:]
     
     def request(self, 
                 endpoint: str, 
@@ -255,52 +416,76 @@ class SnelstartAPI:
         Returns:
             Tuple of (success, data/error_message)
         """
-        if not self._ensure_authenticated():
-            return False, self._health.error_message or "Authentication failed"
-        
         url = f"{self._api_url}{endpoint}"
-        start_time = time.time()
+        series = f"snelstart:{method} {normalize_endpoint(endpoint)}"
         
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self._get_headers(),
-                json=data if data else None,
-                params=params,
-                timeout=30
-            )
+        # Maximaal één nieuwe poging na een 401 (token verlopen of ingetrokken)
+        # of een 429 (quota overschreden)
+        for attempt in range(2):
+            if not self._ensure_authenticated():
+                return False, self._health.error_message or "Authentication failed"
+            
+            self._rate_limiter.acquire()
+            token = self._access_token
+            start_time = time.time()
+            
+            try:
+                response = requests.request(
+                    method=method,
+                    url=url,
+                    headers=self._get_headers(),
+                    json=data if data else None,
+                    params=params,
+                    timeout=30
+                )
+                
+            except requests.exceptions.Timeout:
+                duration_ms = int((time.time() - start_time) * 1000)
+                self._log_request(method, endpoint, 0, duration_ms, "Timeout")
+                get_telemetry().record(series, duration_ms, error="Timeout")
+                return False, "Request timeout"
+                
+            except requests.exceptions.RequestException as e:
+                duration_ms = int((time.time() - start_time) * 1000)
+                error_msg = str(e)
+                self._log_request(method, endpoint, 0, duration_ms, error_msg)
+                get_telemetry().record(series, duration_ms, error=type(e).__name__)
+                logger.error(f"Snelstart request error: {e}")
+                return False, error_msg
             
             duration_ms = int((time.time() - start_time) * 1000)
             self._log_request(method, endpoint, response.status_code, duration_ms)
+            get_telemetry().record(
+                series,
+                duration_ms,
+                size=len(response.content),
+                error=f"HTTP {response.status_code}" if response.status_code >= 400 else None
+            )
             
             if response.status_code in (200, 201):
                 return True, response.json() if response.text else {}
             elif response.status_code == 204:
                 return True, {}
+            elif response.status_code == 401 and attempt == 0:
+                # Token verlopen; opnieuw authenticeren en de request één keer herhalen
+                self._invalidate_token(token)
+                continue
             elif response.status_code == 401:
-                # Token expired, try to re-authenticate
-                self._access_token = None
-                if self._authenticate():
-                    # Retry request
-                    return self.request(endpoint, method, data, params)
                 return False, "Authentication expired"
+            elif response.status_code == 429 and attempt == 0:
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 1))
+                except ValueError:
+                    retry_after = 1.0
+                logger.warning(f"Snelstart rate limit reached, retrying in {retry_after:.0f}s")
+                time.sleep(min(max(retry_after, 0.0), MAX_RETRY_AFTER))
+                continue
             else:
                 error_msg = f"API error {response.status_code}: {response.text}"
                 logger.error(f"Snelstart API error: {error_msg}")
                 return False, error_msg
-                
-        except requests.exceptions.Timeout:
-            duration_ms = int((time.time() - start_time) * 1000)
-            self._log_request(method, endpoint, 0, duration_ms, "Timeout")
-            return False, "Request timeout"
-            
-        except requests.exceptions.RequestException as e:
-            duration_ms = int((time.time() - start_time) * 1000)
-            error_msg = str(e)
-            self._log_request(method, endpoint, 0, duration_ms, error_msg)
-            logger.error(f"Snelstart request error: {e}")
-            return False, error_msg
+        
+        return False, "Authentication expired"
     
     # =========================================================================
     # Health & Status
@@ -357,18 +542,22 @@ class SnelstartAPI:
     # Relaties (Debiteuren/Crediteuren)
     # =========================================================================
     
-    def get_relaties(self, skip: int = 0, top: int = 100) -> Tuple[bool, Any]:
+    def get_relaties(self, skip: int = 0, top: int = 100, modified_since: str = None) -> Tuple[bool, Any]:
         """
         Haal alle relaties op.
         
         Args:
             skip: Number of records to skip (pagination)
             top: Maximum records to return
+            modified_since: Alleen relaties gewijzigd na deze timestamp
             
         Returns:
             Tuple of (success, list of relaties or error)
         """
         params = {"$skip": skip, "$top": top}
+        if modified_since:
+            params["$filter"] = f"modifiedOn gt {modified_since}"
+            params["$orderby"] = "modifiedOn"
         return self.request("/relaties", params=params)
     
     def get_relatie(self, relatie_id: str) -> Tuple[bool, Any]:
@@ -399,6 +588,89 @@ class SnelstartAPI:
         params = {"$filter": f"contains(naam, '{naam}')"}
         return self.request("/relaties", params=params)
     
+    # =========================================================================
+    # Paging
+    # =========================================================================
+    
+    def iter_pages(
+        self,
+        fetch: Callable[[int, int], Tuple[bool, Any]],
+        page_size: int = PAGE_SIZE,
+        prefetch: int = PREFETCH_PAGES
+    ) -> Iterator[List[Dict]]:
+        """
+        Loop alle pagina's van een collectie af.
+        
+        Een achtergrond thread haalt de volgende pagina's al op terwijl de
+        caller de huidige verwerkt. Er staan nooit meer dan `prefetch`
+        pagina's klaar, dus het geheugen blijft begrensd ongeacht de grootte
+        van de collectie. Stopt de caller eerder, dan stopt ook het ophalen.
+        
+        Args:
+            fetch: Functie (skip, top) -> (success, page), bv. get_relaties
+            page_size: Records per request ($top)
+            prefetch: Maximaal aantal klaarstaande pagina's
+            
+        Raises:
+            SnelstartPagingError: Als een pagina niet opgehaald kon worden
+        """
+        pages: "queue.Queue" = queue.Queue(maxsize=max(1, prefetch))
+        stop = threading.Event()
+        
+        def produce():
+            skip = 0
+            while not stop.is_set():
+                try:
+                    success, page = fetch(skip, page_size)
+                    if not success or not isinstance(page, list):
+                        page = SnelstartPagingError(f"Page at {skip} failed: {page}")
+                except Exception as e:
+                    page = SnelstartPagingError(f"Page at {skip} failed: {e}")
+                
+                # Wachten tot er plek is, maar niet als de caller al gestopt is
+                while not stop.is_set():
+                    try:
+                        pages.put(page, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                
+                if not isinstance(page, list) or len(page) < page_size:
+                    return
+                skip += page_size
+        
+        threading.Thread(target=produce, daemon=True, name="snelstart-pages").start()
+        
+        try:
+            while True:
+                page = pages.get()
+                if isinstance(page, Exception):
+                    raise page
+                if page:
+                    yield page
+                if len(page) < page_size:
+                    return
+        finally:
+            stop.set()
+    
+    def iter_relaties(self, page_size: int = PAGE_SIZE, modified_since: str = None) -> Iterator[Dict]:
+        """Alle relaties, pagina voor pagina opgehaald."""
+        for page in self.iter_pages(
+            lambda skip, top: self.get_relaties(skip=skip, top=top, modified_since=modified_since),
+            page_size
+        ):
+            yield from page
+    
+    def iter_verkoopfacturen(self, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """Alle verkoopfacturen, pagina voor pagina opgehaald."""
+        for page in self.iter_pages(self.get_verkoopfacturen, page_size):
+            yield from page
+    
+    def iter_inkoopfacturen(self, page_size: int = PAGE_SIZE) -> Iterator[Dict]:
+        """Alle inkoopfacturen, pagina voor pagina opgehaald."""
+        for page in self.iter_pages(self.get_inkoopfacturen, page_size):
+            yield from page
+    
     # =========================================================================
     # Verkoopfacturen
     # =========================================================================
@@ -0,0 +1,174 @@
+"""
+Snelstart Push Pipeline - Parallelle writes naar Snelstart.
+
+De HTTP calls (relatie aanmaken/bijwerken, verkoopfactuur boeken) draaien
+in een kleine thread pool, zodat er een begrensd aantal requests tegelijk
+onderweg is. De rate limit zelf zit in `SnelstartAPI.request()` en geldt
+dus ook voor de rest van de app.
+
+Resultaten worden in de aanroepende thread verwerkt: status updates worden
+verzameld en per batch met één UPDATE weggeschreven. Ids van records die
+net in Snelstart aangemaakt zijn gaan direct (per record) naar de database,
+want raken die kwijt dan maakt de volgende sync ze opnieuw aan. Een taak kan wachten
+op een andere taak (`after`), bv. een factuur op de relatie van de klant.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Callable, Any, Hashable
+
+from sqlalchemy import update
+
+from ..database import get_db, get_change_bus
+from ..database.change_events import ENTITIES
+from ..utils.config import logger
+
+
+MAX_IN_FLIGHT = 4
+FLUSH_SIZE = 50
+
+
+@dataclass
+class PushTask:
+    """Eén write naar Snelstart."""
+    key: Hashable
+    send: Callable[[], Tuple[bool, Any]]  # draait in een worker thread
+    on_result: Callable[[bool, Any], bool]  # draait in de aanroepende thread; True = gelukt
+
+
+class PushPipeline:
+    """
+    Voert push taken uit met maximaal `max_in_flight` requests tegelijk.
+
+        pipeline = PushPipeline()
+        pipeline.submit(("client", 1), send, on_result)
+        pipeline.submit(("invoice", 7), send, on_result, after=("client", 1))
+        pipeline.run()
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, flush_size: int = FLUSH_SIZE):
+        self.flush_size = flush_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="snelstart-push"
+        )
+        self._futures: Dict[Future, PushTask] = {}
+        self._pending: set = set()  # keys die nog niet afgerond zijn
+        self._waiting: Dict[Hashable, List[PushTask]] = {}
+        self._rows: Dict[type, List[Dict]] = {}
+
+    # === TASKS ===
+
+    def submit(
+        self,
+        key: Hashable,
+        send: Callable[[], Tuple[bool, Any]],
+        on_result: Callable[[bool, Any], bool],
+        after: Hashable = None
+    ):
+        """
+        Plan een write.
+
+        Args:
+            key: Unieke sleutel, bv. ("client", 12)
+            send: HTTP call; geeft (success, data) terug zoals SnelstartAPI
+            on_result: Verwerkt het resultaat; True als de taak gelukt is
+            after: Sleutel van een taak die eerst moet slagen
+        """
+        task = PushTask(key=key, send=send, on_result=on_result)
+        self._pending.add(key)
+
+        if after is not None and after in self._pending:
+            self._waiting.setdefault(after, []).append(task)
+        else:
+            self._start(task)
+
+    def _start(self, task: PushTask):
+        self._futures[self._executor.submit(task.send)] = task
+
+    def write(self, model: type, row: Dict, immediate: bool = False):
+        """
+        Buffer een status update (row bevat de primary key `id`).
+
+        Args:
+            immediate: Direct in een eigen transactie schrijven, voor ids die
+                een create call teruggaf (raises bij een database fout)
+        """
+        if immediate:
+            self._execute(model, [row])
+            return
+
+        rows = self._rows.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= self.flush_size:
+            try:
+                self._flush(model)
+            except Exception as e:
+                # Rows blijven gebufferd; de volgende flush probeert het opnieuw
+                logger.error(f"Writing {model.__tablename__} sync statuses failed, will retry: {e}")
+
+    # === RUN ===
+
+    def run(self):
+        """Wacht tot alle taken (inclusief afhankelijke) klaar zijn en schrijf de status weg."""
+        try:
+            while self._futures:
+                done, _ = wait(list(self._futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = self._futures.pop(future)
+                    try:
+                        success, data = future.result()
+                    except Exception as e:
+                        success, data = False, str(e)
+                    self._complete(task, success, data)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._flush_all()
+
+    def _flush_all(self):
+        """Schrijf alle gebufferde rows; een fout wordt pas na de andere modellen doorgegeven."""
+        error: Optional[Exception] = None
+        for model in list(self._rows):
+            try:
+                self._flush(model)
+            except Exception as e:
+                logger.error(f"Writing {model.__tablename__} sync statuses failed: {e}")
+                error = error or e
+        if error is not None:
+            raise error
+
+    def _complete(self, task: PushTask, success: bool, data: Any):
+        try:
+            ok = task.on_result(success, data)
+        except Exception as e:
+            logger.error(f"Snelstart push result for {task.key} failed: {e}")
+            ok = False
+
+        self._pending.discard(task.key)
+
+        for dependent in self._waiting.pop(task.key, []):
+            if ok:
+                self._start(dependent)
+            else:
+                self._complete(dependent, False, f"Voorgaande sync mislukt: {data}")
+
+    def _flush(self, model: type):
+        rows = self._rows.get(model)
+        if not rows:
+            return
+
+        # Pas uit de buffer halen als de commit gelukt is
+        batch = list(rows)
+        self._execute(model, batch)
+        del rows[:len(batch)]
+
+    def _execute(self, model: type, rows: List[Dict]):
+        db = get_db()
+        with db.session() as session:
+            session.execute(update(model), rows)
+            session.commit()
+
+        # Bulk UPDATE gaat buiten de ORM hooks om
+        if model in ENTITIES:
+            get_change_bus().emit(ENTITIES[model], [row["id"] for row in rows])
+
+        logger.debug(f"Wrote {len(rows)} {model.__tablename__} sync statuses")
@@ -0,0 +1,213 @@
+"""
+Snelstart Reference Data - Gedeelde cache voor Snelstart stamgegevens.
+
+Grootboekrekeningen, BTW tarieven, landen en kostenplaatsen veranderen
+zelden. Ze worden per resource met een eigen TTL bewaard in
+`data/snelstart_reference.json`, zodat ze na een herstart direct
+beschikbaar zijn (warm start). Een verlopen entry wordt nog teruggegeven
+terwijl een orchestrator job hem op de achtergrond ververst; alleen als
+er nog helemaal niets in de cache staat wordt er synchroon opgehaald.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Tuple, Callable
+
+from ..utils.config import Config, logger
+from .snelstart_api import get_snelstart_api
+from .orchestrator import get_orchestrator
+
+
+# resource: (API methode, TTL in seconden)
+REFERENCE_RESOURCES: Dict[str, Tuple[str, int]] = {
+    "grootboekrekeningen": ("get_grootboekrekeningen", 24 * 3600),
+    "btwtarieven": ("get_btwtarieven", 24 * 3600),
+    "landen": ("get_landen", 7 * 24 * 3600),
+    "kostenplaatsen": ("get_kostenplaatsen", 24 * 3600),
+}
+
+REFRESH_JOB = "snelstart_reference"
+REFRESH_INTERVAL = 900  # seconds
+
+
+class ReferenceDataCache:
+    """Disk-persisted TTL cache voor Snelstart referentie data."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.api = get_snelstart_api()
+        self.path = Config.DATA_DIR / "snelstart_reference.json"
+        self._lock = threading.Lock()
+        self._refresh_locks = {resource: threading.Lock() for resource in REFERENCE_RESOURCES}
+        self._entries: Dict[str, Dict[str, Any]] = {}  # resource: {fetched_at, data}
+        self._load()
+
+    # === READING ===
+
+    def get(self, resource: str) -> Optional[List[Dict]]:
+        """
+        Get referentie data.
+
+        Vers: direct uit de cache. Verlopen: de oude data, terwijl een
+        refresh op de achtergrond start. Leeg: synchroon ophalen.
+
+        Returns:
+            Lijst met items, of None als er niets beschikbaar is
+        """
+        self.start()
+
+        entry = self._entry(resource)
+        if entry is None:
+            self.refresh(resource)
+            entry = self._entry(resource)
+            return entry["data"] if entry else None
+
+        if self._expired(resource, entry):
+            self._refresh_async(resource)
+        return entry["data"]
+
+    def peek(self, resource: str) -> Optional[List[Dict]]:
+        """Get gecachte data zonder ooit de API aan te roepen (voor de GUI)."""
+        entry = self._entry(resource)
+        return entry["data"] if entry else None
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Aantal items, ophaaltijd en versheid per resource."""
+        status = {}
+        for resource in REFERENCE_RESOURCES:
+            entry = self._entry(resource)
+            status[resource] = {
+                "count": len(entry["data"]) if entry else 0,
+                "fetched_at": datetime.fromtimestamp(entry["fetched_at"]) if entry else None,
+                "expired": self._expired(resource, entry) if entry else True,
+            }
+        return status
+
+    def _entry(self, resource: str) -> Optional[Dict[str, Any]]:
+        if resource not in REFERENCE_RESOURCES:
+            raise KeyError(f"Unknown Snelstart reference resource: {resource}")
+        with self._lock:
+            return self._entries.get(resource)
+
+    @staticmethod
+    def _expired(resource: str, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["fetched_at"] >= REFERENCE_RESOURCES[resource][1]
+
+    # === REFRESH ===
+
+    def refresh(self, resource: str) -> bool:
+        """
+        Haal een resource opnieuw op uit Snelstart.
+
+        Gelijktijdige refreshes van dezelfde resource wachten op elkaar in
+        plaats van allemaal een request te doen.
+
+        Returns:
+            True als de cache (door deze of een gelijktijdige call) ververst is
+        """
+        lock = self._refresh_locks[resource]
+        started = time.time()
+
+        with lock:
+            entry = self._entry(resource)
+            if entry and entry["fetched_at"] >= started:
+                return True
+
+            fetch: Callable[[], Tuple[bool, Any]] = getattr(self.api, REFERENCE_RESOURCES[resource][0])
+            success, data = fetch()
+            if not success or not isinstance(data, list):
+                logger.warning(f"Could not refresh Snelstart {resource}: {data}")
+                return False
+
+            with self._lock:
+                self._entries[resource] = {"fetched_at": time.time(), "data": data}
+
+        self._save()
+        logger.info(f"Refreshed Snelstart {resource}: {len(data)} items")
+        return True
+
+    def refresh_expired(self) -> int:
+        """Ververs alle verlopen of ontbrekende resources (orchestrator job)."""
+        if not self.api.is_configured():
+            return 0
+
+        refreshed = 0
+        for resource in REFERENCE_RESOURCES:
+            entry = self._entry(resource)
+            if entry is None or self._expired(resource, entry):
+                refreshed += self.refresh(resource)
+        return refreshed
+
+    def _refresh_async(self, resource: str):
+        if self._refresh_locks[resource].locked():
+            return
+        threading.Thread(target=self.refresh, args=(resource,), daemon=True).start()
+
+    def start(self):
+        """Plan de achtergrond refresh (eenmalig); verlopen data uit de vorige sessie wordt snel ververst."""
+        orchestrator = get_orchestrator()
+        if orchestrator.has_job(REFRESH_JOB):
+            return
+        orchestrator.add_job(
+            REFRESH_JOB,
+            self.refresh_expired,
+            interval=REFRESH_INTERVAL,
+            initial_delay=45
+        )
+
+    def clear(self):
+        """Leeg de cache (bv. na het wisselen van administratie)."""
+        with self._lock:
+            self._entries.clear()
+        self._save()
+
+    # === PERSISTENCE ===
+
+    def _load(self):
+        try:
+            entries = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Could not load Snelstart reference cache: {e}")
+            return
+
+        self._entries = {
+            resource: entry for resource, entry in entries.items()
+            if resource in REFERENCE_RESOURCES and isinstance(entry.get("data"), list)
+        }
+
+    def _save(self):
+        with self._lock:
+            data = json.dumps(self._entries)
+        try:
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(data)
+            tmp_path.replace(self.path)
+        except Exception as e:
+            logger.warning(f"Could not save Snelstart reference cache: {e}")
+
+
+# Global instance
+_reference_cache: Optional[ReferenceDataCache] = None
+
+
+def get_reference_cache() -> ReferenceDataCache:
+    """Get the global Snelstart reference data cache instance."""
+    global _reference_cache
+    if _reference_cache is None:
+        _reference_cache = ReferenceDataCache()
+    return _reference_cache
@@ -0,0 +1,281 @@
+"""
+Snelstart Relatie Index - Lokale kopie van alle Snelstart relaties.
+
+Relaties worden met `$skip/$top` binnengehaald en in de tabel
+`snelstart_relaties` bewaard. Daarna worden alleen relaties met een
+nieuwere `modifiedOn` opgehaald (cursor in `sync_cursors`). Matching op
+relatiecode, KvK, email en naam gebeurt in geheugen, zodat een klant sync
+geen zoek-request per klant meer nodig heeft.
+"""
+
+import json
+import re
+import threading
+from typing import Optional, Dict, List, Set, Tuple
+
+from ..database import get_db
+from ..database.models import SnelstartRelatieRecord
+from ..utils.config import logger
+from .snelstart_api import get_snelstart_api, SnelstartPagingError
+from .sync_cursor import get_sync_cursor_store
+
+
+CURSOR_KEY = "snelstart_relaties"
+PAGE_SIZE = 500
+
+# Rechtsvormen die bij naam-matching genegeerd worden
+_LEGAL_SUFFIXES = re.compile(r"\b(b\.?\s?v\.?|n\.?\s?v\.?|v\.?\s?o\.?\s?f\.?|vof|holding)\s*$")
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_name(name: str) -> str:
+    """Normaliseer een bedrijfsnaam voor matching (kleine letters, zonder rechtsvorm/leestekens)."""
+    name = (name or "").strip().lower()
+    name = _LEGAL_SUFFIXES.sub("", name)
+    return _NON_WORD.sub(" ", name).strip()
+
+
+def normalize_kvk(kvk: str) -> str:
+    return re.sub(r"\D", "", kvk or "")
+
+
+class RelatieIndex:
+    """Lokale mirror van Snelstart relaties met in-memory lookups."""
+
+    def __init__(self):
+        self.api = get_snelstart_api()
+        self.cursors = get_sync_cursor_store()
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._by_id: Dict[str, Dict] = {}
+        self._by_code: Dict[str, str] = {}
+        self._by_kvk: Dict[str, str] = {}
+        self._by_email: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+
+    # === IN-MEMORY INDEX ===
+
+    def _index(self, relatie: Dict):
+        """Voeg een relatie toe aan de lookups (lock moet vastgehouden worden)."""
+        relatie_id = relatie.get("id")
+        if not relatie_id:
+            return
+
+        self._unindex(relatie_id)
+        self._by_id[relatie_id] = relatie
+
+        for lookup, key in self._keys(relatie):
+            if key:
+                # Bij dubbele namen wint de eerste; codes/KvK/email zijn uniek genoeg
+                if lookup is self._by_name:
+                    lookup.setdefault(key, relatie_id)
+                else:
+                    lookup[key] = relatie_id
+
+    def _unindex(self, relatie_id: str):
+        old = self._by_id.pop(relatie_id, None)
+        if not old:
+            return
+        for lookup, key in self._keys(old):
+            if key and lookup.get(key) == relatie_id:
+                del lookup[key]
+
+    def _keys(self, relatie: Dict):
+        """(lookup, key) paren waaronder een relatie geïndexeerd wordt."""
+        return (
+            (self._by_code, str(relatie.get("relatiecode") or "").lower()),
+            (self._by_kvk, normalize_kvk(relatie.get("kvkNummer"))),
+            (self._by_email, (relatie.get("email") or "").strip().lower()),
+            (self._by_name, normalize_name(relatie.get("naam"))),
+        )
+
+    def _ensure_loaded(self):
+        """Bouw de lookups op uit de tabel (eenmalig)."""
+        if self._loaded:
+            return
+
+        db = get_db()
+        with db.session() as session:
+            rows = session.query(SnelstartRelatieRecord.data).all()
+
+        with self._lock:
+            if self._loaded:
+                return
+            for (data,) in rows:
+                try:
+                    self._index(json.loads(data))
+                except (TypeError, ValueError):
+                    continue
+            self._loaded = True
+
+        logger.debug(f"Loaded {len(rows)} Snelstart relaties into memory")
+
+    # === REFRESH ===
+
+    def refresh(self, full: bool = False) -> bool:
+        """
+        Haal nieuwe en gewijzigde relaties op uit Snelstart.
+
+        Args:
+            full: Alles opnieuw ophalen en relaties die niet meer bestaan verwijderen
+
+        Returns:
+            True als alle pagina's opgehaald zijn
+        """
+        self._ensure_loaded()
+
+        since = None if full else self.cursors.since(CURSOR_KEY)
+        if since is None and not full and not self._by_id:
+            full = True
+
+        seen: Set[str] = set()
+        fetched = 0
+        newest: Optional[Tuple[str, str]] = None  # (modifiedOn, id) van een volledige sweep
+
+        # De volgende pagina wordt al opgehaald terwijl deze weggeschreven wordt
+        pages = self.api.iter_pages(
+            lambda skip, top: self.api.get_relaties(skip=skip, top=top, modified_since=since),
+            PAGE_SIZE
+        )
+        try:
+            for page in pages:
+                # Een sweep zonder `since` komt ongesorteerd terug: de cursor
+                # mag pas verschuiven als alle pagina's binnen zijn
+                self._store_page(page, advance_cursor=not full)
+                seen.update(r["id"] for r in page if r.get("id"))
+                fetched += len(page)
+                if full:
+                    modified = [(r["modifiedOn"], r["id"]) for r in page if r.get("modifiedOn") and r.get("id")]
+                    if modified and (newest is None or max(modified) > newest):
+                        newest = max(modified)
+        except SnelstartPagingError as e:
+            logger.error(f"Snelstart relatie refresh failed: {e}")
+            return False
+
+        if full:
+            if newest:
+                db = get_db()
+                with db.session() as session:
+                    self.cursors.advance(session, CURSOR_KEY, *newest)
+                    session.commit()
+            self._remove_missing(seen)
+
+        logger.info(f"Snelstart relatie index refreshed: {fetched} {'total' if full else 'changed'}")
+        return True
+
+    def _store_page(self, page: List[Dict], advance_cursor: bool = True):
+        """Upsert een pagina relaties en verschuif de cursor in dezelfde transactie."""
+        relaties = [r for r in page if r.get("id")]
+        if not relaties:
+            return
+
+        db = get_db()
+        with db.session() as session:
+            existing = {
+                record.relatie_id: record
+                for record in session.query(SnelstartRelatieRecord).filter(
+                    SnelstartRelatieRecord.relatie_id.in_([r["id"] for r in relaties])
+                )
+            }
+
+            for relatie in relaties:
+                record = existing.get(relatie["id"])
+                if record is None:
+                    record = SnelstartRelatieRecord(relatie_id=relatie["id"])
+                    session.add(record)
+                    existing[relatie["id"]] = record
+                self._fill_record(record, relatie)
+
+            modified = [(r["modifiedOn"], r["id"]) for r in relaties if r.get("modifiedOn")]
+            if modified and advance_cursor:
+                self.cursors.advance(session, CURSOR_KEY, *max(modified))
+            session.commit()
+
+        with self._lock:
+            for relatie in relaties:
+                self._index(relatie)
+
+    @staticmethod
+    def _fill_record(record: SnelstartRelatieRecord, relatie: Dict):
+        record.relatiecode = relatie.get("relatiecode")
+        record.naam = relatie.get("naam")
+        record.email = relatie.get("email")
+        record.kvk_nummer = relatie.get("kvkNummer")
+        record.modified_on = relatie.get("modifiedOn")
+        record.data = json.dumps(relatie)
+
+    def _remove_missing(self, seen: Set[str]):
+        """Verwijder relaties die bij een volledige refresh niet meer terugkwamen."""
+        with self._lock:
+            missing = [relatie_id for relatie_id in self._by_id if relatie_id not in seen]
+            for relatie_id in missing:
+                self._unindex(relatie_id)
+
+        if not missing:
+            return
+
+        db = get_db()
+        with db.session() as session:
+            session.query(SnelstartRelatieRecord).filter(
+                SnelstartRelatieRecord.relatie_id.in_(missing)
+            ).delete(synchronize_session=False)
+            session.commit()
+
+        logger.info(f"Removed {len(missing)} relaties no longer in Snelstart")
+
+    def add(self, *relaties: Dict):
+        """
+        Voeg zojuist aangemaakte of bijgewerkte relaties direct toe.
+
+        De cursor blijft staan: andere relaties die sinds de vorige refresh
+        gewijzigd zijn moeten de volgende keer nog binnenkomen.
+        """
+        self._store_page(list(relaties), advance_cursor=False)
+
+    # === LOOKUPS ===
+
+    def get(self, relatie_id: str) -> Optional[Dict]:
+        self._ensure_loaded()
+        with self._lock:
+            return self._by_id.get(relatie_id)
+
+    def match(
+        self,
+        relatiecode: str = None,
+        kvk: str = None,
+        email: str = None,
+        name: str = None
+    ) -> Optional[Dict]:
+        """
+        Zoek een bestaande relatie (sterkste match eerst).
+
+        Volgorde: relatiecode, KvK nummer, email, genormaliseerde naam.
+        """
+        self._ensure_loaded()
+
+        candidates = self._keys({
+            "relatiecode": relatiecode, "kvkNummer": kvk, "email": email, "naam": name,
+        })
+
+        with self._lock:
+            for lookup, key in candidates:
+                if key and key in lookup:
+                    return self._by_id.get(lookup[key])
+        return None
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        with self._lock:
+            return len(self._by_id)
+
+
+# Global instance
+_relatie_index: Optional[RelatieIndex] = None
+
+
+def get_relatie_index() -> RelatieIndex:
+    """Get the global Snelstart relatie index instance."""
+    global _relatie_index
+    if _relatie_index is None:
+        _relatie_index = RelatieIndex()
+    return _relatie_index
@@ -2,16 +2,25 @@
 Snelstart Sync Service - Synchronisatie van facturen en klanten met Snelstart.
 """
 
-import threading
-import time
 from datetime import datetime
-from typing import Optional, List, Dict, Tuple, Callable
+from itertools import islice
+from typing import Optional, List, Dict, Set, Tuple, Callable
 from dataclasses import dataclass
 
 from ..database import get_db
 from ..database.models import Invoice, InvoiceType, InvoiceStatus, Client
 from ..utils.config import Config, logger
-from .snelstart_api import get_snelstart_api, SnelstartStatus
+from .snelstart_api import get_snelstart_api, SnelstartStatus, SnelstartPagingError
+from .orchestrator import get_orchestrator, SNELSTART_GROUP
+from .snelstart_relaties import get_relatie_index
+from .snelstart_push import PushPipeline, MAX_IN_FLIGHT
+from .sync_outbox import get_outbox_store
+from .snelstart_reference import get_reference_cache
+
+
+# Klant lijkt op een bestaande relatie (alleen de naam komt overeen): niet
+# automatisch koppelen of aanmaken, eerst handmatig bevestigen
+REVIEW_STATUS = "review"
 
 
 @dataclass
@@ -38,11 +47,10 @@ class SnelstartSyncService:
     
     def __init__(self):
         self.api = get_snelstart_api()
-        
-        # Cache for grootboekrekeningen
-        self._grootboek_cache: Optional[List[Dict]] = None
-        self._grootboek_cache_time: Optional[datetime] = None
-        self._grootboek_cache_duration = 3600  # 1 hour
+        self.relaties = get_relatie_index()
+        self.outbox = get_outbox_store()
+        self.reference = get_reference_cache()
+        self.max_in_flight = MAX_IN_FLIGHT
         
         # Default grootboek for revenue (usually 8000-range)
         self._default_grootboek_id: Optional[str] = None
@@ -55,24 +63,13 @@ class SnelstartSyncService:
         if self._default_grootboek_id:
             return self._default_grootboek_id
         
-        # Check cache
-        if self._grootboek_cache and self._grootboek_cache_time:
-            if (datetime.now() - self._grootboek_cache_time).seconds < self._grootboek_cache_duration:
-                pass  # Use cache
-            else:
-                self._grootboek_cache = None
-        
-        if not self._grootboek_cache:
-            success, data = self.api.get_grootboekrekeningen()
-            if success and isinstance(data, list):
-                self._grootboek_cache = data
-                self._grootboek_cache_time = datetime.now()
-            else:
-                logger.error("Failed to fetch grootboekrekeningen")
-                return None
+        grootboekrekeningen = self.reference.get("grootboekrekeningen")
+        if not grootboekrekeningen:
+            logger.error("Failed to fetch grootboekrekeningen")
+            return None
         
         # Find omzet rekening (usually starts with 8)
-        for gb in self._grootboek_cache:
+        for gb in grootboekrekeningen:
             nummer = gb.get("nummer", 0)
             if 8000 <= nummer < 9000:
                 self._default_grootboek_id = gb.get("id")
@@ -80,11 +77,8 @@ class SnelstartSyncService:
                 return self._default_grootboek_id
         
         # Fallback: use first available
-        if self._grootboek_cache:
-            self._default_grootboek_id = self._grootboek_cache[0].get("id")
-            return self._default_grootboek_id
-        
-        return None
+        self._default_grootboek_id = grootboekrekeningen[0].get("id")
+        return self._default_grootboek_id
     
     # =========================================================================
     # Client → Relatie Sync
@@ -107,18 +101,62 @@ class SnelstartSyncService:
         if client.snelstart_relatie_id:
             # Update existing
             return self._update_relatie(client)
-        else:
-            # Create new
-            return self._create_relatie(client)
+        
+        # Bestaande relatie in de lokale mirror (bv. eerder handmatig aangemaakt);
+        # eerst bijwerken, anders volgt bij een lege of oude mirror een dubbele relatie
+        if not self.relaties.refresh():
+            logger.warning("Snelstart relatie index not refreshed, matching against local copy")
+        match, needs_review = self._match_relatie(client)
+        if match:
+            return self._link_relatie(client, match)
+        if needs_review:
+            self._set_client_status(client.id, REVIEW_STATUS)
+            return False, "Relatie met dezelfde naam bestaat al in Snelstart; handmatig bevestigen"
+        
+        # Create new
+        return self._create_relatie(client)
     
-    def _create_relatie(self, client: Client) -> Tuple[bool, str]:
-        """Create new relatie in Snelstart."""
-        # Generate unique relatiecode
-        relatiecode = f"RT{client.id:05d}"
+    def _match_relatie(self, client: Client) -> Tuple[Optional[Dict], bool]:
+        """
+        Zoek een bestaande relatie om de klant automatisch aan te koppelen.
         
-        # Build relatie object
+        Alleen relatiecode en email zijn sterk genoeg om te koppelen (en de
+        relatie daarna bij te werken). Een treffer op alleen de naam kan een
+        andere relatie zijn: die wordt niet gekoppeld maar gemeld.
+        
+        Returns:
+            (relatie of None, True als een naam-match handmatig bevestigd moet worden)
+        """
+        match = self.relaties.match(relatiecode=self._relatiecode(client), email=client.email)
+        if match:
+            return match, False
+        
+        name_match = self.relaties.match(name=client.company or client.name)
+        if name_match:
+            logger.warning(
+                f"Client {client.id} matches Snelstart relatie {name_match['id']} on name only; "
+                f"not linking automatically, needs manual confirmation"
+            )
+            return None, True
+        return None, False
+    
+    @staticmethod
+    def _set_client_status(client_id: int, status: str):
+        db = get_db()
+        with db.session() as session:
+            db_client = session.query(Client).get(client_id)
+            if db_client:
+                db_client.snelstart_sync_status = status
+                session.commit()
+    
+    @staticmethod
+    def _relatiecode(client: Client) -> str:
+        return f"RT{client.id:05d}"
+    
+    @staticmethod
+    def _relatie_payload(client: Client) -> Dict:
+        """Velden die vanuit de Portal naar de Snelstart relatie gaan."""
         relatie = {
-            "relatiecode": relatiecode,
             "naam": client.company or client.name,
             "email": client.email,
             "telefoon": client.phone,
@@ -130,10 +168,49 @@ class SnelstartSyncService:
                 "straat": client.address,
             }
         
+        return relatie
+    
+    @staticmethod
+    def _relatie_differs(relatie: Dict, payload: Dict) -> bool:
+        """True als de relatie in Snelstart afwijkt van de Portal gegevens."""
+        for key, value in payload.items():
+            current = relatie.get(key)
+            if isinstance(value, dict):
+                current = current or {}
+                if any((current.get(k) or None) != (v or None) for k, v in value.items()):
+                    return True
+            elif (current or None) != (value or None):
+                return True
+        return False
+    
+    def _link_relatie(self, client: Client, relatie: Dict) -> Tuple[bool, str]:
+        """Koppel een klant aan een bestaande relatie uit de mirror."""
+        relatie_id = relatie["id"]
+        
+        db = get_db()
+        with db.session() as session:
+            db_client = session.query(Client).get(client.id)
+            if db_client:
+                db_client.snelstart_relatie_id = relatie_id
+                db_client.snelstart_sync_status = "synced"
+                session.commit()
+        
+        client.snelstart_relatie_id = relatie_id
+        logger.info(f"Linked client {client.id} to existing Snelstart relatie {relatie_id}")
+        
+        if self._relatie_differs(relatie, self._relatie_payload(client)):
+            return self._update_relatie(client)
+        return True, relatie_id
+    
+    def _create_relatie(self, client: Client) -> Tuple[bool, str]:
+        """Create new relatie in Snelstart."""
+        relatie = {"relatiecode": self._relatiecode(client), **self._relatie_payload(client)}
+        
         success, data = self.api.create_relatie(relatie)
         
         if success:
             relatie_id = data.get("id")
+            self.relaties.add({**relatie, **data})
             
             # Update client in database
             db = get_db()
@@ -160,19 +237,17 @@ class SnelstartSyncService:
     
     def _update_relatie(self, client: Client) -> Tuple[bool, str]:
         """Update existing relatie in Snelstart."""
-        relatie = {
-            "id": client.snelstart_relatie_id,
-            "naam": client.company or client.name,
-            "email": client.email,
-            "telefoon": client.phone,
-        }
+        payload = self._relatie_payload(client)
         
-        if client.address:
-            relatie["vestigingsAdres"] = {
-                "straat": client.address,
-            }
-        
-        success, data = self.api.update_relatie(client.snelstart_relatie_id, relatie)
+        # Ongewijzigd ten opzichte van de mirror: geen PUT nodig
+        known = self.relaties.get(client.snelstart_relatie_id)
+        if known and not self._relatie_differs(known, payload):
+            success, data = True, None
+        else:
+            relatie = {"id": client.snelstart_relatie_id, **payload}
+            success, data = self.api.update_relatie(client.snelstart_relatie_id, relatie)
+            if success:
+                self.relaties.add({**(known or {}), **relatie, **(data if isinstance(data, dict) else {})})
         
         if success:
             db = get_db()
@@ -189,38 +264,181 @@ class SnelstartSyncService:
             return False, str(data)
     
     def sync_all_clients(self) -> SyncResult:
-        """Sync all clients that need syncing to Snelstart."""
+        """
+        Sync all clients that need syncing to Snelstart.
+        
+        Naast nieuwe en eerder mislukte klanten alleen klanten met
+        wijzigingen in de outbox; meerdere edits aan één klant zijn dan al
+        samengevoegd tot één push.
+        """
         result = SyncResult()
         
         if not self.api.is_configured():
             result.errors = 1
             result.error_messages.append("Snelstart API niet geconfigureerd")
+            # Oude regels kunnen nergens heen; niet laten oplopen
+            self.outbox.clear("client")
             return result
         
+        # Eén paging sweep (alleen wijzigingen sinds de vorige keer) in plaats
+        # van een zoek-request per klant
+        if not self.relaties.refresh():
+            logger.warning("Snelstart relatie index not refreshed, matching against local copy")
+        
+        changes = self.outbox.pending("client")
+        changed_ids = [change.entity_id for change in changes.values() if not change.deleted]
+        
         db = get_db()
         with db.session() as session:
             # Get clients that need syncing
             clients = session.query(Client).filter(
                 (Client.snelstart_sync_status == None) |
                 (Client.snelstart_sync_status == "pending") |
-                (Client.snelstart_sync_status == "error")
+                (Client.snelstart_sync_status == "error") |
+                Client.id.in_(changed_ids)
             ).all()
-            
-            for client in clients:
-                success, msg = self.sync_client_to_snelstart(client)
-                if success:
-                    result.synced += 1
-                else:
-                    result.errors += 1
-                    result.error_messages.append(f"Client {client.id}: {msg}")
+            session.expunge_all()
+        
+        for client in clients:
+            change = changes.get(client.id)
+            if change and change.fields:
+                logger.debug(f"Client {client.id} changed: {', '.join(sorted(change.fields))} ({change.entries} edits)")
+        
+        pipeline = PushPipeline(self.max_in_flight)
+        mirrored: List[Dict] = []
+        failed: Set[int] = set()
+        for client in clients:
+            self._queue_client(pipeline, client, result, mirrored, failed)
+        pipeline.run()
+        self.relaties.add(*mirrored)
+        
+        # Mislukte pushes blijven in de outbox voor de volgende run
+        self.outbox.ack("client", [c for c in changes.values() if c.entity_id not in failed])
         
         logger.info(f"Client sync complete: {result.synced} synced, {result.errors} errors")
         return result
     
+    def _queue_client(
+        self,
+        pipeline: PushPipeline,
+        client: Client,
+        result: SyncResult,
+        mirrored: List[Dict],
+        failed: Set[int] = None
+    ) -> bool:
+        """
+        Plan de push van één klant.
+        
+        Matching tegen de mirror gebeurt direct; alleen creates en echte
+        updates gaan als request de pipeline in. `client` is een losgekoppeld
+        object en krijgt na een create het nieuwe relatie id.
+        
+        Returns:
+            False als de klant geen relatie krijgt (handmatig bevestigen);
+            facturen van de klant kunnen dan niet geboekt worden
+        """
+        key = ("client", client.id)
+        payload = self._relatie_payload(client)
+        
+        if not client.snelstart_relatie_id:
+            match, needs_review = self._match_relatie(client)
+            if match:
+                client.snelstart_relatie_id = match["id"]
+                logger.info(f"Linked client {client.id} to existing Snelstart relatie {match['id']}")
+            elif needs_review:
+                # Geen create (mogelijk dubbel) en geen update van een vreemde relatie
+                pipeline.write(Client, {"id": client.id, "snelstart_sync_status": REVIEW_STATUS})
+                result.skipped += 1
+                return False
+        
+        def synced(relatie_id: str, created: bool = False):
+            client.snelstart_relatie_id = relatie_id
+            # Een nieuw relatie id direct opslaan, anders volgt een dubbele create
+            pipeline.write(Client, {
+                "id": client.id,
+                "snelstart_relatie_id": relatie_id,
+                "snelstart_sync_status": "synced",
+            }, immediate=created)
+            result.synced += 1
+            return True
+        
+        def on_error(message: str, status: Optional[str]):
+            if failed is not None:
+                failed.add(client.id)
+            if status:
+                pipeline.write(Client, {"id": client.id, "snelstart_sync_status": status})
+            result.errors += 1
+            result.error_messages.append(f"Client {client.id}: {message}")
+            logger.error(f"Failed to sync Snelstart relatie for client {client.id}: {message}")
+            return False
+        
+        if client.snelstart_relatie_id:
+            relatie_id = client.snelstart_relatie_id
+            known = self.relaties.get(relatie_id)
+            
+            # Ongewijzigd ten opzichte van de mirror: geen PUT nodig
+            if known and not self._relatie_differs(known, payload):
+                synced(relatie_id)
+                return True
+            
+            relatie = {"id": relatie_id, **payload}
+            
+            def on_update(success, data):
+                if not success:
+                    return on_error(str(data), None)
+                mirrored.append({**(known or {}), **relatie, **(data if isinstance(data, dict) else {})})
+                return synced(relatie_id)
+            
+            pipeline.submit(key, lambda: self.api.update_relatie(relatie_id, relatie), on_update)
+            return True
+        else:
+            relatie = {"relatiecode": self._relatiecode(client), **payload}
+            
+            def on_create(success, data):
+                if not success or not isinstance(data, dict) or not data.get("id"):
+                    return on_error(str(data), "error")
+                mirrored.append({**relatie, **data})
+                logger.info(f"Created Snelstart relatie {data['id']} for client {client.id}")
+                try:
+                    return synced(data["id"], created=True)
+                except Exception as e:
+                    return on_error(f"Relatie {data['id']} aangemaakt maar niet opgeslagen: {e}", None)
+            
+            pipeline.submit(key, lambda: self.api.create_relatie(relatie), on_create)
+            return True
+    
     # =========================================================================
     # Invoice → Verkoopboeking Sync
     # =========================================================================
     
+    @staticmethod
+    def _factuur_payload(invoice: Invoice, relatie_id: str, grootboek_id: str) -> Dict:
+        """Build het verkoopfactuur object voor Snelstart."""
+        factuur_datum = invoice.invoice_date.strftime("%Y-%m-%d") if invoice.invoice_date else datetime.now().strftime("%Y-%m-%d")
+        
+        factuur = {
+            "relatie": {"id": relatie_id},
+            "factuurdatum": factuur_datum,
+            "boekstuk": invoice.invoice_number,
+            "omschrijving": invoice.description or f"Factuur {invoice.invoice_number}",
+            "regels": [
+                {
+                    "bedrag": invoice.amount_excl_vat,
+                    "omschrijving": invoice.description or "Diensten",
+                    "grootboek": {"id": grootboek_id},
+                }
+            ]
+        }
+        
+        # Add BTW if applicable
+        if invoice.vat_percentage > 0:
+            # Snelstart handles BTW automatically based on grootboek settings
+            factuur["regels"][0]["btw"] = {
+                "btwSoort": "Hoog" if invoice.vat_percentage >= 21 else "Laag"
+            }
+        
+        return factuur
+    
     def sync_invoice_to_snelstart(self, invoice: Invoice) -> Tuple[bool, str]:
         """
         Synchroniseer een factuur naar Snelstart als verkoopboeking.
@@ -269,29 +487,7 @@ class SnelstartSyncService:
             # Try to find or create relatie by company name
             return False, "Geen gekoppelde klant gevonden"
         
-        # Build factuur object
-        factuur_datum = invoice.invoice_date.strftime("%Y-%m-%d") if invoice.invoice_date else datetime.now().strftime("%Y-%m-%d")
-        
-        factuur = {
-            "relatie": {"id": relatie_id},
-            "factuurdatum": factuur_datum,
-            "boekstuk": invoice.invoice_number,
-            "omschrijving": invoice.description or f"Factuur {invoice.invoice_number}",
-            "regels": [
-                {
-                    "bedrag": invoice.amount_excl_vat,
-                    "omschrijving": invoice.description or "Diensten",
-                    "grootboek": {"id": grootboek_id},
-                }
-            ]
-        }
-        
-        # Add BTW if applicable
-        if invoice.vat_percentage > 0:
-            # Snelstart handles BTW automatically based on grootboek settings
-            factuur["regels"][0]["btw"] = {
-                "btwSoort": "Hoog" if invoice.vat_percentage >= 21 else "Laag"
-            }
+        factuur = self._factuur_payload(invoice, relatie_id, grootboek_id)
         
         success, data = self.api.create_verkoopfactuur(factuur)
         
@@ -326,35 +522,177 @@ class SnelstartSyncService:
             return False, str(data)
     
     def sync_all_invoices(self) -> SyncResult:
-        """Sync all invoices that need syncing to Snelstart."""
+        """
+        Sync all invoices that need syncing to Snelstart.
+        
+        Facturen van een klant zonder relatie wachten in de pipeline tot de
+        relatie aangemaakt is, in plaats van de klant inline te synchroniseren.
+        Kan de klant geen relatie krijgen (naam-match die bevestigd moet
+        worden) of mislukt de relatie, dan blijven zijn facturen op pending.
+        Outbox wijzigingen aan al geboekte facturen kunnen niet meer naar
+        Snelstart en worden alleen gelogd.
+        """
         result = SyncResult()
         
         if not self.api.is_configured():
             result.errors = 1
             result.error_messages.append("Snelstart API niet geconfigureerd")
+            self.outbox.clear("invoice")
             return result
         
+        changes = self.outbox.pending("invoice")
+        
         db = get_db()
         with db.session() as session:
             # Get outgoing invoices that need syncing
             invoices = session.query(Invoice).filter(
                 Invoice.invoice_type == InvoiceType.OUTGOING.value,
                 Invoice.status.in_([InvoiceStatus.SENT.value, InvoiceStatus.PAID.value]),
+                Invoice.snelstart_id == None,
                 (Invoice.snelstart_sync_status == None) |
                 (Invoice.snelstart_sync_status == "pending")
             ).all()
             
-            for invoice in invoices:
-                success, msg = self.sync_invoice_to_snelstart(invoice)
-                if success:
-                    result.synced += 1
+            if changes:
+                booked = session.query(Invoice.invoice_number, Invoice.id).filter(
+                    Invoice.id.in_(list(changes)),
+                    Invoice.snelstart_id != None
+                ).all()
+                for invoice_number, invoice_id in booked:
+                    fields = changes[invoice_id].fields - {"status"}
+                    if fields and not changes[invoice_id].created:
+                        logger.warning(
+                            f"Invoice {invoice_number} changed after booking in Snelstart "
+                            f"({', '.join(sorted(fields))}); correct it in Snelstart"
+                        )
+            
+            # Alle klanten in één query
+            client_ids = {invoice.client_id for invoice in invoices if invoice.client_id}
+            clients = {
+                client.id: client
+                for client in session.query(Client).filter(Client.id.in_(client_ids))
+            } if client_ids else {}
+            session.expunge_all()
+        
+        if not invoices:
+            self.outbox.ack("invoice", changes.values())
+            logger.info("Invoice sync complete: nothing to sync")
+            return result
+        
+        # Get grootboek for revenue
+        grootboek_id = self._get_grootboek_omzet()
+        if not grootboek_id:
+            result.errors = len(invoices)
+            result.error_messages.append("Geen grootboekrekening gevonden voor omzet")
+            return result
+        
+        # Klanten zonder relatie worden tegen de mirror gematcht: eerst bijwerken
+        if any(not client.snelstart_relatie_id for client in clients.values()):
+            if not self.relaties.refresh():
+                logger.warning("Snelstart relatie index not refreshed, matching against local copy")
+        
+        pipeline = PushPipeline(self.max_in_flight)
+        client_result = SyncResult()
+        mirrored: List[Dict] = []
+        queued_clients = set()
+        blocked_clients = set()  # geen relatie mogelijk: facturen blijven pending
+        failed: Set[int] = set()
+        
+        for invoice in invoices:
+            client = clients.get(invoice.client_id)
+            if not client:
+                result.errors += 1
+                result.error_messages.append(f"Invoice {invoice.invoice_number}: Geen gekoppelde klant gevonden")
+                failed.add(invoice.id)
+                continue
+            
+            # Klant zonder relatie: eerst de relatie, de factuur wacht daarop
+            if not client.snelstart_relatie_id and client.id not in queued_clients | blocked_clients:
+                if client.snelstart_sync_status != REVIEW_STATUS and self._queue_client(
+                    pipeline, client, client_result, mirrored
+                ):
+                    queued_clients.add(client.id)
                 else:
-                    result.errors += 1
-                    result.error_messages.append(f"Invoice {invoice.invoice_number}: {msg}")
+                    blocked_clients.add(client.id)
+            
+            if client.id in blocked_clients:
+                result.skipped += 1
+                failed.add(invoice.id)
+                logger.info(f"Invoice {invoice.invoice_number} waits for client {client.id} to be confirmed")
+                continue
+            
+            after = ("client", client.id) if client.id in queued_clients else None
+            self._queue_invoice(pipeline, invoice, client, grootboek_id, result, failed, after)
+        
+        pipeline.run()
+        self.relaties.add(*mirrored)
         
+        # Niet (meer) te boeken wijzigingen zijn hiermee ook verwerkt
+        self.outbox.ack("invoice", [c for c in changes.values() if c.entity_id not in failed])
+        
+        if queued_clients:
+            logger.info(f"Synced {client_result.synced} clients for invoices, {client_result.errors} errors")
         logger.info(f"Invoice sync complete: {result.synced} synced, {result.errors} errors")
         return result
     
+    def _queue_invoice(
+        self,
+        pipeline: PushPipeline,
+        invoice: Invoice,
+        client: Client,
+        grootboek_id: str,
+        result: SyncResult,
+        failed: Set[int],
+        after=None
+    ):
+        """Plan de push van één factuur (eventueel na de relatie van de klant)."""
+        def send():
+            # Pas hier lezen: bij een afhankelijke taak is het relatie id net gezet
+            factuur = self._factuur_payload(invoice, client.snelstart_relatie_id, grootboek_id)
+            return self.api.create_verkoopfactuur(factuur)
+        
+        def on_result(success, data):
+            if not success and after is not None and not client.snelstart_relatie_id:
+                # Relatie niet aangemaakt (fout staat bij de klant): opnieuw bij de volgende run
+                failed.add(invoice.id)
+                result.skipped += 1
+                logger.warning(f"Invoice {invoice.invoice_number} not synced, client relatie missing: {data}")
+                return False
+            if not success or not isinstance(data, dict):
+                return on_error(str(data))
+            
+            # Boeking bestaat nu in Snelstart: id direct opslaan
+            try:
+                pipeline.write(Invoice, {
+                    "id": invoice.id,
+                    "snelstart_id": data.get("id"),
+                    "snelstart_relatie_id": client.snelstart_relatie_id,
+                    "snelstart_sync_status": "synced",
+                    "snelstart_last_sync": datetime.now(),
+                    "snelstart_error": None,
+                }, immediate=True)
+            except Exception as e:
+                return on_error(f"Boeking {data.get('id')} aangemaakt maar niet opgeslagen: {e}", write_status=False)
+            
+            result.synced += 1
+            logger.info(f"Synced invoice {invoice.invoice_number} to Snelstart: {data.get('id')}")
+            return True
+        
+        def on_error(message: str, write_status: bool = True):
+            failed.add(invoice.id)
+            if write_status:
+                pipeline.write(Invoice, {
+                    "id": invoice.id,
+                    "snelstart_sync_status": "error",
+                    "snelstart_error": message[:500],
+                })
+            result.errors += 1
+            result.error_messages.append(f"Invoice {invoice.invoice_number}: {message}")
+            logger.error(f"Failed to sync invoice {invoice.invoice_number}: {message}")
+            return False
+        
+        pipeline.submit(("invoice", invoice.id), send, on_result, after=after)
+    
     def sync_all(self) -> Tuple[SyncResult, SyncResult]:
         """
         Sync all clients and invoices to Snelstart.
@@ -384,11 +722,17 @@ class SnelstartSyncService:
     
     def get_snelstart_relaties(self) -> Tuple[bool, List[Dict]]:
         """Fetch all relaties from Snelstart."""
-        return self.api.get_relaties(top=500)
+        try:
+            return True, list(self.api.iter_relaties())
+        except SnelstartPagingError as e:
+            return False, str(e)
     
-    def get_snelstart_facturen(self) -> Tuple[bool, List[Dict]]:
-        """Fetch recent facturen from Snelstart."""
-        return self.api.get_verkoopfacturen(top=100)
+    def get_snelstart_facturen(self, limit: int = None) -> Tuple[bool, List[Dict]]:
+        """Fetch verkoopfacturen from Snelstart (all, or the first `limit`)."""
+        try:
+            return True, list(islice(self.api.iter_verkoopfacturen(), limit))
+        except SnelstartPagingError as e:
+            return False, str(e)
 
 
 # Singleton
@@ -408,7 +752,9 @@ def get_snelstart_sync_service() -> SnelstartSyncService:
 # =============================================================================
 
 class SnelstartSyncScheduler:
-    """Background scheduler for automatic Snelstart sync."""
+    """Background scheduler for automatic Snelstart sync (job in the sync orchestrator)."""
+    
+    JOB_NAME = "snelstart_sync"
     
     _instance = None
     
@@ -424,7 +770,6 @@ class SnelstartSyncScheduler:
         
         self._initialized = True
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         self._interval = Config.SNELSTART_SYNC_INTERVAL * 60  # Convert to seconds
         self._on_sync_complete: Optional[Callable] = None
         self._sync_service = get_snelstart_sync_service()
@@ -456,39 +801,48 @@ class SnelstartSyncScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self._thread.start()
+        get_orchestrator().add_job(
+            self.JOB_NAME,
+            self._scheduled_sync,
+            interval=self._interval,
+            initial_delay=60,
+            group=SNELSTART_GROUP
+        )
         logger.info(f"Snelstart sync scheduler started (interval: {Config.SNELSTART_SYNC_INTERVAL} min)")
     
     def stop(self):
         """Stop the scheduler."""
         self._running = False
+        get_orchestrator().remove_job(self.JOB_NAME)
     
     def sync_now(self) -> Tuple[SyncResult, SyncResult]:
         """Execute sync immediately."""
-        return self._sync_service.sync_all()
+        # Through the orchestrator, so it never overlaps a scheduled sync
+        if self._running:
+            return get_orchestrator().run_now(self.JOB_NAME).result()
+        return self._run_once(self.JOB_NAME, self._sync_service.sync_all)
     
-    def _sync_loop(self):
-        """Background sync loop."""
-        # Initial delay
-        time.sleep(60)
+    def sync_clients_now(self) -> SyncResult:
+        """Sync only clients, never alongside another Snelstart sync."""
+        return self._run_once("snelstart_clients", self._sync_service.sync_all_clients)
+    
+    def sync_invoices_now(self) -> SyncResult:
+        """Sync only invoices, never alongside another Snelstart sync."""
+        return self._run_once("snelstart_invoices", self._sync_service.sync_all_invoices)
+    
+    @staticmethod
+    def _run_once(name: str, func: Callable):
+        return get_orchestrator().run_once(name, func, group=SNELSTART_GROUP).result()
+    
+    def _scheduled_sync(self) -> Tuple[SyncResult, SyncResult]:
+        """Job function: sync and notify the callback."""
+        client_result, invoice_result = self._sync_service.sync_all()
+        self._last_sync = datetime.now()
         
-        while self._running:
-            try:
-                client_result, invoice_result = self._sync_service.sync_all()
-                self._last_sync = datetime.now()
-                
-                if self._on_sync_complete:
-                    self._on_sync_complete(client_result, invoice_result)
-                    
-            except Exception as e:
-                logger.error(f"Snelstart sync error: {e}")
-            
-            # Wait for interval
-            waited = 0
-            while waited < self._interval and self._running:
-                time.sleep(5)
-                waited += 5
+        if self._on_sync_complete:
+            self._on_sync_complete(client_result, invoice_result)
+        
+        return client_result, invoice_result
 
 
 # Global scheduler
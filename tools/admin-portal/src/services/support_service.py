@@ -11,12 +11,9 @@ Features:
 
 import os
 import json
-import requests
 import threading
-import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Tuple
-from openai import OpenAI
 
 from ..database import get_db
 from ..database.models import (
@@ -26,45 +23,32 @@ from ..database.models import (
     IssueStatus, IssueSeverity
 )
 from ..utils.config import Config, logger
+from .website_api import get_website_api
+from .sync_cursor import get_sync_cursor_store, sort_by_position
 from .ai_troubleshooter import get_troubleshooter
+from .similarity_index import get_similarity_index
+from .orchestrator import get_orchestrator, WEBSITE_GROUP
 
 
 class SupportService:
     """Service voor customer support ticket management."""
     
     def __init__(self):
-        self.api_url = Config.WEBSITE_API_URL
-        self.api_key = Config.WEBSITE_ADMIN_API_KEY
+        self.api = get_website_api()
+        self.cursors = get_sync_cursor_store()
         self.openai_key = os.getenv("OPENAI_API_KEY")
         self.client = None
         
         if self.openai_key:
             try:
+                from openai import OpenAI  # lazy: zware import, alleen nodig met API key
                 self.client = OpenAI(api_key=self.openai_key)
             except Exception as e:
                 logger.warning(f"Failed to initialize OpenAI client: {e}")
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
-        """Make authenticated API request to website."""
-        url = f"{self.api_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=30,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Support API request failed: {e}")
-            return None
+        """Make authenticated API request to website (shared pooled client)."""
+        return self.api.call(method, endpoint, **kwargs)
     
     def sync_tickets_from_website(self) -> Tuple[int, int, List[str]]:
         """
@@ -76,8 +60,13 @@ class SupportService:
         """
         logger.info("Starting ticket sync from website (v1/sync API)...")
         
-        # Try v1/sync/tickets first (new API)
-        result = self._make_request("GET", "/v1/sync/tickets?limit=50")
+        # Try v1/sync/tickets first (new API), vanaf de laatste cursor
+        params = {"limit": 50}
+        since = self.cursors.since("tickets")
+        if since:
+            params["since"] = since
+        
+        result = self._make_request("GET", "/v1/sync/tickets", params=params, conditional=True)
         
         if result and result.get("success"):
             # v1 API - data is in 'data' field
@@ -99,6 +88,11 @@ class SupportService:
         error_messages = []
         synced_ids = []
         
+        # Cursor gaat alleen vooruit zolang er geen ticket mislukt is; de
+        # website levert nieuwste eerst, dus oplopend verwerken
+        advance_cursor = True
+        tickets = sort_by_position(tickets)
+        
         db = get_db()
         
         for web_ticket in tickets:
@@ -129,6 +123,9 @@ class SupportService:
                     
                     if existing:
                         synced_ids.append(web_ticket["id"])
+                        if advance_cursor:
+                            self.cursors.advance_to_item(session, "tickets", web_ticket)
+                            session.commit()
                         continue
                     
                     # Find or create client
@@ -177,6 +174,8 @@ class SupportService:
                     )
                     
                     session.add(ticket)
+                    if advance_cursor:
+                        self.cursors.advance_to_item(session, "tickets", web_ticket)
                     session.commit()
                     
                     synced_ids.append(web_ticket["id"])
@@ -192,10 +191,15 @@ class SupportService:
                     ).start()
                     
             except Exception as e:
+                advance_cursor = False
                 errors += 1
                 error_messages.append(f"Ticket {web_ticket.get('ticketNumber')}: {e}")
                 logger.error(f"Failed to sync ticket: {e}")
         
+        if errors:
+            # Mislukte tickets bij de volgende poll opnieuw ophalen (geen 304)
+            self.api.forget_cached("/v1/sync/tickets")
+        
         # Mark tickets as synced on website via v1 API
         if synced_ids:
             for ticket_id in synced_ids:
@@ -265,6 +269,18 @@ Customer: {ticket.customer_name} ({ticket.customer_email})
 Company: {ticket.company_name or 'N/A'}
 """
             
+            # Similar resolved tickets/issues as cheap context
+            try:
+                similar = get_similarity_index().search(
+                    f"{ticket.subject}\n{ticket.description}",
+                    exclude=f"ticket:{ticket.id}"
+                )
+            except Exception as e:
+                logger.warning(f"Similarity lookup failed: {e}")
+                similar = []
+            
+            result["similar"] = similar
+            
             if ticket.project:
                 context += f"""
 Related Project: {ticket.project.name}
@@ -272,6 +288,9 @@ Project URL: {ticket.project.url}
 Project Status: {ticket.project.current_status}
 """
             
+            if similar:
+                context += "\n" + get_similarity_index().format_context(similar) + "\n"
+            
             # AI Analysis
             messages = [
                 {
@@ -401,7 +420,7 @@ Antwoord in JSON:
             
             # Use AI troubleshooter to fix
             troubleshooter = get_troubleshooter()
-            fix_result = troubleshooter.analyze_and_fix(issue.id, auto_fix=True)
+            fix_result = troubleshooter.analyze_and_fix(issue.id, auto_fix=True, wait=True)
             
             # Update ticket based on result
             with db.session() as session:
@@ -668,6 +687,8 @@ def get_support_service() -> SupportService:
 class SupportSyncScheduler:
     """Background scheduler voor ticket synchronisatie."""
     
+    JOB_NAME = "support_sync"
+    
     _instance = None
     
     def __new__(cls):
@@ -682,7 +703,6 @@ class SupportSyncScheduler:
         
         self._initialized = True
         self._running = False
-        self._thread = None
         self._interval = 60  # Check every minute
         self._service = get_support_service()
     
@@ -691,27 +711,18 @@ class SupportSyncScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self._thread.start()
+        get_orchestrator().add_job(
+            self.JOB_NAME,
+            self._service.sync_tickets_from_website,
+            interval=self._interval,
+            initial_delay=15,
+            group=WEBSITE_GROUP
+        )
         logger.info("Support sync scheduler started")
     
     def stop(self):
         self._running = False
-    
-    def _sync_loop(self):
-        time.sleep(15)  # Initial delay
-        
-        while self._running:
-            try:
-                self._service.sync_tickets_from_website()
-            except Exception as e:
-                logger.error(f"Support sync error: {e}")
-            
-            # Wait
-            for _ in range(self._interval):
-                if not self._running:
-                    break
-                time.sleep(1)
+        get_orchestrator().remove_job(self.JOB_NAME)
 
 
 _support_scheduler = None
@@ -0,0 +1,139 @@
+"""
+Sync Cursor Store - Persistente incrementele sync posities per categorie.
+
+Elke syncer (forms, work orders, payments, tickets, ...) bewaart de
+timestamp en het id van het laatst verwerkte item. Bij de volgende sync
+(ook na een herstart) wordt die timestamp als `since` meegestuurd, zodat
+alleen de delta opgehaald wordt. De cursor wordt in dezelfde database
+sessie bijgewerkt als de data, zodat beide samen committen.
+"""
+
+from typing import Optional, Dict, List, Tuple, Iterable
+
+from ..database import get_db
+from ..database.models import SyncCursor
+from ..utils.config import logger
+
+
+# Velden waarin de website een wijzigings-/aanmaaktijd meestuurt (eerste match wint)
+TIMESTAMP_KEYS = (
+    "updatedAt", "updated_at",
+    "createdAt", "created_at",
+    "submittedAt", "submitted_at",
+    "paidAt",
+)
+
+
+def item_position(item: Dict, timestamp_keys: Iterable[str] = TIMESTAMP_KEYS) -> Optional[Tuple[str, str]]:
+    """Get (timestamp, id) van een API item, of None zonder timestamp."""
+    for key in timestamp_keys:
+        value = item.get(key)
+        if value:
+            return (str(value), str(item.get("id", "")))
+    return None
+
+
+def sort_by_position(items: Iterable[Dict]) -> List[Dict]:
+    """
+    Sorteer API items van oud naar nieuw op (timestamp, id).
+
+    De website levert nieuwste eerst. Een batch moet oplopend verwerkt
+    worden, anders schuift de cursor over een ouder item dat mislukt is.
+    Items zonder timestamp komen achteraan, in hun oorspronkelijke volgorde.
+    """
+    positioned = [(item_position(item), item) for item in items]
+    positioned.sort(key=lambda pair: (pair[0] is None, pair[0] or ("", "")))
+    return [item for _, item in positioned]
+
+
+class SyncCursorStore:
+    """Lees en verschuif sync cursors in de `sync_cursors` tabel."""
+
+    def get(self, category: str) -> Tuple[Optional[str], Optional[str]]:
+        """Get (last_timestamp, last_id) voor een categorie."""
+        db = get_db()
+        with db.session() as session:
+            cursor = session.query(SyncCursor).filter_by(category=category).first()
+            if not cursor:
+                return (None, None)
+            return (cursor.last_timestamp, cursor.last_id)
+
+    def since(self, category: str) -> Optional[str]:
+        """Get de `since` waarde voor de volgende fetch."""
+        return self.get(category)[0]
+
+    def advance(self, session, category: str, timestamp: str, item_id: str = None) -> bool:
+        """
+        Verschuif de cursor naar (timestamp, item_id) binnen een bestaande sessie.
+
+        De cursor gaat alleen vooruit; de caller commit samen met de data.
+
+        Returns:
+            True als de cursor verschoven is
+        """
+        if not timestamp:
+            return False
+
+        cursor = session.query(SyncCursor).filter_by(category=category).first()
+        if cursor is None:
+            cursor = SyncCursor(category=category)
+            session.add(cursor)
+
+        current = (cursor.last_timestamp or "", cursor.last_id or "")
+        if (timestamp, item_id or "") <= current:
+            return False
+
+        cursor.last_timestamp = timestamp
+        cursor.last_id = item_id
+        return True
+
+    def advance_to_item(self, session, category: str, item: Dict) -> bool:
+        """Verschuif de cursor naar de positie van een API item."""
+        position = item_position(item)
+        if not position:
+            return False
+        return self.advance(session, category, *position)
+
+    def advance_to_items(self, session, category: str, items: List[Dict]) -> bool:
+        """Verschuif de cursor naar het nieuwste item uit een batch."""
+        positions = [p for p in (item_position(item) for item in items) if p]
+        if not positions:
+            return False
+        return self.advance(session, category, *max(positions))
+
+    def reset(self, category: str = None):
+        """Verwijder één of alle cursors (volgende sync haalt alles op)."""
+        db = get_db()
+        with db.session() as session:
+            query = session.query(SyncCursor)
+            if category:
+                query = query.filter_by(category=category)
+            query.delete()
+            session.commit()
+
+        logger.info(f"Sync cursor reset: {category or 'all'}")
+
+    def get_all(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Get alle cursors (voor weergave in de GUI)."""
+        db = get_db()
+        with db.session() as session:
+            return {
+                cursor.category: {
+                    "last_timestamp": cursor.last_timestamp,
+                    "last_id": cursor.last_id,
+                    "updated_at": cursor.updated_at.isoformat() if cursor.updated_at else None,
+                }
+                for cursor in session.query(SyncCursor).all()
+            }
+
+
+# Global instance
+_cursor_store: Optional[SyncCursorStore] = None
+
+
+def get_sync_cursor_store() -> SyncCursorStore:
+    """Get the global sync cursor store instance."""
+    global _cursor_store
+    if _cursor_store is None:
+        _cursor_store = SyncCursorStore()
+    return _cursor_store
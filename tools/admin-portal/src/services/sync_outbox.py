@@ -0,0 +1,122 @@
+"""
+Sync Outbox - Lees en bevestig wijzigingen uit de `sync_outbox` tabel.
+
+De tabel wordt gevuld door de ORM hooks in `database/outbox.py`. Een
+syncer haalt per entity de openstaande wijzigingen op, samengevoegd per
+record: vijf edits aan dezelfde klant worden één push met de vereniging
+van de gewijzigde velden. Na een geslaagde push worden alleen de regels
+tot het moment van ophalen verwijderd; edits die tijdens de push binnen
+kwamen blijven staan voor de volgende run.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Set, Iterable
+
+from ..database import get_db
+from ..database.models import OutboxEntry
+from ..utils.config import logger
+
+
+@dataclass
+class OutboxChange:
+    """Samengevoegde wijzigingen aan één record."""
+    entity_id: int
+    fields: Set[str] = field(default_factory=set)
+    created: bool = False
+    deleted: bool = False
+    entries: int = 0
+    last_entry_id: int = 0
+
+
+class OutboxStore:
+    """Coalescing reader voor de sync outbox."""
+
+    def pending(self, entity: str) -> Dict[int, OutboxChange]:
+        """Get openstaande wijzigingen per record id."""
+        db = get_db()
+        with db.session() as session:
+            entries = session.query(
+                OutboxEntry.id, OutboxEntry.entity_id, OutboxEntry.operation, OutboxEntry.changed_fields
+            ).filter(OutboxEntry.entity == entity).order_by(OutboxEntry.id).all()
+
+        changes: Dict[int, OutboxChange] = {}
+        for entry_id, entity_id, operation, changed_fields in entries:
+            change = changes.get(entity_id)
+            if change is None:
+                change = changes[entity_id] = OutboxChange(entity_id=entity_id)
+
+            try:
+                change.fields.update(json.loads(changed_fields or "[]"))
+            except ValueError:
+                pass
+            change.created |= operation == "insert"
+            change.deleted = operation == "delete"
+            change.entries += 1
+            change.last_entry_id = entry_id
+
+        return changes
+
+    def ack(self, entity: str, changes: Iterable[OutboxChange]) -> int:
+        """
+        Verwijder verwerkte wijzigingen.
+
+        Returns:
+            Aantal verwijderde outbox regels
+        """
+        changes = list(changes)
+        if not changes:
+            return 0
+
+        watermark = max(change.last_entry_id for change in changes)
+        db = get_db()
+        with db.session() as session:
+            deleted = session.query(OutboxEntry).filter(
+                OutboxEntry.entity == entity,
+                OutboxEntry.entity_id.in_([change.entity_id for change in changes]),
+                OutboxEntry.id <= watermark
+            ).delete(synchronize_session=False)
+            session.commit()
+
+        logger.debug(f"Acknowledged {deleted} {entity} outbox entries")
+        return deleted
+
+    def clear(self, entity: str = None) -> int:
+        """
+        Verwijder alle openstaande regels (bv. als Snelstart niet geconfigureerd is).
+
+        Returns:
+            Aantal verwijderde outbox regels
+        """
+        db = get_db()
+        with db.session() as session:
+            query = session.query(OutboxEntry)
+            if entity:
+                query = query.filter(OutboxEntry.entity == entity)
+            deleted = query.delete(synchronize_session=False)
+            session.commit()
+
+        if deleted:
+            logger.info(f"Cleared {deleted} {entity or 'all'} outbox entries")
+        return deleted
+
+    def count(self, entity: str = None) -> int:
+        """Aantal openstaande outbox regels."""
+        db = get_db()
+        with db.session() as session:
+            query = session.query(OutboxEntry)
+            if entity:
+                query = query.filter(OutboxEntry.entity == entity)
+            return query.count()
+
+
+# Global instance
+_outbox: Optional[OutboxStore] = None
+
+
+def get_outbox_store() -> OutboxStore:
+    """Get the global sync outbox store instance."""
+    global _outbox
+    if _outbox is None:
+        _outbox = OutboxStore()
+    return _outbox
@@ -3,8 +3,6 @@ Sync Service - Background email synchronization scheduler.
 Haalt automatisch emails op van alle actieve accounts.
 """
 
-import threading
-import time
 from datetime import datetime
 from typing import Optional, Callable
 
@@ -12,10 +10,13 @@ from ..database import get_db
 from ..database.models import EmailAccount, Email
 from ..utils.config import Config, logger
 from .email_service import EmailService
+from .orchestrator import get_orchestrator
 
 
 class EmailSyncScheduler:
-    """Background scheduler voor email synchronisatie."""
+    """Background scheduler voor email synchronisatie (job in de sync orchestrator)."""
+    
+    JOB_NAME = "email_sync"
     
     _instance: Optional['EmailSyncScheduler'] = None
     
@@ -32,7 +33,6 @@ class EmailSyncScheduler:
         
         self._initialized = True
         self._running = False
-        self._thread: Optional[threading.Thread] = None
         self._interval = Config.EMAIL_SYNC_INTERVAL * 60  # Convert to seconds
         self._on_new_emails: Optional[Callable] = None
         self._last_sync: Optional[datetime] = None
@@ -40,6 +40,7 @@ class EmailSyncScheduler:
     def set_interval(self, minutes: int):
         """Set sync interval in minutes."""
         self._interval = minutes * 60
+        get_orchestrator().set_interval(self.JOB_NAME, self._interval)
         logger.info(f"Sync interval set to {minutes} minutes")
     
     def set_callback(self, callback: Callable):
@@ -53,13 +54,19 @@ class EmailSyncScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self._thread.start()
+        # Initial sync after 10 seconds
+        get_orchestrator().add_job(
+            self.JOB_NAME,
+            self._scheduled_sync,
+            interval=self._interval,
+            initial_delay=10
+        )
         logger.info(f"Email sync scheduler started (interval: {self._interval // 60} min)")
     
     def stop(self):
         """Stop de scheduler."""
         self._running = False
+        get_orchestrator().remove_job(self.JOB_NAME)
         logger.info("Email sync scheduler stopped")
     
     def sync_now(self) -> dict:
@@ -69,29 +76,19 @@ class EmailSyncScheduler:
         Returns:
             Dict met resultaten: {total_new: int, errors: list}
         """
+        if self._running:
+            # Via de orchestrator, zodat hij niet naast een geplande sync loopt
+            return get_orchestrator().run_now(self.JOB_NAME).result()
         return self._do_sync()
     
-    def _sync_loop(self):
-        """Background sync loop."""
-        # Initial sync after 10 seconds
-        time.sleep(10)
+    def _scheduled_sync(self) -> dict:
+        """Job functie: sync en meld nieuwe emails."""
+        result = self._do_sync()
         
-        while self._running:
-            try:
-                result = self._do_sync()
-                
-                if result['total_new'] > 0 and self._on_new_emails:
-                    self._on_new_emails(result['total_new'])
-                
-            except Exception as e:
-                logger.error(f"Sync loop error: {e}")
-            
-            # Wait for next interval
-            # Check every 5 seconds if still running
-            waited = 0
-            while waited < self._interval and self._running:
-                time.sleep(5)
-                waited += 5
+        if result['total_new'] > 0 and self._on_new_emails:
+            self._on_new_emails(result['total_new'])
+        
+        return result
     
     def _do_sync(self) -> dict:
         """Execute sync voor alle accounts."""
@@ -0,0 +1,232 @@
+"""
+Telemetry - Duur, aantallen en fouten per job en per service call.
+
+Elke run van een scheduler job (`job:payment_sync`) en elke HTTP call naar
+de website of Snelstart (`http:GET /admin/forms`) wordt als compacte
+sample in een ring buffer per naam bewaard. Daaruit komen p50/p95, error
+rate en de laatste fout voor het sync health paneel in de API view.
+Naast de ring buffer houdt elke serie een duur-histogram over alle runs
+bij, zodat uitschieters van langer geleden niet wegvallen.
+"""
+
+import re
+import threading
+import time
+from collections import deque, OrderedDict
+from datetime import datetime
+from typing import Optional, Dict, List, Any, Deque, Tuple
+
+
+# Bovengrenzen (ms) van de histogram buckets; de laatste bucket is alles daarboven
+HISTOGRAM_BUCKETS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# (timestamp, duration_ms, items, bytes, ok)
+Sample = Tuple[float, int, int, int, bool]
+
+_ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,}|[A-Za-z0-9_-]{20,})(?=/|$)")
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Vervang ids in een pad door `:id`, zodat er één serie per endpoint is."""
+    return _ID_SEGMENT.sub("/:id", endpoint.split("?", 1)[0])
+
+
+def count_items(result: Any) -> int:
+    """Haal het aantal verwerkte items uit het resultaat van een sync functie."""
+    if isinstance(result, bool) or result is None:
+        return 0
+    if isinstance(result, int):
+        return result
+    if isinstance(result, (list, set)):
+        return len(result)
+    if isinstance(result, tuple) and result:
+        if isinstance(result[0], int) and not isinstance(result[0], bool):
+            return result[0]
+        # Bv. (SyncResult, SyncResult) van de Snelstart sync
+        return sum(getattr(r, "synced", 0) for r in result)
+    if isinstance(result, dict):
+        for key in ("total_new", "synced", "count"):
+            if isinstance(result.get(key), int):
+                return result[key]
+    return 0
+
+
+def result_error(result: Any) -> Optional[str]:
+    """Eerste foutmelding uit het resultaat van een sync functie (None als alles goed ging)."""
+    messages: List[str] = []
+    errors = 0
+
+    if isinstance(result, tuple) and len(result) == 3 and isinstance(result[1], int):
+        errors, messages = result[1], result[2] or []
+    elif isinstance(result, tuple):
+        for r in result:
+            errors += getattr(r, "errors", 0) or 0
+            messages += getattr(r, "error_messages", None) or []
+    elif isinstance(result, dict) and result.get("errors"):
+        messages = list(result["errors"])
+        errors = len(messages)
+
+    if not errors:
+        return None
+    return messages[0] if messages else f"{errors} error(s)"
+
+
+class _Series:
+    """Ring buffer + totalen voor één job of endpoint."""
+
+    __slots__ = (
+        "samples", "runs", "errors", "items", "bytes",
+        "histogram", "last_error", "last_error_at", "last_run",
+    )
+
+    def __init__(self, capacity: int):
+        self.samples: Deque[Sample] = deque(maxlen=capacity)
+        self.runs = 0
+        self.errors = 0
+        self.items = 0
+        self.bytes = 0
+        self.histogram = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.last_run: Optional[float] = None
+
+    def add(self, duration_ms: int, items: int, size: int, error: Optional[str]):
+        now = time.time()
+        self.samples.append((now, duration_ms, items, size, error is None))
+        self.runs += 1
+        self.items += items
+        self.bytes += size
+        self.last_run = now
+
+        bucket = len(HISTOGRAM_BUCKETS)
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if duration_ms <= bound:
+                bucket = i
+                break
+        self.histogram[bucket] += 1
+
+        if error is not None:
+            self.errors += 1
+            self.last_error = error
+            self.last_error_at = now
+
+
+class Telemetry:
+    """Thread-safe verzameling van telemetry series."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, capacity: int = 256, max_series: int = 200):
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self.capacity = capacity  # samples per serie
+        self.max_series = max_series
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # === RECORDING ===
+
+    def record(
+        self,
+        name: str,
+        duration_ms: int,
+        items: int = 0,
+        size: int = 0,
+        error: str = None
+    ):
+        """
+        Registreer één run.
+
+        Args:
+            name: Serie naam, bv. `job:payment_sync` of `http:GET /admin/forms`
+            duration_ms: Duur van de run
+            items: Aantal verwerkte items
+            size: Aantal overgedragen bytes
+            error: Foutmelding als de run mislukt is
+        """
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series(self.capacity)
+                # Minst recent gebruikte serie eruit (bv. endpoints die niet meer bestaan)
+                while len(self._series) > self.max_series:
+                    self._series.popitem(last=False)
+            else:
+                self._series.move_to_end(name)
+
+            series.add(int(duration_ms), int(items or 0), int(size or 0), error)
+
+    # === READING ===
+
+    @staticmethod
+    def _percentile(sorted_values: List[int], pct: float) -> int:
+        if not sorted_values:
+            return 0
+        index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+        return sorted_values[index]
+
+    def get_summary(self, prefix: str = "") -> List[Dict[str, Any]]:
+        """
+        Get statistieken per serie, traagste p95 eerst.
+
+        Percentielen en error rate gaan over de samples in de ring buffer;
+        runs, items, bytes en het histogram over alle runs.
+        """
+        with self._lock:
+            snapshot = [
+                (name, list(series.samples), series.runs, series.errors, series.items,
+                 series.bytes, list(series.histogram), series.last_error,
+                 series.last_error_at, series.last_run)
+                for name, series in self._series.items()
+                if name.startswith(prefix)
+            ]
+
+        summary = []
+        for (name, samples, runs, errors, items, size, histogram,
+             last_error, last_error_at, last_run) in snapshot:
+            durations = sorted(sample[1] for sample in samples)
+            failed = sum(1 for sample in samples if not sample[4])
+
+            summary.append({
+                "name": name,
+                "runs": runs,
+                "errors": errors,
+                "error_rate": failed / len(samples) if samples else 0.0,
+                "p50_ms": self._percentile(durations, 50),
+                "p95_ms": self._percentile(durations, 95),
+                "max_ms": durations[-1] if durations else 0,
+                "items": items,
+                "bytes": size,
+                "histogram": dict(zip([*map(str, HISTOGRAM_BUCKETS), "inf"], histogram)),
+                "last_error": last_error,
+                "last_error_at": datetime.fromtimestamp(last_error_at) if last_error_at else None,
+                "last_run": datetime.fromtimestamp(last_run) if last_run else None,
+            })
+
+        summary.sort(key=lambda s: s["p95_ms"], reverse=True)
+        return summary
+
+    def reset(self):
+        """Wis alle series."""
+        with self._lock:
+            self._series.clear()
+
+
+# Global instance
+_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Telemetry:
+    """Get the global telemetry instance."""
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry()
+    return _telemetry
@@ -0,0 +1,291 @@
+"""
+Webhook Journal - Append-only, crash-safe opslag van ontvangen webhooks.
+
+Elke geaccepteerde webhook wordt eerst als JSON regel in een journal
+segment geschreven en ge-fsynct voordat de website een 200 krijgt.
+Meerdere gelijktijdige requests delen één fsync (group commit), zodat
+duizenden events per seconde haalbaar zijn op een lokale schijf.
+
+De replayer (WebhookWriter) leest het journal vanaf het laatste
+checkpoint. Omdat het checkpoint pas ná de database commit verschuift,
+kan een crash ertoe leiden dat een batch opnieuw gelezen wordt; dedup op
+payload hash maakt het resultaat exactly-once.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+
+from ..utils.config import Config, logger
+
+
+# (segment nummer, byte offset)
+Position = Tuple[int, int]
+
+
+def payload_hash(body: bytes) -> str:
+    """SHA-256 van de ruwe request body (dedup sleutel)."""
+    return hashlib.sha256(body).hexdigest()
+
+
+class WebhookJournal:
+    """
+    Append-only journal in segmenten van `segment_size` bytes.
+
+    Bestanden: `<n>.journal` segmenten en `checkpoint.json` met de positie
+    tot waar alles in de database staat. Bij elke start begint een nieuw
+    segment, zodat er nooit achter een half geschreven regel verder
+    geschreven wordt.
+    """
+
+    def __init__(
+        self,
+        directory: Path = None,
+        segment_size: int = 16 * 1024 * 1024,
+        flush_interval: float = 0.002
+    ):
+        self.directory = Path(directory or Config.DATA_DIR / "webhook_journal")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.flush_interval = flush_interval  # Wachttijd om appends te bundelen
+        self._error_backoff = 0.5  # seconds
+
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(self._lock)
+        self._data_available = threading.Condition(threading.Lock())
+
+        self._written_seq = 0
+        self._flushed_seq = 0
+        self._error: Optional[Exception] = None
+        self._closed = False
+
+        self._checkpoint_path = self.directory / "checkpoint.json"
+        self._checkpoint: Position = self._load_checkpoint()
+        self._read_position: Position = self._checkpoint
+
+        segments = self._segments()
+        self._segment = max(segments[-1] if segments else 0, self._checkpoint[0]) + 1
+        self._file = open(self._segment_path(self._segment), "ab")
+
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    # === SEGMENTS & CHECKPOINT ===
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}.journal"
+
+    def _segments(self) -> List[int]:
+        return sorted(
+            int(path.stem) for path in self.directory.glob("*.journal")
+            if path.stem.isdigit()
+        )
+
+    def _load_checkpoint(self) -> Position:
+        try:
+            data = json.loads(self._checkpoint_path.read_text())
+            return (int(data["segment"]), int(data["offset"]))
+        except FileNotFoundError:
+            return (0, 0)
+        except Exception as e:
+            logger.warning(f"Invalid webhook journal checkpoint, replaying all: {e}")
+            return (0, 0)
+
+    def commit(self, position: Position):
+        """
+        Markeer alles tot `position` als verwerkt (na de database commit).
+
+        Het checkpoint wordt atomisch vervangen; volledig verwerkte
+        segmenten worden verwijderd.
+        """
+        tmp_path = self._checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"segment": position[0], "offset": position[1]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self._checkpoint_path)
+        self._checkpoint = position
+
+        for segment in self._segments():
+            if segment < position[0]:
+                try:
+                    self._segment_path(segment).unlink()
+                except OSError:
+                    pass
+
+    # === WRITE ===
+
+    def append(self, record: Dict) -> None:
+        """
+        Schrijf een record en blokkeer tot het ge-fsynct is.
+
+        Raises:
+            OSError: Als schrijven of fsync mislukt (caller antwoordt dan 5xx)
+        """
+        line = json.dumps(record, default=str, separators=(",", ":")).encode("utf-8") + b"\n"
+
+        with self._lock:
+            if self._closed:
+                raise OSError("Webhook journal is closed")
+
+            self._file.write(line)
+            self._written_seq += 1
+            seq = self._written_seq
+            self._flushed.notify_all()
+
+            while self._flushed_seq < seq and self._error is None:
+                self._flushed.wait()
+
+            if self._flushed_seq < seq:
+                raise OSError(f"Webhook journal write failed: {self._error}")
+
+        with self._data_available:
+            self._data_available.notify_all()
+
+    def _flush_loop(self):
+        """Group commit: één flush + fsync voor alle wachtende appends."""
+        while True:
+            with self._lock:
+                while self._written_seq == self._flushed_seq and not self._closed:
+                    self._flushed.wait()
+
+                if self._closed and self._written_seq == self._flushed_seq:
+                    return
+
+            # Even wachten zodat gelijktijdige requests in dezelfde fsync vallen
+            time.sleep(self.flush_interval)
+
+            with self._lock:
+                target = self._written_seq
+                current = self._file
+                rotated = None
+
+                try:
+                    current.flush()
+                    if current.tell() >= self.segment_size:
+                        self._segment += 1
+                        self._file = open(self._segment_path(self._segment), "ab")
+                        rotated = current
+                    os.fsync(current.fileno())
+                    if rotated:
+                        rotated.close()
+                except Exception as e:
+                    # Wachtende appends falen (5xx), de website probeert het later opnieuw
+                    self._error = e
+                    logger.error(f"Webhook journal fsync failed: {e}")
+                else:
+                    self._flushed_seq = target
+                    self._error = None
+                finally:
+                    self._flushed.notify_all()
+
+            if self._error is not None:
+                time.sleep(self._error_backoff)
+
+    # === READ (replayer) ===
+
+    def wait_for_data(self, timeout: float):
+        """Wacht tot er een append gebeurt (of timeout)."""
+        with self._data_available:
+            self._data_available.wait(timeout)
+
+    def read_batch(self, max_items: int = 100) -> Tuple[List[Dict], Position]:
+        """
+        Lees de volgende complete records vanaf de leespositie.
+
+        Returns:
+            (records, positie na het laatste record) - geef die positie
+            aan `commit()` zodra de records in de database staan
+        """
+        records: List[Dict] = []
+        segment, offset = self._read_position
+
+        while True:
+            with self._lock:
+                sealed = segment < self._segment
+
+            # Na rotatie wordt een segment niet meer beschreven; één extra
+            # leesronde pakt regels mee die vlak voor de rotatie geschreven zijn
+            offset = self._read_segment(segment, offset, records, max_items)
+
+            if len(records) >= max_items or not sealed:
+                break
+
+            next_segments = [s for s in self._segments() if s > segment]
+            if not next_segments:
+                break
+            segment, offset = next_segments[0], 0
+
+        self._read_position = (segment, offset)
+        return records, self._read_position
+
+    def _read_segment(self, segment: int, offset: int, records: List[Dict], max_items: int) -> int:
+        """Lees complete regels uit een segment; returns de nieuwe offset."""
+        path = self._segment_path(segment)
+        if not path.exists():
+            return offset
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # Half geschreven regel (crash, of wordt nog geschreven)
+                    break
+                offset += len(line)
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(f"Skipping corrupt journal record in segment {segment}")
+                if len(records) >= max_items:
+                    break
+
+        return offset
+
+    def dead_letter(self, record: Dict, reason: str):
+        """
+        Leg een record dat nooit in de database kan komen apart vast.
+
+        Het record blijft bewaard in `dead_letter.jsonl` (voor handmatige
+        controle); de replay gaat erna gewoon verder.
+        """
+        line = json.dumps({"reason": reason, "record": record}, default=str) + "\n"
+        with open(self.directory / "dead_letter.jsonl", "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def rewind(self):
+        """Lees opnieuw vanaf het checkpoint (na een mislukte database write)."""
+        self._read_position = self._checkpoint
+
+    @property
+    def backlog_bytes(self) -> int:
+        """Aantal bytes in het journal dat nog niet verwerkt is."""
+        total = 0
+        for segment in self._segments():
+            if segment < self._checkpoint[0]:
+                continue
+            try:
+                size = self._segment_path(segment).stat().st_size
+            except OSError:
+                continue
+            total += size - (self._checkpoint[1] if segment == self._checkpoint[0] else 0)
+        return total
+
+    def close(self):
+        """Flush en sluit het actieve segment."""
+        with self._lock:
+            self._closed = True
+            self._flushed.notify_all()
+        self._flusher.join(timeout=5)
+
+        with self._lock:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
@@ -5,32 +5,192 @@ Twee modi: Webhook server (realtime) of API polling.
 
 import json
 import threading
+import time
 import hashlib
 import hmac
 from datetime import datetime
 from typing import Optional, Dict, List
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import requests
 
 from ..database import get_db
 from ..database.models import FormSubmission, FormType, FormStatus
 from ..utils.config import Config, logger
+from .website_api import get_website_api
+from .sync_cursor import get_sync_cursor_store
+from .webhook_journal import WebhookJournal, payload_hash
+
+
+class WebhookWriter:
+    """
+    Replayt het webhook journal in batches naar de database.
+    
+    De HTTP handlers schrijven payloads alleen naar het (ge-fsyncte)
+    journal; deze writer thread leest per `batch_size` records of elke
+    `flush_interval` seconden, commit ze in één transactie en verschuift
+    daarna het journal checkpoint. Records waarvan de payload hash al in
+    de database staat worden overgeslagen, zodat replay na een crash geen
+    dubbele formulieren oplevert.
+    """
+    
+    def __init__(
+        self,
+        journal: WebhookJournal,
+        batch_size: int = 100,
+        flush_interval: float = 0.2,
+        max_backlog: int = 256 * 1024 * 1024
+    ):
+        self.journal = journal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_backlog = max_backlog  # bytes onverwerkt journal voordat we 503 geven
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._retry_delay = 1.0  # seconds, bij database fouten
+    
+    def accept(self, record: Dict) -> bool:
+        """
+        Schrijf een webhook record durable naar het journal.
+        
+        Returns:
+            False als de achterstand te groot is (backpressure)
+        
+        Raises:
+            OSError: Als het journal niet beschreven kan worden
+        """
+        if self.journal.backlog_bytes > self.max_backlog:
+            return False
+        
+        self.journal.append(record)
+        return True
+    
+    def start(self):
+        if self._running:
+            return
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 10):
+        """Stop de writer; wat niet meer weggeschreven kan worden blijft in het journal."""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=timeout)
+    
+    def _run(self):
+        """Writer loop: lees een batch uit het journal en commit."""
+        while True:
+            records, position = self.journal.read_batch(self.batch_size)
+            
+            if records:
+                if not self._write_batch(records, position):
+                    if not self._running:
+                        return
+                    time.sleep(self._retry_delay)
+                    continue
+            elif not self._running:
+                return
+            
+            if len(records) < self.batch_size and self._running:
+                self.journal.wait_for_data(self.flush_interval)
+    
+    def _write_batch(self, records: List[Dict], position) -> bool:
+        """Commit een batch (idempotent) en verschuif het checkpoint."""
+        try:
+            # Dedup binnen de batch en tegen eerder opgeslagen formulieren
+            unique: Dict[str, Dict] = {}
+            for record in records:
+                unique.setdefault(record["hash"], record)
+            
+            db = get_db()
+            with db.session() as session:
+                existing = {
+                    row[0] for row in session.query(FormSubmission.payload_hash).filter(
+                        FormSubmission.payload_hash.in_(list(unique))
+                    )
+                }
+                
+                new_forms = []
+                rejected = []  # (record, reden)
+                for hash_, record in unique.items():
+                    if hash_ in existing:
+                        continue
+                    try:
+                        new_forms.append(self._build_form(record))
+                    except (KeyError, TypeError, ValueError, AttributeError) as e:
+                        # Onbruikbaar record: apart zetten, anders blokkeert het de replay
+                        rejected.append((record, str(e)))
+                session.add_all(new_forms)
+                session.commit()
+            
+            # Pas na de commit: bij een rewind zou het record anders dubbel in de dead letters komen
+            for record, reason in rejected:
+                logger.error(f"Dead-lettering malformed webhook record {record['hash'][:12]}: {reason}")
+                self.journal.dead_letter(record, reason)
+            
+            self.journal.commit(position)
+            
+            if new_forms:
+                logger.info(f"Saved {len(new_forms)} webhook form(s)")
+            return True
+            
+        except Exception as e:
+            # Opnieuw lezen vanaf het checkpoint; niets gaat verloren
+            self.journal.rewind()
+            logger.warning(f"Webhook batch write failed, will retry: {e}")
+            return False
+    
+    @staticmethod
+    def _build_form(record: Dict) -> FormSubmission:
+        data = record["data"]
+        return FormSubmission(
+            form_type=record["form_type"],
+            status=FormStatus.NEW.value,
+            name=data.get('name', 'Unknown'),
+            email=data.get('email', ''),
+            phone=data.get('phone'),
+            company=data.get('company'),
+            subject=data.get('subject'),
+            message=data.get('message', ''),
+            source='webhook',
+            ip_address=record.get("ip_address"),
+            payload_hash=record["hash"],
+            submitted_at=datetime.fromisoformat(record["received_at"])
+        )
 
 
 class WebhookHandler(BaseHTTPRequestHandler):
     """HTTP Handler voor incoming webhooks."""
     
     webhook_secret: str = ""
+    max_body_size: int = 1024 * 1024  # 1 MB
+    
+    # HTTP/1.1 zodat de website de verbinding kan hergebruiken
+    protocol_version = "HTTP/1.1"
     
     def log_message(self, format, *args):
         """Override to use our logger."""
         logger.debug(f"Webhook: {args[0]}")
     
+    def _send_json(self, status: int, payload: Dict, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
     def do_POST(self):
-        """Handle POST requests (webhooks)."""
+        """Handle POST requests (webhooks): verifiëren, journal, direct antwoorden."""
         try:
             # Read body
             content_length = int(self.headers.get('Content-Length', 0))
+            if content_length > self.max_body_size:
+                self.send_error(413, "Payload too large")
+                return
             body = self.rfile.read(content_length)
             
             # Verify signature if configured
@@ -49,70 +209,52 @@ class WebhookHandler(BaseHTTPRequestHandler):
             
             # Parse JSON
             data = json.loads(body.decode('utf-8'))
+            if not isinstance(data, dict):
+                self.send_error(400, "Expected a JSON object")
+                return
+            
+            record = {
+                "hash": payload_hash(body),
+                "form_type": self._form_type(data).value,
+                "data": data,
+                "ip_address": self.client_address[0] if self.client_address else None,
+                "received_at": datetime.now().isoformat(),
+            }
+            
+            # Pas antwoorden als het record durable in het journal staat
+            try:
+                accepted = self.server.writer.accept(record)
+            except OSError as e:
+                logger.error(f"Webhook journal unavailable: {e}")
+                accepted = False
             
-            # Process based on path
-            if self.path == '/webhook/contact':
-                self._handle_contact_form(data)
-            elif self.path == '/webhook/offerte':
-                self._handle_offerte_form(data)
-            else:
-                self._handle_generic_form(data)
+            if not accepted:
+                self._send_json(503, {"status": "busy"}, {"Retry-After": "5"})
+                return
             
-            # Send success response
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok"}).encode())
+            self._send_json(200, {"status": "ok"})
             
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
             self.send_error(400, "Invalid JSON")
         except Exception as e:
             logger.error(f"Webhook error: {e}")
             self.send_error(500, str(e))
     
-    def _handle_contact_form(self, data: Dict):
-        """Handle contact form submission."""
-        self._save_form(data, FormType.CONTACT)
-    
-    def _handle_offerte_form(self, data: Dict):
-        """Handle offerte/quote form submission."""
-        self._save_form(data, FormType.OFFERTE)
-    
-    def _handle_generic_form(self, data: Dict):
-        """Handle generic form submission."""
-        form_type = data.get('type', 'contact')
-        if form_type in [t.value for t in FormType]:
-            self._save_form(data, FormType(form_type))
-        else:
-            self._save_form(data, FormType.CONTACT)
-    
-    def _save_form(self, data: Dict, form_type: FormType):
-        """Save form submission to database."""
-        db = get_db()
+    def _form_type(self, data: Dict) -> FormType:
+        """Bepaal form type op basis van pad of payload."""
+        if self.path == '/webhook/contact':
+            return FormType.CONTACT
+        if self.path == '/webhook/offerte':
+            return FormType.OFFERTE
         
-        with db.session() as session:
-            form = FormSubmission(
-                form_type=form_type.value,
-                status=FormStatus.NEW.value,
-                name=data.get('name', 'Unknown'),
-                email=data.get('email', ''),
-                phone=data.get('phone'),
-                company=data.get('company'),
-                subject=data.get('subject'),
-                message=data.get('message', ''),
-                source='webhook',
-                ip_address=self.client_address[0] if self.client_address else None,
-                submitted_at=datetime.now()
-            )
-            
-            session.add(form)
-            session.commit()
-        
-        logger.info(f"Saved {form_type.value} form from {form.name}")
+        form_type = data.get('type', 'contact') if isinstance(data, dict) else 'contact'
+        if form_type in [t.value for t in FormType]:
+            return FormType(form_type)
+        return FormType.CONTACT
 
 
 class WebhookServer:
-    """Lokale webhook server."""
+    """Lokale webhook server (multi-threaded, journal + batched writes)."""
     
     def __init__(self, port: int = 8765, secret: str = None):
         """
@@ -124,8 +266,10 @@ class WebhookServer:
         """
         self.port = port
         self.secret = secret or Config.WEBHOOK_SECRET
-        self._server: Optional[HTTPServer] = None
+        self._server: Optional[ThreadingHTTPServer] = None
         self._thread: Optional[threading.Thread] = None
+        self._journal: Optional[WebhookJournal] = None
+        self._writer: Optional[WebhookWriter] = None
         self._running = False
     
     def start(self):
@@ -137,22 +281,34 @@ class WebhookServer:
         # Set secret on handler class
         WebhookHandler.webhook_secret = self.secret
         
-        self._server = HTTPServer(('0.0.0.0', self.port), WebhookHandler)
+        # Journal eerst openen: de writer replayt meteen wat bij een
+        # vorige (gecrashte) run nog niet in de database kwam
+        self._journal = WebhookJournal()
+        self._writer = WebhookWriter(self._journal)
+        self._writer.start()
+        
+        self._server = ThreadingHTTPServer(('0.0.0.0', self.port), WebhookHandler)
+        self._server.daemon_threads = True
+        self._server.writer = self._writer
         self._running = True
         
         def serve():
             logger.info(f"Webhook server started on port {self.port}")
-            while self._running:
-                self._server.handle_request()
+            self._server.serve_forever(poll_interval=0.5)
         
         self._thread = threading.Thread(target=serve, daemon=True)
         self._thread.start()
     
     def stop(self):
-        """Stop webhook server."""
+        """Stop webhook server en schrijf openstaande webhooks weg."""
         self._running = False
         if self._server:
             self._server.shutdown()
+            self._server.server_close()
+        if self._writer:
+            self._writer.stop()
+        if self._journal:
+            self._journal.close()
         logger.info("Webhook server stopped")
 
 
@@ -169,7 +325,7 @@ class WebsitePoller:
         """
         self.api_url = api_url or Config.WEBSITE_API_URL
         self.api_key = api_key
-        self._last_check: Optional[datetime] = None
+        self._cursors = get_sync_cursor_store()
     
     def poll(self) -> List[FormSubmission]:
         """
@@ -187,16 +343,19 @@ class WebsitePoller:
             if self.api_key:
                 headers['Authorization'] = f'Bearer {self.api_key}'
             
+            # Hervat vanaf de persistente cursor (ook na herstart)
             params = {}
-            if self._last_check:
-                params['since'] = self._last_check.isoformat()
+            since = self._cursors.since("poller_forms")
+            if since:
+                params['since'] = since
             
-            # Make request
-            response = requests.get(
-                f"{self.api_url}/forms/submissions",
-                headers=headers,
+            # Make request (shared pooled client)
+            response = get_website_api().send(
+                "GET",
+                "/forms/submissions",
                 params=params,
-                timeout=30
+                base_url=self.api_url,
+                headers=headers
             )
             
             if response.status_code == 404:
@@ -207,9 +366,6 @@ class WebsitePoller:
             response.raise_for_status()
             data = response.json()
             
-            # Update last check time
-            self._last_check = datetime.now()
-            
             # Parse and save submissions
             new_forms = []
             submissions = data.get('submissions', [])
@@ -219,16 +375,22 @@ class WebsitePoller:
             
             db = get_db()
             with db.session() as session:
+                # Eén IN query voor alle al bekende submissions
+                refs = [f"api:{item['id']}" for item in submissions if item.get('id')]
+                existing = {
+                    row[0] for row in session.query(FormSubmission.external_ref).filter(
+                        FormSubmission.external_ref.in_(refs)
+                    )
+                }
+                
                 for item in submissions:
-                    # Check if already exists
                     external_id = item.get('id')
-                    if external_id:
-                        existing = session.query(FormSubmission).filter(
-                            FormSubmission.source == f"api:{external_id}"
-                        ).first()
-                        
-                        if existing:
+                    ref = f"api:{external_id}" if external_id else None
+                    
+                    if ref:
+                        if ref in existing:
                             continue
+                        existing.add(ref)
                     
                     form = FormSubmission(
                         form_type=item.get('type', FormType.CONTACT.value),
@@ -239,14 +401,17 @@ class WebsitePoller:
                         company=item.get('company'),
                         subject=item.get('subject'),
                         message=item.get('message', ''),
-                        source=f"api:{external_id}" if external_id else 'api',
+                        source=ref or 'api',
+                        external_ref=ref,
                         submitted_at=datetime.fromisoformat(item['submitted_at']) 
                             if item.get('submitted_at') else datetime.now()
                     )
-                    
-                    session.add(form)
                     new_forms.append(form)
                 
+                session.add_all(new_forms)
+                
+                # Cursor samen met de nieuwe forms committen
+                self._cursors.advance_to_items(session, "poller_forms", submissions)
                 session.commit()
             
             if new_forms:
@@ -6,12 +6,16 @@ Beheert authenticatie, requests, en sync status.
 import requests
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Iterator, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 
 from ..utils.config import Config, logger
+from .http_client import get_http_client, CircuitOpenError, RateLimiter, ConditionalCache
+from .sync_cursor import get_sync_cursor_store
+from ..database import get_db
 
 
 class APIStatus(Enum):
@@ -54,6 +58,15 @@ class APIHealth:
     version: Optional[str] = None
 
 
+# Resultaat van een conditional GET die 304 Not Modified gaf: lijkt op een
+# succesvolle, lege response zodat de sync services niets hoeven te doen
+NOT_MODIFIED = {"success": True, "notModified": True}
+
+
+class APIError(Exception):
+    """API request mislukt (bevat de foutmelding van `request`)."""
+
+
 class WebsiteAPI:
     """
     Centrale API service voor website communicatie.
@@ -84,6 +97,10 @@ class WebsiteAPI:
         "webhook": APIEndpoint("Webhook", "/v1/webhook/receive", "POST", "Webhook ontvangen"),
     }
     
+    # Paging voor volledige syncs
+    PAGE_SIZE = 100
+    MAX_PAGES = 1000  # Vangnet tegen eindeloze paginering
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -117,6 +134,17 @@ class WebsiteAPI:
         
         # Lock for thread safety
         self._lock = threading.Lock()
+        
+        # Shared pooled HTTP client; latency per poging komt in de history
+        self._http = get_http_client()
+        self._http.add_listener(self._log_request)
+        
+        # ETag/Last-Modified validators voor polling endpoints
+        self._cache = ConditionalCache(Config.DATA_DIR / "http_cache.json")
+        
+        # Gedeelde rate limit voor parallelle (paged) syncs
+        self._rate_limiter = RateLimiter(rate=5, burst=5)
+        self._sync_workers = 3
     
     # === CONFIGURATION ===
     
@@ -151,12 +179,8 @@ class WebsiteAPI:
         start_time = time.time()
         
         try:
-            # Try to reach the API via v1/status
-            response = requests.get(
-                f"{self._base_url}/v1/status",
-                headers=self._get_headers(),
-                timeout=10
-            )
+            # Try to reach the API via v1/status (geen retries, snel antwoord)
+            response = self.send("GET", "/v1/status", timeout=10, retries=0)
             
             response_time = int((time.time() - start_time) * 1000)
             
@@ -256,29 +280,8 @@ class WebsiteAPI:
         Returns:
             Tuple of (success, response_data or error_message)
         """
-        url = f"{self._base_url}{endpoint}"
-        start_time = time.time()
-        
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=self._get_headers(),
-                params=params,
-                json=data,
-                timeout=self._timeout
-            )
-            
-            duration = int((time.time() - start_time) * 1000)
-            self._log_request(endpoint, method, response.status_code, duration)
-            
-            # Update endpoint stats
-            for ep in self.ENDPOINTS.values():
-                if ep.path == endpoint and ep.method == method:
-                    ep.last_called = datetime.now()
-                    ep.last_status = response.status_code
-                    ep.call_count += 1
-                    break
+            response = self.send(method, endpoint, params=params, data=data)
             
             if response.status_code == 200:
                 return (True, response.json())
@@ -289,19 +292,132 @@ class WebsiteAPI:
             else:
                 return (False, f"HTTP {response.status_code}: {response.text[:200]}")
                 
+        except CircuitOpenError:
+            return (False, "Website tijdelijk niet bereikbaar (circuit open)")
         except requests.exceptions.ConnectionError:
-            duration = int((time.time() - start_time) * 1000)
-            self._log_request(endpoint, method, 0, duration, "Connection failed")
             return (False, "Connection failed - website not reachable")
         except requests.exceptions.Timeout:
-            duration = int((time.time() - start_time) * 1000)
-            self._log_request(endpoint, method, 0, duration, "Timeout")
             return (False, "Request timeout")
         except Exception as e:
-            duration = int((time.time() - start_time) * 1000)
-            self._log_request(endpoint, method, 0, duration, str(e))
             return (False, str(e))
     
+    def call(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict = None,
+        json: Dict = None,
+        conditional: bool = False,
+        headers: Dict[str, str] = None,
+        timeout: int = None,
+        retries: int = None
+    ) -> Optional[Dict]:
+        """
+        Make an API request and return the JSON body.
+        
+        Vervangt de losse `_make_request` helpers van de sync services.
+        Onbekende keyword arguments geven een TypeError in plaats van
+        stilletjes genegeerd te worden.
+        
+        Args:
+            params: Query parameters
+            json: Request body
+            conditional: Stuur ETag/Last-Modified validators mee; bij een 304
+                wordt NOT_MODIFIED teruggegeven zonder download of parsing
+            headers: Extra headers bovenop de standaard (auth) headers
+            timeout: Timeout per poging in seconden
+            retries: Aantal extra pogingen
+        
+        Returns:
+            Response JSON, of None bij een fout of non-2xx status
+        """
+        request_headers = self._get_headers()
+        if headers:
+            request_headers.update(headers)
+        cache_key = None
+        
+        if conditional and method.upper() == "GET":
+            cache_key = ConditionalCache.key(method, f"{self._base_url}{endpoint}", params)
+            request_headers.update(self._cache.validators(cache_key))
+        
+        try:
+            response = self.send(
+                method,
+                endpoint,
+                params=params,
+                data=json,
+                headers=request_headers,
+                timeout=timeout,
+                retries=retries,
+            )
+            
+            if response.status_code == 304 and cache_key:
+                self._cache.hit(cache_key)
+                return dict(NOT_MODIFIED)
+            
+            response.raise_for_status()
+            data = response.json()
+            
+            if cache_key:
+                self._cache.store(cache_key, response)
+            
+            return data
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"API request failed: {method} {endpoint}: {e}")
+            return None
+    
+    def forget_cached(self, endpoint: str):
+        """
+        Vergeet de validators van een endpoint.
+        
+        Aanroepen als verwerking van een response mislukt is, zodat de
+        volgende poll de volledige data opnieuw ophaalt i.p.v. een 304.
+        """
+        self._cache.forget(f"{self._base_url}{endpoint}")
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get conditional GET statistieken (hits, misses, bytes_saved)."""
+        return self._cache.get_stats()
+    
+    def send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict = None,
+        data: Dict = None,
+        base_url: str = None,
+        headers: Dict[str, str] = None,
+        timeout: int = None,
+        retries: int = None
+    ) -> requests.Response:
+        """
+        Send a request through the shared HTTP client.
+        
+        Raises:
+            requests.exceptions.RequestException on connection errors
+        """
+        response = self._http.request(
+            method,
+            f"{base_url or self._base_url}{endpoint}",
+            endpoint=endpoint.split("?")[0],
+            retries=retries,
+            timeout=timeout or self._timeout,
+            headers=headers if headers is not None else self._get_headers(),
+            params=params,
+            json=data,
+        )
+        
+        # Update endpoint stats
+        path = endpoint.split("?")[0]
+        for ep in self.ENDPOINTS.values():
+            if ep.path == path and ep.method == method:
+                ep.last_called = datetime.now()
+                ep.last_status = response.status_code
+                ep.call_count += 1
+                break
+        
+        return response
+    
     # === DATA FETCH METHODS (v1/sync API) ===
     
     def get_status(self) -> Tuple[bool, Any]:
@@ -396,11 +512,12 @@ class WebsiteAPI:
     
     def update_sync_stats(self, category: str, synced: int = 0, errors: int = 0):
         """Update sync statistics."""
-        if category in self._sync_stats:
-            stats = self._sync_stats[category]
-            stats.last_sync = datetime.now()
-            stats.total_synced += synced
-            stats.total_errors += errors
+        with self._lock:
+            if category in self._sync_stats:
+                stats = self._sync_stats[category]
+                stats.last_sync = datetime.now()
+                stats.total_synced += synced
+                stats.total_errors += errors
     
     def get_request_history(self, limit: int = 50) -> List[Dict]:
         """Get recent request history."""
@@ -421,17 +538,144 @@ class WebsiteAPI:
             for name, ep in self.ENDPOINTS.items()
         }
     
+    # === PAGING ===
+    
+    @staticmethod
+    def _has_more(data: Dict, page: int, limit: int, count: int) -> bool:
+        """Bepaal aan de hand van `meta` of er nog een volgende pagina is."""
+        meta = data.get("meta") or data.get("pagination") or {}
+        
+        for key in ("hasMore", "has_more", "hasNextPage"):
+            if key in meta:
+                return bool(meta[key])
+        
+        for key in ("totalPages", "total_pages", "pages"):
+            if meta.get(key) is not None:
+                return page < int(meta[key])
+        
+        if meta.get("total") is not None:
+            return page * limit < int(meta["total"])
+        
+        # Geen pagination info: doorgaan zolang pagina's vol zijn
+        return count >= limit
+    
+    def iter_pages(
+        self,
+        fetch_func: Callable[..., Tuple[bool, Any]],
+        since: str = None,
+        limit: int = None,
+        **kwargs
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Itereer over alle pagina's van een v1/sync endpoint.
+        
+        Args:
+            fetch_func: Fetch methode, bv. `self.get_customers`
+            since: Alleen items gewijzigd na dit tijdstip (ISO)
+            limit: Items per pagina (default PAGE_SIZE)
+            **kwargs: Extra filters voor fetch_func (bv. status)
+        
+        Yields:
+            (page_number, items) per pagina
+        
+        Raises:
+            APIError: Als een pagina niet opgehaald kan worden
+        """
+        limit = limit or self.PAGE_SIZE
+        if since:
+            kwargs["since"] = since
+        
+        for page in range(1, self.MAX_PAGES + 1):
+            self._rate_limiter.acquire()
+            
+            success, data = fetch_func(page=page, limit=limit, **kwargs)
+            
+            if not success:
+                raise APIError(data)
+            
+            items = data.get("data", []) if isinstance(data, dict) else []
+            if not isinstance(items, list):
+                items = []
+            
+            if items:
+                yield page, items
+            
+            if not items or not self._has_more(data, page, limit, len(items)):
+                return
+        
+        logger.warning(f"Paging stopped after {self.MAX_PAGES} pages")
+    
     # === SYNC ALL ===
     
-    def sync_all(self, callback: callable = None) -> Dict[str, Tuple[int, int]]:
+    def _sync_category(
+        self,
+        name: str,
+        fetch_func: Callable,
+        since: str = None,
+        callback: Callable[[str], None] = None,
+        on_page: Callable[[str, int, List[Dict]], None] = None,
+        resume: bool = False
+    ) -> Tuple[int, int]:
+        """
+        Haal alle pagina's van één categorie op (worker thread).
+        
+        Met `resume` wordt vanaf de opgeslagen cursor gesynct en schuift de
+        cursor na elke verwerkte pagina op.
+        """
+        count = 0
+        cursors = get_sync_cursor_store()
+        cursor_key = f"sync_all:{name}"
+        
+        if since is None and resume:
+            since = cursors.since(cursor_key)
+        
+        try:
+            for page, items in self.iter_pages(fetch_func, since=since):
+                count += len(items)
+                
+                if on_page:
+                    on_page(name, page, items)
+                
+                if resume:
+                    with get_db().session() as session:
+                        cursors.advance_to_items(session, cursor_key, items)
+                
+                if callback:
+                    callback(f"Syncing {name}... pagina {page} ({count} items)")
+            
+            self.update_sync_stats(name, synced=count)
+            return (count, 0)
+            
+        except Exception as e:
+            logger.error(f"Sync {name} failed after {count} items: {e}")
+            self.update_sync_stats(name, synced=count, errors=1)
+            return (count, 1)
+    
+    def sync_all(
+        self,
+        callback: Callable[[str], None] = None,
+        on_page: Callable[[str, int, List[Dict]], None] = None,
+        since: str = None,
+        resume: bool = False
+    ) -> Dict[str, Tuple[int, int]]:
         """
         Sync all data from website using v1/sync API.
         
+        Alle categorieën worden parallel opgehaald (gedeelde rate limit) en
+        per categorie worden alle pagina's gevolgd. Callbacks worden vanuit
+        worker threads aangeroepen.
+        
+        Args:
+            callback: Voortgangsbericht per pagina
+            on_page: Callback(category, page, items) per opgehaalde pagina
+            since: Alleen items gewijzigd na dit tijdstip (ISO); overschrijft de cursor
+            resume: Hervat vanaf en werk de persistente sync cursors bij. Alleen
+                zinvol als `on_page` de items opslaat; zonder dat telt een run
+                na de eerste anders alleen nog de delta
+        
         Returns:
             Dict with category: (synced_count, error_count)
         """
-        results = {}
-        
         # v1/sync categories
         categories = [
             ("customers", self.get_customers),
@@ -441,23 +685,18 @@ class WebsiteAPI:
             ("invoices", self.get_invoices),
         ]
         
-        for name, fetch_func in categories:
-            if callback:
-                callback(f"Syncing {name}...")
-            
-            success, data = fetch_func()
+        with ThreadPoolExecutor(
+            max_workers=self._sync_workers,
+            thread_name_prefix="website-sync"
+        ) as executor:
+            futures = {
+                name: executor.submit(
+                    self._sync_category, name, fetch_func, since, callback, on_page, resume
+                )
+                for name, fetch_func in categories
+            }
             
-            if success:
-                # v1 API returns data in 'data' field with 'meta' containing pagination
-                items = data.get("data", [])
-                count = len(items) if isinstance(items, list) else 0
-                results[name] = (count, 0)
-                self.update_sync_stats(name, synced=count)
-            else:
-                results[name] = (0, 1)
-                self.update_sync_stats(name, errors=1)
-        
-        return results
+            return {name: future.result() for name, future in futures.items()}
 
 
 # Global instance
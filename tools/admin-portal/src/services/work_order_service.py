@@ -2,49 +2,162 @@
 Work Order Sync Service - Synchroniseert werk opdrachten en formulieren van website naar Admin Portal.
 """
 
-import requests
-import threading
-import time
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional, Callable
 
 from ..database import get_db
 from ..database.models import FormSubmission, FormStatus, FormType
 from ..utils.config import Config, logger
+from .website_api import get_website_api
+from .sync_cursor import get_sync_cursor_store, sort_by_position, SyncCursorStore
+from .orchestrator import get_orchestrator, WEBSITE_GROUP
+
+
+def store_form_batch(
+    items: List[Dict],
+    ref_prefix: str,
+    cursor_key: str,
+    build_form: Callable[[Dict], FormSubmission],
+    cursors: SyncCursorStore
+) -> Tuple[int, int, List[str], List, Dict]:
+    """
+    Sla een batch website items op als FormSubmissions.
+
+    Eén IN query op external_ref voor bestaande items, één bulk insert voor
+    de rest en de sync cursor in dezelfde transactie. Items zonder `id`
+    kunnen niet opgeslagen worden en tellen als fout; ze houden de cursor
+    niet tegen, want ze slagen ook bij een volgende poll niet.
+
+    Returns:
+        Tuple van (synced, errors, error_messages, synced_ids, form_mapping)
+    """
+    errors = 0
+    error_messages = []
+    synced_ids = []
+    new_forms: Dict = {}  # website id -> FormSubmission
+
+    # Oud naar nieuw, zodat de cursor niet over een mislukt item heen schuift
+    items = sort_by_position(items)
+
+    refs = {}
+    for index, item in enumerate(items):
+        if not item.get("id"):
+            errors += 1
+            error_messages.append(f"{ref_prefix} #{index}: geen id")
+            logger.error(f"Skipping {ref_prefix} item #{index} without id")
+            continue
+        refs[f"{ref_prefix}:{item['id']}"] = item
+
+    # Cursor gaat alleen vooruit tot het eerste item dat mislukt
+    processed = []
+    failed = False
+
+    db = get_db()
+    try:
+        with db.session() as session:
+            existing = {
+                row[0] for row in session.query(FormSubmission.external_ref).filter(
+                    FormSubmission.external_ref.in_(list(refs))
+                )
+            }
+
+            for ref, item in refs.items():
+                if ref in existing:
+                    synced_ids.append(item["id"])
+                else:
+                    try:
+                        new_forms[item["id"]] = build_form(item)
+                    except Exception as e:
+                        failed = True
+                        errors += 1
+                        error_messages.append(f"{ref}: {e}")
+                        logger.error(f"Failed to sync {ref}: {e}")
+                        continue
+
+                if not failed:
+                    processed.append(item)
+
+            session.add_all(new_forms.values())
+            cursors.advance_to_items(session, cursor_key, processed)
+            session.commit()
+
+            form_mapping = {item_id: form.id for item_id, form in new_forms.items()}
+    except Exception as e:
+        logger.error(f"Failed to store {ref_prefix} batch: {e}")
+        return (0, len(items), error_messages + [f"Batch opslaan mislukt: {e}"], [], {})
+
+    synced_ids.extend(new_forms)
+
+    if new_forms:
+        logger.info(f"Synced {len(new_forms)} new {ref_prefix}(s) from website")
+
+    return (len(new_forms), errors, error_messages, synced_ids, form_mapping)
 
 
 class FormsSyncService:
     """Service voor synchroniseren van contact/offerte formulieren van website."""
     
     def __init__(self):
-        self.api_url = Config.WEBSITE_API_URL
-        self.api_key = Config.WEBSITE_ADMIN_API_KEY
+        self.api = get_website_api()
+        self.cursors = get_sync_cursor_store()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
-        """Make authenticated API request to website."""
-        url = f"{self.api_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+        """Make authenticated API request to website (shared pooled client)."""
+        return self.api.call(method, endpoint, **kwargs)
+    
+    def _build_form(self, sub: Dict) -> FormSubmission:
+        """Bouw een FormSubmission uit een website formulier."""
+        # Determine form type
+        form_type = FormType.CONTACT.value
+        if sub.get("formType") == "offerte":
+            form_type = FormType.OFFERTE.value
         
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=30,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.debug(f"Forms API request failed: {e}")
-            return None
+        # Build message with extra data
+        message = sub.get("message", "")
+        extra = sub.get("extraData", {})
+        if extra:
+            extra_text = []
+            if extra.get("projectType"):
+                extra_text.append(f"Type: {extra['projectType']}")
+            if extra.get("budgetRange"):
+                extra_text.append(f"Budget: {extra['budgetRange']}")
+            if extra.get("deadline"):
+                extra_text.append(f"Deadline: {extra['deadline']}")
+            if extra.get("features"):
+                extra_text.append(f"Features: {', '.join(extra['features'])}")
+            if extra.get("currentWebsite"):
+                extra_text.append(f"Huidige website: {extra['currentWebsite']}")
+            if extra.get("additionalInfo"):
+                extra_text.append(f"Extra info: {extra['additionalInfo']}")
+            
+            if extra_text:
+                message = "\n".join(extra_text) + "\n\n" + message
+        
+        # Create FormSubmission
+        return FormSubmission(
+            form_type=form_type,
+            status=FormStatus.NEW.value,
+            name=sub.get("name", "Onbekend"),
+            email=sub.get("email", ""),
+            phone=sub.get("phone", ""),
+            company=sub.get("company", ""),
+            subject=sub.get("subject", ""),
+            message=message,
+            source=f"form:{sub['id']}",
+            external_ref=f"form:{sub['id']}",
+            submitted_at=datetime.fromisoformat(
+                sub["submittedAt"].replace("Z", "+00:00")
+            ) if sub.get("submittedAt") else datetime.now()
+        )
     
     def sync_forms(self) -> Tuple[int, int, List[str]]:
         """Sync contact/offerte forms from website."""
-        result = self._make_request("GET", "/admin/forms?unsynced=true")
+        params = {"unsynced": "true"}
+        since = self.cursors.since("forms")
+        if since:
+            params["since"] = since
+        
+        result = self._make_request("GET", "/admin/forms", params=params, conditional=True)
         
         if not result or not result.get("success"):
             return (0, 0, [])
@@ -54,81 +167,13 @@ class FormsSyncService:
         if not submissions:
             return (0, 0, [])
         
-        synced = 0
-        errors = 0
-        error_messages = []
-        synced_ids = []
-        form_mapping = {}
-        
-        db = get_db()
+        synced, errors, error_messages, synced_ids, form_mapping = store_form_batch(
+            submissions, "form", "forms", self._build_form, self.cursors
+        )
         
-        for sub in submissions:
-            try:
-                with db.session() as session:
-                    # Check if already exists
-                    existing = session.query(FormSubmission).filter(
-                        FormSubmission.source == f"form:{sub.get('id')}"
-                    ).first()
-                    
-                    if existing:
-                        synced_ids.append(sub["id"])
-                        continue
-                    
-                    # Determine form type
-                    form_type = FormType.CONTACT.value
-                    if sub.get("formType") == "offerte":
-                        form_type = FormType.OFFERTE.value
-                    
-                    # Build message with extra data
-                    message = sub.get("message", "")
-                    extra = sub.get("extraData", {})
-                    if extra:
-                        extra_text = []
-                        if extra.get("projectType"):
-                            extra_text.append(f"Type: {extra['projectType']}")
-                        if extra.get("budgetRange"):
-                            extra_text.append(f"Budget: {extra['budgetRange']}")
-                        if extra.get("deadline"):
-                            extra_text.append(f"Deadline: {extra['deadline']}")
-                        if extra.get("features"):
-                            extra_text.append(f"Features: {', '.join(extra['features'])}")
-                        if extra.get("currentWebsite"):
-                            extra_text.append(f"Huidige website: {extra['currentWebsite']}")
-                        if extra.get("additionalInfo"):
-                            extra_text.append(f"Extra info: {extra['additionalInfo']}")
-                        
-                        if extra_text:
-                            message = "\n".join(extra_text) + "\n\n" + message
-                    
-                    # Create FormSubmission
-                    form = FormSubmission(
-                        form_type=form_type,
-                        status=FormStatus.NEW.value,
-                        name=sub.get("name", "Onbekend"),
-                        email=sub.get("email", ""),
-                        phone=sub.get("phone", ""),
-                        company=sub.get("company", ""),
-                        subject=sub.get("subject", ""),
-                        message=message,
-                        source=f"form:{sub['id']}",
-                        submitted_at=datetime.fromisoformat(
-                            sub["submittedAt"].replace("Z", "+00:00")
-                        ) if sub.get("submittedAt") else datetime.now()
-                    )
-                    
-                    session.add(form)
-                    session.commit()
-                    
-                    synced_ids.append(sub["id"])
-                    form_mapping[sub["id"]] = form.id
-                    synced += 1
-                    
-                    logger.info(f"Synced form: {sub.get('formType')} from {sub.get('email')}")
-                    
-            except Exception as e:
-                errors += 1
-                error_messages.append(f"Form {sub.get('id')}: {e}")
-                logger.error(f"Failed to sync form: {e}")
+        if errors:
+            # Mislukte items bij de volgende poll opnieuw ophalen (geen 304)
+            self.api.forget_cached("/admin/forms")
         
         # Mark as synced on website
         if synced_ids:
@@ -148,84 +193,38 @@ class WorkOrderSyncService:
     """Service voor synchroniseren van werk opdrachten van website."""
     
     def __init__(self):
-        self.api_url = Config.WEBSITE_API_URL
-        self.api_key = Config.WEBSITE_ADMIN_API_KEY
+        self.api = get_website_api()
+        self.cursors = get_sync_cursor_store()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
-        """Make authenticated API request to website."""
-        url = f"{self.api_url}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        
-        try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                timeout=30,
-                **kwargs
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Work order API request failed: {e}")
-            return None
+        """Make authenticated API request to website (shared pooled client)."""
+        return self.api.call(method, endpoint, **kwargs)
     
     def fetch_unsynced_orders(self) -> List[Dict]:
         """Haal niet-gesynchroniseerde werk opdrachten op."""
-        result = self._make_request("GET", "/admin/work-orders?unsynced=true")
+        params = {"unsynced": "true"}
+        since = self.cursors.since("work_orders")
+        if since:
+            params["since"] = since
+        
+        result = self._make_request("GET", "/admin/work-orders", params=params, conditional=True)
         
         if result and result.get("success"):
             return result.get("orders", [])
         
         return []
     
-    def sync_work_orders(self) -> Tuple[int, int, List[str]]:
-        """
-        Synchroniseer werk opdrachten van website naar Admin Portal.
+    def _build_form(self, order: Dict) -> FormSubmission:
+        """Bouw een FormSubmission uit een werk opdracht."""
+        # Build features list
+        features = order.get("features", [])
+        features_text = "\n".join([
+            f"• {f['name']}" + (f" ({f['quantity']}x)" if f.get('quantity', 1) > 1 else "")
+            for f in features
+        ])
         
-        Returns:
-            Tuple van (synced, errors, error_messages)
-        """
-        logger.info("Starting work order sync from website...")
-        
-        orders = self.fetch_unsynced_orders()
-        
-        if not orders:
-            logger.info("No new work orders to sync")
-            return (0, 0, [])
-        
-        synced = 0
-        errors = 0
-        error_messages = []
-        synced_ids = []
-        form_mapping = {}
-        
-        db = get_db()
-        
-        for order in orders:
-            try:
-                with db.session() as session:
-                    # Check if already exists
-                    existing = session.query(FormSubmission).filter(
-                        FormSubmission.source == f"order:{order.get('id')}"
-                    ).first()
-                    
-                    if existing:
-                        synced_ids.append(order["id"])
-                        continue
-                    
-                    # Build features list
-                    features = order.get("features", [])
-                    features_text = "\n".join([
-                        f"• {f['name']}" + (f" ({f['quantity']}x)" if f.get('quantity', 1) > 1 else "")
-                        for f in features
-                    ])
-                    
-                    # Build full message
-                    message = f"""
+        # Build full message
+        message = f"""
 WERK OPDRACHT: {order.get('orderNumber', 'N/A')}
 
 📦 Pakket: {order.get('packageName', 'N/A')}
@@ -251,36 +250,46 @@ WERK OPDRACHT: {order.get('orderNumber', 'N/A')}
 
 ⚠️ Annuleringskosten: €{order.get('cancellationFee', 0):.2f}
 """.strip()
-                    
-                    # Create FormSubmission
-                    form = FormSubmission(
-                        form_type=FormType.OFFERTE.value,
-                        status=FormStatus.NEW.value,
-                        name=order.get("customerName", "Onbekend"),
-                        email=order.get("customerEmail", ""),
-                        phone=order.get("customerPhone", ""),
-                        company=order.get("companyName", ""),
-                        subject=f"Werk Opdracht: {order.get('packageName', '')} - €{order.get('totalAmount', 0):.2f}",
-                        message=message,
-                        source=f"order:{order['id']}",
-                        submitted_at=datetime.fromisoformat(
-                            order["createdAt"].replace("Z", "+00:00")
-                        ) if order.get("createdAt") else datetime.now()
-                    )
-                    
-                    session.add(form)
-                    session.commit()
-                    
-                    synced_ids.append(order["id"])
-                    form_mapping[order["id"]] = form.id
-                    synced += 1
-                    
-                    logger.info(f"Synced work order: {order.get('orderNumber')}")
-                    
-            except Exception as e:
-                errors += 1
-                error_messages.append(f"Order {order.get('orderNumber')}: {e}")
-                logger.error(f"Failed to sync work order: {e}")
+        
+        # Create FormSubmission
+        return FormSubmission(
+            form_type=FormType.OFFERTE.value,
+            status=FormStatus.NEW.value,
+            name=order.get("customerName", "Onbekend"),
+            email=order.get("customerEmail", ""),
+            phone=order.get("customerPhone", ""),
+            company=order.get("companyName", ""),
+            subject=f"Werk Opdracht: {order.get('packageName', '')} - €{order.get('totalAmount', 0):.2f}",
+            message=message,
+            source=f"order:{order['id']}",
+            external_ref=f"order:{order['id']}",
+            submitted_at=datetime.fromisoformat(
+                order["createdAt"].replace("Z", "+00:00")
+            ) if order.get("createdAt") else datetime.now()
+        )
+    
+    def sync_work_orders(self) -> Tuple[int, int, List[str]]:
+        """
+        Synchroniseer werk opdrachten van website naar Admin Portal.
+        
+        Returns:
+            Tuple van (synced, errors, error_messages)
+        """
+        logger.info("Starting work order sync from website...")
+        
+        orders = self.fetch_unsynced_orders()
+        
+        if not orders:
+            logger.info("No new work orders to sync")
+            return (0, 0, [])
+        
+        synced, errors, error_messages, synced_ids, form_mapping = store_form_batch(
+            orders, "order", "work_orders", self._build_form, self.cursors
+        )
+        
+        if errors:
+            # Mislukte orders bij de volgende poll opnieuw ophalen (geen 304)
+            self.api.forget_cached("/admin/work-orders")
         
         # Mark orders as synced on website
         if synced_ids:
@@ -317,6 +326,8 @@ def get_work_order_sync_service() -> WorkOrderSyncService:
 class WorkOrderSyncScheduler:
     """Background scheduler voor werk opdrachten en formulieren synchronisatie."""
     
+    JOB_NAME = "work_order_sync"
+    
     _instance = None
     
     def __new__(cls):
@@ -331,7 +342,6 @@ class WorkOrderSyncScheduler:
         
         self._initialized = True
         self._running = False
-        self._thread = None
         self._interval = Config.PAYMENT_SYNC_INTERVAL * 60  # Use same interval
         self._on_new_orders: Optional[Callable[[int], None]] = None
         self._sync_service = get_work_order_sync_service()
@@ -347,57 +357,59 @@ class WorkOrderSyncScheduler:
             return
         
         self._running = True
-        self._thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self._thread.start()
+        get_orchestrator().add_job(
+            self.JOB_NAME,
+            self._scheduled_sync,
+            interval=self._interval,
+            initial_delay=20,
+            group=WEBSITE_GROUP
+        )
         logger.info("Work order sync scheduler started")
     
     def stop(self):
         """Stop the scheduler."""
         self._running = False
+        get_orchestrator().remove_job(self.JOB_NAME)
     
     def sync_now(self) -> Tuple[int, int, List[str]]:
         """Execute sync immediately (work orders + forms)."""
-        # Sync work orders
-        orders_synced, orders_errors, orders_msgs = self._sync_service.sync_work_orders()
+        # Via de orchestrator, zodat hij niet naast een geplande sync loopt
+        if self._running:
+            return get_orchestrator().run_now(self.JOB_NAME).result()
+        return get_orchestrator().run_once(self.JOB_NAME, self._do_sync, group=WEBSITE_GROUP).result()
+    
+    def _do_sync(self) -> Tuple[int, int, List[str]]:
+        """Sync work orders en forms; een fout in de ene houdt de andere niet tegen."""
+        results = []
+        failure: Optional[Exception] = None
         
-        # Sync forms
-        forms_synced, forms_errors, forms_msgs = self._forms_service.sync_forms()
+        for label, sync in (
+            ("Work order", self._sync_service.sync_work_orders),
+            ("Forms", self._forms_service.sync_forms),
+        ):
+            try:
+                results.append(sync())
+            except Exception as e:
+                logger.error(f"{label} sync error: {e}")
+                failure = failure or e
+        
+        if failure and not results:
+            raise failure
         
         return (
-            orders_synced + forms_synced,
-            orders_errors + forms_errors,
-            orders_msgs + forms_msgs
+            sum(r[0] for r in results),
+            sum(r[1] for r in results) + (1 if failure else 0),
+            [msg for r in results for msg in r[2]] + ([str(failure)] if failure else [])
         )
     
-    def _sync_loop(self):
-        """Background sync loop."""
-        time.sleep(20)  # Initial delay
+    def _scheduled_sync(self) -> Tuple[int, int, List[str]]:
+        """Job functie: sync en meld nieuwe opdrachten."""
+        result = self._do_sync()
         
-        while self._running:
-            total_synced = 0
-            
-            try:
-                # Sync work orders
-                orders_synced, _, _ = self._sync_service.sync_work_orders()
-                total_synced += orders_synced
-            except Exception as e:
-                logger.error(f"Work order sync error: {e}")
-            
-            try:
-                # Sync forms
-                forms_synced, _, _ = self._forms_service.sync_forms()
-                total_synced += forms_synced
-            except Exception as e:
-                logger.error(f"Forms sync error: {e}")
-            
-            if total_synced > 0 and self._on_new_orders:
-                self._on_new_orders(total_synced)
-            
-            # Wait
-            waited = 0
-            while waited < self._interval and self._running:
-                time.sleep(5)
-                waited += 5
+        if result[0] > 0 and self._on_new_orders:
+            self._on_new_orders(result[0])
+        
+        return result
 
 
 # Global scheduler
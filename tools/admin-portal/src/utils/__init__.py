@@ -2,3 +2,4 @@
 
 from .config import Config
 from .helpers import format_datetime, truncate_text, generate_id
+from .log_reader import tail_lines, tail_with_rotation, LogFollower
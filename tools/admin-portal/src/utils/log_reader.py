@@ -0,0 +1,253 @@
+"""
+Log reader - Efficiënt de laatste regels van (grote) logbestanden lezen.
+
+Leest van achteren naar voren in blokken, zodat multi-GB logs niet in het
+geheugen geladen worden. Ondersteunt geroteerde en gzip-gecomprimeerde
+logbestanden, regex filtering en een follow mode die alleen nieuw
+toegevoegde bytes leest.
+"""
+
+import gzip
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Optional, List, Iterator, Union, Pattern
+
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+PathLike = Union[str, Path]
+
+
+def _compile(pattern: Optional[Union[str, Pattern]]) -> Optional[Pattern]:
+    if pattern is None or hasattr(pattern, "search"):
+        return pattern
+    return re.compile(pattern)
+
+
+def _decode(line: bytes) -> str:
+    return line.decode("utf-8", errors="ignore").rstrip("\r")
+
+
+def iter_lines_reverse(path: PathLike, block_size: int = DEFAULT_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Yield regels van een (ongecomprimeerd) bestand, laatste regel eerst.
+
+    Leest blokken vanaf het einde van het bestand; geheugengebruik is
+    begrensd door de blokgrootte plus de langste regel.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        remainder = b""
+        at_end = True
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+
+            parts = block.split(b"\n")
+            # Eerste deel kan een halve regel zijn; bewaren voor volgend blok
+            remainder = parts[0]
+
+            for part in reversed(parts[1:]):
+                if at_end:
+                    at_end = False
+                    if not part:
+                        # Trailing newline aan het einde van het bestand
+                        continue
+                yield _decode(part)
+
+        if remainder or not at_end:
+            yield _decode(remainder)
+
+
+def _tail_gzip(path: PathLike, lines: int, regex: Optional[Pattern]) -> List[str]:
+    """Laatste regels van een gzip bestand (streaming, begrensd geheugen)."""
+    window: deque = deque(maxlen=lines)
+
+    with gzip.open(path, "rb") as f:
+        for raw in f:
+            line = _decode(raw.rstrip(b"\n"))
+            if regex is None or regex.search(line):
+                window.append(line)
+
+    return list(window)
+
+
+def tail_lines(
+    path: PathLike,
+    lines: int = 100,
+    pattern: Optional[Union[str, Pattern]] = None,
+    block_size: int = DEFAULT_BLOCK_SIZE
+) -> List[str]:
+    """
+    Geef de laatste N (eventueel gefilterde) regels van een bestand.
+
+    Args:
+        path: Pad naar logbestand (.gz wordt automatisch herkend)
+        lines: Maximaal aantal regels
+        pattern: Optionele regex; alleen matchende regels tellen mee
+        block_size: Leesblok grootte in bytes
+
+    Returns:
+        Regels in chronologische volgorde (oudste eerst)
+    """
+    regex = _compile(pattern)
+
+    if lines <= 0:
+        return []
+
+    if str(path).endswith(".gz"):
+        return _tail_gzip(path, lines, regex)
+
+    result = []
+    for line in iter_lines_reverse(path, block_size):
+        if regex is None or regex.search(line):
+            result.append(line)
+            if len(result) >= lines:
+                break
+
+    result.reverse()
+    return result
+
+
+def find_log_files(path: PathLike) -> List[Path]:
+    """
+    Vind een logbestand plus geroteerde varianten, nieuwste eerst.
+
+    Herkent o.a. `app.log`, `app.log.1`, `app.log.2.gz` en `app.log.gz`.
+    """
+    path = Path(path)
+    directory = path.parent if path.parent != Path("") else Path(".")
+    base = path.name
+
+    candidates = []
+    try:
+        for entry in directory.iterdir():
+            name = entry.name
+            if name == base or (name.startswith(base + ".") and entry.is_file()):
+                candidates.append(entry)
+    except FileNotFoundError:
+        return []
+
+    return sorted(candidates, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def tail_with_rotation(
+    path: PathLike,
+    lines: int = 100,
+    pattern: Optional[Union[str, Pattern]] = None
+) -> List[str]:
+    """
+    Laatste N regels over een logbestand en zijn geroteerde voorgangers.
+
+    Begint bij het nieuwste bestand en leest alleen oudere bestanden
+    als er nog regels tekort zijn.
+    """
+    regex = _compile(pattern)
+    collected: List[List[str]] = []
+    remaining = lines
+
+    for log_file in find_log_files(path):
+        if remaining <= 0:
+            break
+        chunk = tail_lines(log_file, remaining, regex)
+        collected.append(chunk)
+        remaining -= len(chunk)
+
+    result = []
+    for chunk in reversed(collected):
+        result.extend(chunk)
+    return result
+
+
+class LogFollower:
+    """
+    Volgt een logbestand en leest alleen bytes die sinds de vorige
+    aanroep zijn toegevoegd (vergelijkbaar met `tail -f`).
+
+    Detecteert rotatie (ander inode) en truncatie (bestand kleiner dan
+    offset) en begint dan opnieuw vanaf het begin van het nieuwe bestand.
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        pattern: Optional[Union[str, Pattern]] = None,
+        max_bytes: int = 4 * 1024 * 1024
+    ):
+        self.path = Path(path)
+        self._regex = _compile(pattern)
+        self._max_bytes = max_bytes
+        self._offset: Optional[int] = None
+        self._inode: Optional[int] = None
+
+    @property
+    def offset(self) -> Optional[int]:
+        return self._offset
+
+    def seek_end(self):
+        """Zet de offset op het huidige einde (alleen nieuwe regels lezen)."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        self._offset = stat.st_size
+        self._inode = stat.st_ino
+
+    def read_new(self) -> List[str]:
+        """
+        Lees complete regels die sinds de vorige aanroep zijn toegevoegd.
+
+        Een onvolledige laatste regel wordt pas bij een volgende aanroep
+        teruggegeven. Als er meer dan `max_bytes` is bijgekomen, worden
+        alleen de laatste `max_bytes` gelezen.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return []
+
+        if (
+            self._offset is None
+            or stat.st_ino != self._inode
+            or stat.st_size < self._offset
+        ):
+            # Eerste keer, geroteerd of getruncate
+            self._offset = 0
+            self._inode = stat.st_ino
+
+        if stat.st_size == self._offset:
+            return []
+
+        start = max(self._offset, stat.st_size - self._max_bytes)
+        skip_partial = start > self._offset
+
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read(stat.st_size - start)
+
+        last_newline = data.rfind(b"\n")
+        if last_newline == -1:
+            # Nog geen complete regel
+            if skip_partial:
+                self._offset = start
+            return []
+
+        self._offset = start + last_newline + 1
+        complete = data[:last_newline].split(b"\n")
+
+        if skip_partial and complete:
+            # Eerste regel is halverwege afgekapt
+            complete = complete[1:]
+
+        result = []
+        for raw in complete:
+            line = _decode(raw)
+            if self._regex is None or self._regex.search(line):
+                result.append(line)
+        return result
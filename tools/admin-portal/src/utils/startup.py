@@ -0,0 +1,88 @@
+"""
+Startup Timer - Meet hoe lang het duurt voor de GUI bruikbaar is.
+
+`main.py` start de klok, de app zet tijdens het opstarten marks per fase
+(imports, database, window, dashboard, first paint, services). Het
+rapport gaat naar de log en wordt als één JSON regel per start toegevoegd
+aan `logs/startup.jsonl`, zodat time-to-interactive over releases te
+volgen is.
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Optional, List, Tuple, Dict, Any
+
+from .config import Config, logger
+
+
+class StartupTimer:
+    """Verzamelt de duur van de opstartfases."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.interactive_at: Optional[float] = None
+        self._reported = False
+
+    def start(self, at: Optional[float] = None):
+        """Zet het startpunt (bv. de `perf_counter()` van het begin van main.py)."""
+        self.started = at if at is not None else time.perf_counter()
+        self.marks.clear()
+        self.interactive_at = None
+        self._reported = False
+
+    def mark(self, phase: str):
+        """Markeer het einde van een fase."""
+        self.marks.append((phase, time.perf_counter()))
+
+    def mark_interactive(self):
+        """Het venster is getekend en reageert op input."""
+        self.mark("first paint")
+        self.interactive_at = self.marks[-1][1]
+
+    def phases(self) -> Dict[str, float]:
+        """Duur per fase in ms."""
+        durations = {}
+        previous = self.started
+        for phase, at in self.marks:
+            durations[phase] = round((at - previous) * 1000, 1)
+            previous = at
+        return durations
+
+    def report(self) -> Dict[str, Any]:
+        """Log en bewaar de timing (één keer per start)."""
+        last = self.marks[-1][1] if self.marks else time.perf_counter()
+        report = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "interactive_ms": round((self.interactive_at - self.started) * 1000, 1) if self.interactive_at else None,
+            "total_ms": round((last - self.started) * 1000, 1),
+            "phases": self.phases(),
+        }
+
+        if self._reported:
+            return report
+        self._reported = True
+
+        phases = ", ".join(f"{phase} {ms:.0f}ms" for phase, ms in report["phases"].items())
+        logger.info(f"Startup: interactive after {report['interactive_ms']}ms, total {report['total_ms']}ms ({phases})")
+
+        try:
+            with open(Config.LOGS_DIR / "startup.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(report) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write startup timing: {e}")
+
+        return report
+
+
+# Global instance
+_startup_timer: Optional[StartupTimer] = None
+
+
+def get_startup_timer() -> StartupTimer:
+    """Get the global startup timer instance."""
+    global _startup_timer
+    if _startup_timer is None:
+        _startup_timer = StartupTimer()
+    return _startup_timer